@@ -1,76 +1,340 @@
 # meu_projeto_completo/app/app.py
 
 import os
+from datetime import datetime
 import psycopg2
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify
+from db import get_db_connection, init_app, pool_stats
+from metrics import init_app as init_metrics, render_metrics
+from migrate import run_migrations
 
 app = Flask(__name__)
 # Chave secreta para usar 'flash messages' (mensagens de feedback para o usuário)
 app.secret_key = os.urandom(24)
 
 # --- CONFIGURAÇÃO DO BANCO DE DADOS ---
-def get_db_connection():
-    """Cria e retorna uma conexão com o banco de dados."""
-    db_url = os.environ.get("DATABASE_URL")
-    conn = psycopg2.connect(db_url)
-    return conn
-
-def init_db():
-    """Inicializa as tabelas do banco de dados se não existirem."""
-    conn = get_db_connection()
+# As conexões vêm do pool do worker e são devolvidas no teardown da requisição
+init_app(app)
+# Tempo de cada requisição e das consultas (cabeçalho Server-Timing e /metrics)
+init_metrics(app)
+
+# --- PAGINAÇÃO ---
+# Paginação por chave (keyset): cada página começa depois (ou antes) da última
+# linha exibida, então o custo não cresce com o número de páginas.
+
+PAGE_SIZE = int(os.environ.get('PAGE_SIZE', '20'))
+
+def fetch_page(cur, select, key_columns, cursor_values, direction, where=None, params=()):
+    """
+    Busca uma página ordenada por key_columns a partir de cursor_values.
+    Retorna (linhas, tem_anterior, tem_proxima).
+    """
+    conditions = [where] if where else []
+    params = list(params)
+    keys = ', '.join(key_columns)
+    backwards = direction == 'prev' and cursor_values is not None
+
+    if cursor_values is not None:
+        placeholders = ', '.join(['%s'] * len(key_columns))
+        conditions.append(f"({keys}) {'<' if backwards else '>'} ({placeholders})")
+        params.extend(cursor_values)
+
+    order = ', '.join(f"{column} DESC" for column in key_columns) if backwards else keys
+    where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    cur.execute(f'{select} {where_sql} ORDER BY {order} LIMIT %s;', params + [PAGE_SIZE + 1])
+    rows = cur.fetchall()
+
+    has_more = len(rows) > PAGE_SIZE
+    rows = rows[:PAGE_SIZE]
+    if backwards:
+        return rows[::-1], has_more, True
+    return rows, cursor_values is not None, has_more
+
+# --- BUSCA TEXTUAL ---
+# Usa a coluna books.search (migração 0002) e os índices GIN. Só até
+# SEARCH_CANDIDATES livros que contêm os termos são ranqueados, para que termos
+# muito comuns não precisem calcular a relevância de todo o acervo: primeiro os
+# que casam pelo título (peso A, índice da migração 0003), depois os demais.
+# truncated indica que havia mais livros com os termos do que candidatos.
+
+SEARCH_CANDIDATES = 1000
+SEARCH_MAX_LIMIT = 100
+
+SEARCH_SQL = """
+    WITH matches AS (
+        (SELECT b.id, 0 AS tier
+         FROM websearch_to_tsquery('portuguese', %(q)s) q, books b
+         WHERE to_tsvector('portuguese', coalesce(b.title, '')) @@ q
+         LIMIT %(candidates)s)
+        UNION ALL
+        (SELECT b.id, 1
+         FROM websearch_to_tsquery('portuguese', %(q)s) q, books b
+         WHERE b.search @@ q
+         LIMIT %(candidates)s + 1)
+    ),
+    candidates AS (
+        SELECT id, MIN(tier) AS tier
+        FROM matches
+        GROUP BY id
+    )
+    SELECT b.id, b.title, b.author, b.total_copies, b.available_copies,
+           ts_rank(b.search, q) AS rank,
+           (SELECT COUNT(*) FROM candidates) > %(candidates)s AS truncated
+    FROM (
+        SELECT id FROM candidates
+        ORDER BY tier, id
+        LIMIT %(candidates)s
+    ) c
+    CROSS JOIN websearch_to_tsquery('portuguese', %(q)s) q
+    JOIN books b ON b.id = c.id
+    WHERE b.search @@ q
+    ORDER BY rank DESC, b.id
+    LIMIT %(limit)s
+"""
+
+# --- OPERAÇÕES ATÔMICAS ---
+# Cada operação é uma única instrução: a verificação e a escrita acontecem juntas,
+# sob o bloqueio da linha do livro, sem janela para outro worker entre elas.
+
+# Só empresta se ainda houver cópia; o empréstimo é criado a partir da linha atualizada
+CHECKOUT_SQL = """
+    WITH book AS (
+        UPDATE books SET available_copies = available_copies - 1
+        WHERE id = %(book_id)s AND available_copies > 0
+        RETURNING id
+    )
+    INSERT INTO loans (book_id, borrower_name)
+    SELECT id, %(borrower_name)s FROM book
+    RETURNING id;
+"""
+
+# Remove o empréstimo e devolve a cópia do livro correspondente
+RETURN_SQL = """
+    WITH loan AS (
+        DELETE FROM loans WHERE id = %(loan_id)s
+        RETURNING book_id
+    )
+    UPDATE books SET available_copies = available_copies + 1
+    FROM loan
+    WHERE books.id = loan.book_id
+    RETURNING books.id;
+"""
+
+# Exclui apenas livros sem empréstimos. A condição available_copies = total_copies
+# é reavaliada sobre a versão mais nova da linha caso um empréstimo concorrente a
+# altere, então a exclusão nunca apaga um empréstimo recém-criado.
+# Retorna (excluído, existia)
+DELETE_SQL = """
+    WITH deleted AS (
+        DELETE FROM books
+        WHERE id = %(book_id)s
+          AND available_copies = total_copies
+          AND NOT EXISTS (SELECT 1 FROM loans WHERE loans.book_id = books.id)
+        RETURNING id
+    )
+    SELECT EXISTS (SELECT 1 FROM deleted),
+           EXISTS (SELECT 1 FROM books WHERE id = %(book_id)s);
+"""
+
+# Operações em lote: as linhas são bloqueadas em ordem de id (dois lotes com os
+# mesmos livros nunca esperam um pelo outro em ordem inversa) e depois gravadas
+# de uma vez. Qualquer item inválido desfaz o lote inteiro.
+
+BATCH_LOCK_BOOKS_SQL = """
+    SELECT id, title, available_copies FROM books
+    WHERE id = ANY(%(book_ids)s)
+    ORDER BY id
+    FOR UPDATE;
+"""
+
+BATCH_CHECKOUT_SQL = """
+    WITH book AS (
+        UPDATE books SET available_copies = available_copies - 1
+        WHERE id = ANY(%(book_ids)s) AND available_copies > 0
+        RETURNING id
+    )
+    INSERT INTO loans (book_id, borrower_name)
+    SELECT id, %(borrower_name)s FROM book
+    RETURNING id;
+"""
+
+BATCH_LOCK_LOANS_SQL = """
+    SELECT id, book_id FROM loans
+    WHERE id = ANY(%(loan_ids)s)
+    ORDER BY id
+    FOR UPDATE;
+"""
+
+BATCH_RETURN_SQL = """
+    WITH loan AS (
+        DELETE FROM loans WHERE id = ANY(%(loan_ids)s)
+        RETURNING book_id
+    ),
+    returned AS (
+        SELECT book_id, COUNT(*) AS copies FROM loan GROUP BY book_id
+    )
+    UPDATE books SET available_copies = available_copies + returned.copies
+    FROM returned
+    WHERE books.id = returned.book_id
+    RETURNING books.id;
+"""
+
+class BatchError(Exception):
+    """Lote recusado: nenhuma alteração foi gravada."""
+
+    def __init__(self, message, status=409):
+        super().__init__(message)
+        self.status = status
+
+def batch_checkout(conn, book_ids, borrower_name):
+    """Empresta vários livros (um exemplar de cada) em uma transação. Retorna os ids dos empréstimos."""
     cur = conn.cursor()
-    
-    # Tabela de Livros
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS books (
-            id SERIAL PRIMARY KEY,
-            title VARCHAR(150) NOT NULL,
-            author VARCHAR(100) NOT NULL,
-            total_copies INTEGER NOT NULL,
-            available_copies INTEGER NOT NULL
-        );
-    ''')
-    
-    # Tabela de Empréstimos
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS loans (
-            id SERIAL PRIMARY KEY,
-            book_id INTEGER NOT NULL,
-            borrower_name VARCHAR(100) NOT NULL,
-            checkout_date DATE NOT NULL DEFAULT CURRENT_DATE,
-            FOREIGN KEY (book_id) REFERENCES books (id) ON DELETE CASCADE
-        );
-    ''')
-    
-    conn.commit()
-    cur.close()
-    conn.close()
+    try:
+        cur.execute(BATCH_LOCK_BOOKS_SQL, {'book_ids': book_ids})
+        books = {row[0]: row for row in cur.fetchall()}
+        missing = [str(book_id) for book_id in book_ids if book_id not in books]
+        if missing:
+            raise BatchError(f"Livro(s) não encontrado(s): {', '.join(missing)}.", 404)
+        unavailable = [books[book_id][1] for book_id in book_ids if books[book_id][2] <= 0]
+        if unavailable:
+            raise BatchError(f"Sem cópias disponíveis: {', '.join(unavailable)}.")
+
+        cur.execute(BATCH_CHECKOUT_SQL, {'book_ids': book_ids, 'borrower_name': borrower_name})
+        loan_ids = [row[0] for row in cur.fetchall()]
+        conn.commit()
+        return loan_ids
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+def batch_return(conn, loan_ids):
+    """Devolve vários empréstimos em uma transação. Retorna a quantidade devolvida."""
+    cur = conn.cursor()
+    try:
+        cur.execute(BATCH_LOCK_LOANS_SQL, {'loan_ids': loan_ids})
+        loans = {row[0]: row[1] for row in cur.fetchall()}
+        missing = [str(loan_id) for loan_id in loan_ids if loan_id not in loans]
+        if missing:
+            raise BatchError(f"Empréstimo(s) não encontrado(s): {', '.join(missing)}.", 404)
+
+        # Os livros também são bloqueados em ordem de id antes da atualização
+        cur.execute(BATCH_LOCK_BOOKS_SQL, {'book_ids': sorted(set(loans.values()))})
+        cur.execute(BATCH_RETURN_SQL, {'loan_ids': loan_ids})
+        conn.commit()
+        return len(loan_ids)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+def read_batch_request(ids_field):
+    """
+    Lê um lote de um formulário (campos repetidos) ou de um corpo JSON.
+    Retorna (ids únicos em ordem crescente, dados da requisição).
+    """
+    data = request.get_json(silent=True) if request.is_json else None
+    if data is None:
+        data = request.form.to_dict()
+        raw_ids = request.form.getlist(ids_field)
+    else:
+        if not isinstance(data, dict):
+            raise BatchError('O corpo JSON deve ser um objeto.', 400)
+        raw_ids = data.get(ids_field) or []
+        if not isinstance(raw_ids, list):
+            raise BatchError(f'O campo {ids_field} deve ser uma lista de ids.', 400)
+    try:
+        ids = sorted({int(value) for value in raw_ids})
+    except (TypeError, ValueError):
+        raise BatchError('Lista de ids inválida.', 400)
+    if not ids:
+        raise BatchError('Selecione pelo menos um item.', 400)
+    return ids, data
+
+def batch_response(ok, message, status=200, **payload):
+    """Resposta JSON para clientes de API ou flash + redirect para o formulário."""
+    if request.is_json:
+        return jsonify(ok=ok, message=message, **payload), status
+    flash(message, 'success' if ok else 'danger')
+    return redirect(url_for('index'))
+
+def escape_like(text):
+    """Escapa os curingas do LIKE para buscar o texto literalmente."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def parse_iso_datetime(value):
+    """Data ISO 8601 de um parâmetro de URL, ou None se ausente ou inválida."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
 
 # --- ROTAS DA APLICAÇÃO ---
 
 @app.route('/')
 def index():
-    """Página principal que lista livros e empréstimos."""
+    """Página principal que lista livros e empréstimos, paginados e com busca."""
+    args = request.args
+    search = args.get('q', '').strip()
+
+    book_cursor = None
+    if args.get('b_id', type=int) is not None:
+        book_cursor = (args.get('b_title', ''), args.get('b_id', type=int))
+    loan_cursor = None
+    loan_date = parse_iso_datetime(args.get('l_date'))
+    if args.get('l_id', type=int) is not None and loan_date:
+        loan_cursor = (loan_date, args.get('l_id', type=int))
+
     conn = get_db_connection()
     cur = conn.cursor()
     
-    # Busca todos os livros
-    cur.execute('SELECT * FROM books ORDER BY title;')
-    books = cur.fetchall()
+    # Livros: apenas as colunas exibidas, filtrados por título/autor
+    books_filter, books_params = None, ()
+    if search:
+        pattern = f"%{escape_like(search)}%"
+        books_filter = '(title ILIKE %s OR author ILIKE %s)'
+        books_params = (pattern, pattern)
+    books, books_prev, books_next = fetch_page(
+        cur,
+        'SELECT id, title, author, total_copies, available_copies FROM books',
+        ('title', 'id'), book_cursor, args.get('b_dir'), books_filter, books_params
+    )
     
-    # Busca todos os empréstimos ativos com o nome do livro (usando JOIN)
-    cur.execute('''
-        SELECT loans.id, books.title, loans.borrower_name, loans.checkout_date 
-        FROM loans 
-        JOIN books ON loans.book_id = books.id
-        ORDER BY loans.checkout_date;
-    ''')
-    loans = cur.fetchall()
+    # Empréstimos ativos com o nome do livro (usando JOIN)
+    loans, loans_prev, loans_next = fetch_page(
+        cur,
+        """SELECT loans.id, books.title, loans.borrower_name, loans.checkout_date
+           FROM loans
+           JOIN books ON loans.book_id = books.id""",
+        ('loans.checkout_date', 'loans.id'), loan_cursor, args.get('l_dir')
+    )
     
     cur.close()
-    conn.close()
+
+    # Links de navegação: cada lista pagina sem perder a posição da outra
+    state = {'q': search or None}
+    if book_cursor:
+        state.update(b_title=book_cursor[0], b_id=book_cursor[1], b_dir=args.get('b_dir'))
+    if loan_cursor:
+        state.update(l_date=loan_cursor[0].isoformat(), l_id=loan_cursor[1], l_dir=args.get('l_dir'))
+
+    def page_url(**changes):
+        params = {k: v for k, v in {**state, **changes}.items() if v is not None}
+        return url_for('index', **params)
+
+    pagination = {
+        'books_prev': books and books_prev and page_url(b_title=books[0][1], b_id=books[0][0], b_dir='prev'),
+        'books_next': books and books_next and page_url(b_title=books[-1][1], b_id=books[-1][0], b_dir='next'),
+        'loans_prev': loans and loans_prev and page_url(l_date=loans[0][3].isoformat(), l_id=loans[0][0], l_dir='prev'),
+        'loans_next': loans and loans_next and page_url(l_date=loans[-1][3].isoformat(), l_id=loans[-1][0], l_dir='next'),
+        'books_first': (book_cursor is not None) and page_url(b_title=None, b_id=None, b_dir=None),
+    }
     
-    return render_template('index.html', books=books, loans=loans)
+    return render_template('index.html', books=books, loans=loans, search=search, pagination=pagination)
 
 @app.route('/book/add', methods=['POST'])
 def add_book():
@@ -88,7 +352,6 @@ def add_book():
         )
         conn.commit()
         cur.close()
-        conn.close()
         flash('Livro adicionado com sucesso!', 'success')
     else:
         flash('Erro ao adicionar livro. Verifique os dados.', 'danger')
@@ -107,17 +370,12 @@ def checkout_book(book_id):
     conn = get_db_connection()
     cur = conn.cursor()
 
-    # Transação: Garante que ambas as operações (update e insert) funcionem ou nenhuma delas.
+    # Uma única instrução: baixa a cópia (se houver) e registra o empréstimo
     try:
-        # 1. Verifica se há cópias disponíveis
-        cur.execute('SELECT available_copies FROM books WHERE id = %s;', (book_id,))
-        book = cur.fetchone()
-        if book and book[0] > 0:
-            # 2. Diminui o número de cópias disponíveis
-            cur.execute('UPDATE books SET available_copies = available_copies - 1 WHERE id = %s;', (book_id,))
-            # 3. Adiciona o registro na tabela de empréstimos
-            cur.execute('INSERT INTO loans (book_id, borrower_name) VALUES (%s, %s);', (book_id, borrower_name))
-            conn.commit()
+        cur.execute(CHECKOUT_SQL, {'book_id': book_id, 'borrower_name': borrower_name})
+        loan = cur.fetchone()
+        conn.commit()
+        if loan:
             flash(f'Livro emprestado para {borrower_name}!', 'success')
         else:
             flash('Nenhuma cópia deste livro está disponível para empréstimo.', 'warning')
@@ -126,7 +384,6 @@ def checkout_book(book_id):
         flash(f'Ocorreu um erro: {e}', 'danger')
     finally:
         cur.close()
-        conn.close()
 
     return redirect(url_for('index'))
 
@@ -137,16 +394,10 @@ def return_book(loan_id):
     cur = conn.cursor()
     
     try:
-        # 1. Pega o book_id antes de deletar o empréstimo
-        cur.execute('SELECT book_id FROM loans WHERE id = %s;', (loan_id,))
-        loan = cur.fetchone()
-        if loan:
-            book_id = loan[0]
-            # 2. Aumenta o número de cópias disponíveis
-            cur.execute('UPDATE books SET available_copies = available_copies + 1 WHERE id = %s;', (book_id,))
-            # 3. Remove o registro da tabela de empréstimos
-            cur.execute('DELETE FROM loans WHERE id = %s;', (loan_id,))
-            conn.commit()
+        cur.execute(RETURN_SQL, {'loan_id': loan_id})
+        returned = cur.fetchone()
+        conn.commit()
+        if returned:
             flash('Livro devolvido com sucesso!', 'success')
         else:
             flash('Empréstimo não encontrado.', 'danger')
@@ -155,7 +406,6 @@ def return_book(loan_id):
         flash(f'Ocorreu um erro: {e}', 'danger')
     finally:
         cur.close()
-        conn.close()
         
     return redirect(url_for('index'))
 
@@ -164,25 +414,86 @@ def delete_book(book_id):
     """Exclui um livro do banco de dados."""
     conn = get_db_connection()
     cur = conn.cursor()
-    # Verifica se o livro tem empréstimos ativos
-    cur.execute('SELECT COUNT(*) FROM loans WHERE book_id = %s;', (book_id,))
-    loan_count = cur.fetchone()[0]
 
-    if loan_count > 0:
-        flash('Não é possível excluir um livro com empréstimos ativos.', 'danger')
-    else:
-        cur.execute('DELETE FROM books WHERE id = %s;', (book_id,))
+    try:
+        cur.execute(DELETE_SQL, {'book_id': book_id})
+        deleted, existed = cur.fetchone()
         conn.commit()
-        flash('Livro excluído com sucesso.', 'success')
-    
-    cur.close()
-    conn.close()
+        if deleted:
+            flash('Livro excluído com sucesso.', 'success')
+        elif existed:
+            flash('Não é possível excluir um livro com empréstimos ativos.', 'danger')
+        else:
+            flash('Livro não encontrado.', 'danger')
+    except Exception as e:
+        conn.rollback()
+        flash(f'Ocorreu um erro: {e}', 'danger')
+    finally:
+        cur.close()
+
     return redirect(url_for('index'))
 
-# Garante que o banco de dados seja inicializado quando a aplicação começar
-with app.app_context():
-    init_db()
+@app.route('/book/checkout/batch', methods=['POST'])
+def checkout_books():
+    """Empresta vários livros a um leitor de uma só vez (tudo ou nada)."""
+    try:
+        book_ids, data = read_batch_request('book_ids')
+        borrower_name = (data.get('borrower_name') or '').strip()
+        if not borrower_name:
+            raise BatchError('O nome do leitor é obrigatório.', 400)
+        loan_ids = batch_checkout(get_db_connection(), book_ids, borrower_name)
+    except BatchError as e:
+        return batch_response(False, str(e), e.status)
+    except psycopg2.Error as e:
+        return batch_response(False, f'Ocorreu um erro: {e}', 500)
+    return batch_response(True, f'{len(loan_ids)} livro(s) emprestado(s) para {borrower_name}!', loan_ids=loan_ids)
+
+@app.route('/loan/return/batch', methods=['POST'])
+def return_books():
+    """Devolve vários empréstimos de uma só vez (tudo ou nada)."""
+    try:
+        loan_ids, _ = read_batch_request('loan_ids')
+        returned = batch_return(get_db_connection(), loan_ids)
+    except BatchError as e:
+        return batch_response(False, str(e), e.status)
+    except psycopg2.Error as e:
+        return batch_response(False, f'Ocorreu um erro: {e}', 500)
+    return batch_response(True, f'{returned} livro(s) devolvido(s) com sucesso!', returned=returned)
+
+@app.route('/book/search')
+def search_books():
+    """Busca textual por título e autor, dos livros mais relevantes para os menos (JSON)."""
+    q = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', PAGE_SIZE, type=int), 1), SEARCH_MAX_LIMIT)
+    if not q:
+        return jsonify(ok=False, message='Informe o texto da busca no parâmetro q.'), 400
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(SEARCH_SQL, {'q': q, 'candidates': SEARCH_CANDIDATES, 'limit': limit})
+    rows = cur.fetchall()
+    cur.close()
+    books = [
+        {'id': book_id, 'title': title, 'author': author, 'total_copies': total,
+         'available_copies': available, 'rank': round(rank, 4)}
+        for book_id, title, author, total, available, rank, _ in rows
+    ]
+    return jsonify(ok=True, q=q, books=books, truncated=bool(rows) and rows[0][6])
+
+@app.route('/pool/stats')
+def pool_status():
+    """Estatísticas do pool de conexões do worker que atendeu a requisição."""
+    return jsonify(pool_stats())
+
+@app.route('/metrics')
+def metrics():
+    """Métricas do worker no formato texto do Prometheus."""
+    return Response(render_metrics(pool_stats()), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+# O schema é criado pelas migrações (migrate.py): o Gunicorn as aplica uma vez no
+# processo mestre, então importar o módulo não executa DDL em cada worker.
 
 # Esta parte não é usada pelo Gunicorn, mas é útil para testes locais
 if __name__ == '__main__':
+    run_migrations()
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,155 @@
+# meu_projeto_completo/app/db.py
+
+import os
+import threading
+import time
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool
+from flask import Response, g
+from metrics import TimedCursor, record_pool_wait
+
+# --- POOL DE CONEXÕES POR WORKER ---
+# Cada worker do Gunicorn cria o próprio pool depois do fork (ver gunicorn.conf.py).
+# Conexões herdadas do processo pai nunca são reutilizadas no filho.
+
+# Segundos que uma requisição espera por uma conexão livre antes de receber 503
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "5"))
+
+_pool = None
+_pool_pid = None
+_lock = threading.Lock()
+_stats = {'in_use': 0, 'peak_in_use': 0, 'checkouts': 0, 'timeouts': 0}
+
+
+class PoolTimeout(Exception):
+    """Nenhuma conexão do pool ficou livre dentro de DB_POOL_TIMEOUT."""
+
+
+class WaitingPool(ThreadedConnectionPool):
+    """
+    Pool que espera por uma conexão livre (até `timeout` segundos) em vez de
+    falhar assim que as maxconn conexões estão emprestadas.
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None, timeout=None):
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolTimeout(f'Nenhuma conexão livre em {timeout:g}s ({self.maxconn} em uso).')
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+
+def _create_pool():
+    """Cria o pool do processo atual (chamado sob _lock)."""
+    global _pool, _pool_pid
+    _pool = WaitingPool(
+        int(os.environ.get("DB_POOL_MIN", "1")),
+        int(os.environ.get("DB_POOL_MAX", "5")),
+        os.environ.get("DATABASE_URL"),
+        cursor_factory=TimedCursor,
+    )
+    _pool_pid = os.getpid()
+    _stats.update(in_use=0, peak_in_use=0, checkouts=0, timeouts=0)
+    return _pool
+
+
+def init_pool():
+    """Cria o pool de conexões do processo atual."""
+    with _lock:
+        return _create_pool()
+
+
+def get_pool():
+    """Retorna o pool do processo atual, criando-o se ainda não existir."""
+    pool = _pool
+    if pool is not None and _pool_pid == os.getpid():
+        return pool
+    # Verifica de novo sob o lock: threads concorrentes criam um único pool
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            return _create_pool()
+        return _pool
+
+
+def get_db_connection():
+    """Empresta uma conexão do pool, válida até o fim da requisição."""
+    if 'db_conn' not in g:
+        pool = get_pool()
+        start = time.perf_counter()
+        try:
+            conn = pool.getconn(timeout=POOL_TIMEOUT)
+        except PoolTimeout:
+            with _lock:
+                _stats['timeouts'] += 1
+            raise
+        finally:
+            record_pool_wait(time.perf_counter() - start)
+        with _lock:
+            _stats['in_use'] += 1
+            _stats['checkouts'] += 1
+            _stats['peak_in_use'] = max(_stats['peak_in_use'], _stats['in_use'])
+        # A conexão volta para o pool de onde saiu, mesmo que outro seja criado depois
+        g.db_pool = pool
+        g.db_conn = conn
+    return g.db_conn
+
+
+def release_db_connection(exception=None):
+    """Devolve ao pool a conexão da requisição (teardown do Flask)."""
+    conn = g.pop('db_conn', None)
+    pool = g.pop('db_pool', None)
+    if conn is None:
+        return
+
+    discard = conn.closed != 0
+    if not discard and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            discard = True
+
+    pool.putconn(conn, close=discard)
+    with _lock:
+        # As estatísticas são do pool atual; um pool substituído não conta mais
+        if pool is _pool:
+            _stats['in_use'] -= 1
+
+
+def pool_stats():
+    """Estatísticas do pool do worker atual."""
+    pool = get_pool()
+    with _lock:
+        return {
+            'pid': _pool_pid,
+            'min_size': pool.minconn,
+            'max_size': pool.maxconn,
+            'in_use': _stats['in_use'],
+            'peak_in_use': _stats['peak_in_use'],
+            'checkouts': _stats['checkouts'],
+            'timeouts': _stats['timeouts'],
+        }
+
+
+def pool_timeout_response(error):
+    """Pool esgotado: 503 com Retry-After em vez de um erro 500."""
+    return Response(f'Servidor ocupado, tente novamente. {error}', status=503,
+                    headers={'Retry-After': '1'}, mimetype='text/plain')
+
+
+def init_app(app):
+    """Registra a devolução automática da conexão ao fim de cada requisição."""
+    app.teardown_appcontext(release_db_connection)
+    app.register_error_handler(PoolTimeout, pool_timeout_response)
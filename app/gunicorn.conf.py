@@ -0,0 +1,21 @@
+# meu_projeto_web/app/gunicorn.conf.py
+
+import os
+import db
+import migrate
+
+bind = "0.0.0.0:5000"
+workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+
+
+def on_starting(server):
+    """Aplica as migrações pendentes uma única vez, no mestre, antes de criar os workers."""
+    applied = migrate.run_migrations()
+    if applied:
+        server.log.info("Migrações aplicadas: %s", ", ".join(applied))
+
+
+def post_fork(server, worker):
+    """Cada worker abre o próprio pool de conexões logo após o fork."""
+    db.init_pool()
@@ -0,0 +1,200 @@
+# meu_projeto_completo/app/metrics.py
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, has_request_context, request
+from psycopg2 import extensions, sql
+
+# --- MÉTRICAS DO WORKER ---
+# Cada worker do Gunicorn mantém as próprias métricas (como o pool de conexões):
+# /metrics mostra apenas o worker que atendeu a requisição, identificado pelo rótulo pid.
+
+# Limites superiores dos baldes dos histogramas, em segundos
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SLOW_QUERY_SECONDS = float(os.environ.get("DB_SLOW_QUERY_MS", "200")) / 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Histograma cumulativo no formato do Prometheus (não é thread-safe: use sob _lock)."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+_lock = threading.Lock()
+_queries = {}       # endpoint -> Histogram das consultas
+_rows = {}          # endpoint -> linhas retornadas/afetadas
+_errors = {}        # endpoint -> consultas com erro
+_requests = {}      # (endpoint, método, status) -> Histogram das requisições
+_pool_wait = Histogram()
+_slow_queries = 0
+
+
+def _histogram(store, key):
+    histogram = store.get(key)
+    if histogram is None:
+        histogram = store[key] = Histogram()
+    return histogram
+
+
+def record_query(query, seconds, rows, failed):
+    """Registra uma consulta no endpoint da requisição atual e no Server-Timing."""
+    global _slow_queries
+    endpoint = (request.endpoint or 'unknown') if has_request_context() else 'none'
+    if has_request_context():
+        g.db_time = g.get('db_time', 0.0) + seconds
+        g.db_queries = g.get('db_queries', 0) + 1
+
+    with _lock:
+        _histogram(_queries, endpoint).observe(seconds)
+        _rows[endpoint] = _rows.get(endpoint, 0) + max(rows, 0)
+        _errors[endpoint] = _errors.get(endpoint, 0) + failed
+        if seconds >= SLOW_QUERY_SECONDS:
+            _slow_queries += 1
+
+    if seconds >= SLOW_QUERY_SECONDS:
+        logger.warning("Consulta lenta (%.1f ms) em %s: %s", seconds * 1000, endpoint, " ".join(query.split()))
+
+
+def record_pool_wait(seconds):
+    """Tempo para obter uma conexão do pool do worker."""
+    if has_request_context():
+        g.pool_wait = g.get('pool_wait', 0.0) + seconds
+    with _lock:
+        _pool_wait.observe(seconds)
+
+
+class TimedCursor(extensions.cursor):
+    """Cursor que mede cada consulta executada (usado por todas as conexões do pool)."""
+
+    def _record(self, query, start, failed):
+        seconds = time.perf_counter() - start
+        if isinstance(query, sql.Composable):
+            query = query.as_string(self)
+        elif isinstance(query, bytes):
+            query = query.decode('utf-8', 'replace')
+        record_query(query, seconds, self.rowcount, failed)
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = super().execute(query, vars)
+            failed = False
+            return result
+        finally:
+            self._record(query, start, failed)
+
+    def executemany(self, query, vars_list):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = super().executemany(query, vars_list)
+            failed = False
+            return result
+        finally:
+            self._record(query, start, failed)
+
+
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+def add_server_timing(response):
+    """Registra a duração da requisição e adiciona o cabeçalho Server-Timing."""
+    total = time.perf_counter() - g.get('request_start', time.perf_counter())
+    db_time = g.get('db_time', 0.0)
+    queries = g.get('db_queries', 0)
+
+    with _lock:
+        _histogram(_requests, (request.endpoint or 'unknown', request.method, response.status_code)).observe(total)
+
+    response.headers['Server-Timing'] = ', '.join([
+        f'db;dur={db_time * 1000:.2f};desc="{queries} consulta(s)"',
+        f'pool;dur={g.get("pool_wait", 0.0) * 1000:.2f}',
+        f'app;dur={max(total - db_time, 0.0) * 1000:.2f}',
+        f'total;dur={total * 1000:.2f}',
+    ])
+    return response
+
+
+def init_app(app):
+    """Mede todas as requisições da aplicação."""
+    app.before_request(start_timer)
+    app.after_request(add_server_timing)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _render_histogram(lines, name, histogram, **labels):
+    cumulative = 0
+    for bound, count in zip(BUCKETS + (float('inf'),), histogram.buckets):
+        cumulative += count
+        le = '+Inf' if bound == float('inf') else repr(bound)
+        lines.append(f'{name}_bucket{{{_labels(**labels, le=le)}}} {cumulative}')
+    lines.append(f'{name}_sum{{{_labels(**labels)}}} {histogram.sum:.6f}')
+    lines.append(f'{name}_count{{{_labels(**labels)}}} {histogram.count}')
+
+
+def render_metrics(pool):
+    """Métricas do worker no formato texto do Prometheus (versão 0.0.4)."""
+    pid = os.getpid()
+    lines = []
+    with _lock:
+        lines += ['# HELP library_http_request_duration_seconds Duração das requisições HTTP.',
+                  '# TYPE library_http_request_duration_seconds histogram']
+        for (endpoint, method, status), histogram in sorted(_requests.items()):
+            _render_histogram(lines, 'library_http_request_duration_seconds', histogram,
+                              pid=pid, endpoint=endpoint, method=method, status=status)
+
+        lines += ['# HELP library_db_query_duration_seconds Duração das consultas ao banco por endpoint.',
+                  '# TYPE library_db_query_duration_seconds histogram']
+        for endpoint, histogram in sorted(_queries.items()):
+            _render_histogram(lines, 'library_db_query_duration_seconds', histogram, pid=pid, endpoint=endpoint)
+
+        lines += ['# HELP library_db_query_rows_total Linhas retornadas ou afetadas pelas consultas.',
+                  '# TYPE library_db_query_rows_total counter']
+        lines += [f'library_db_query_rows_total{{{_labels(pid=pid, endpoint=endpoint)}}} {rows}'
+                  for endpoint, rows in sorted(_rows.items())]
+
+        lines += ['# HELP library_db_query_errors_total Consultas que terminaram em erro.',
+                  '# TYPE library_db_query_errors_total counter']
+        lines += [f'library_db_query_errors_total{{{_labels(pid=pid, endpoint=endpoint)}}} {errors}'
+                  for endpoint, errors in sorted(_errors.items())]
+
+        lines += ['# HELP library_db_slow_queries_total Consultas acima de DB_SLOW_QUERY_MS.',
+                  '# TYPE library_db_slow_queries_total counter',
+                  f'library_db_slow_queries_total{{{_labels(pid=pid)}}} {_slow_queries}']
+
+        lines += ['# HELP library_db_pool_wait_seconds Espera para obter uma conexão do pool.',
+                  '# TYPE library_db_pool_wait_seconds histogram']
+        _render_histogram(lines, 'library_db_pool_wait_seconds', _pool_wait, pid=pid)
+
+    lines += ['# HELP library_db_pool_connections Conexões do pool do worker.',
+              '# TYPE library_db_pool_connections gauge']
+    for state in ('in_use', 'peak_in_use', 'max_size'):
+        lines.append(f'library_db_pool_connections{{{_labels(pid=pid, state=state)}}} {pool[state]}')
+    lines += ['# HELP library_db_pool_timeouts_total Requisições que desistiram de esperar por uma conexão (503).',
+              '# TYPE library_db_pool_timeouts_total counter',
+              f'library_db_pool_timeouts_total{{{_labels(pid=pid)}}} {pool["timeouts"]}']
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,113 @@
+# meu_projeto_completo/app/migrate.py
+
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+import psycopg2
+
+# --- MIGRAÇÕES DO SCHEMA ---
+# Os scripts de migrations/ (<versão>_<nome>.sql) são aplicados uma única vez e
+# registrados em app_schema_migrations com o checksum. O Gunicorn roda as
+# migrações no processo mestre, antes de criar os workers (ver gunicorn.conf.py).
+
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+
+# Chave do pg_advisory_lock que serializa processos migrando o mesmo banco
+LOCK_KEY = 7_274_862_010_302_001
+
+
+class MigrationError(Exception):
+    """Script já aplicado foi alterado depois de registrado."""
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Lista (versão, nome, caminho, checksum) dos scripts, em ordem de versão."""
+    migrations = []
+    for path in Path(directory).glob('*.sql'):
+        version, _, name = path.stem.partition('_')
+        checksum = hashlib.sha256(path.read_bytes()).hexdigest()
+        migrations.append((version, name, path, checksum))
+    return sorted(migrations)
+
+
+def applied_migrations(cur):
+    """{versão: checksum} das migrações registradas (vazio se a tabela não existir)."""
+    cur.execute("SELECT to_regclass('app_schema_migrations') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return {}
+    cur.execute("SELECT version, checksum FROM app_schema_migrations")
+    return dict(cur.fetchall())
+
+
+def check_checksums(migrations, applied):
+    changed = [path.name for version, _, path, checksum in migrations
+               if version in applied and applied[version] != checksum]
+    if changed:
+        raise MigrationError(
+            f"Migração alterada depois de aplicada: {', '.join(changed)}. "
+            "Crie um novo script em vez de editar um já aplicado."
+        )
+
+
+def run_migrations(dsn=None, directory=MIGRATIONS_DIR):
+    """
+    Aplica as migrações pendentes, cada uma na sua transação, e retorna as
+    versões aplicadas. Com tudo em dia, faz uma única consulta e nenhum DDL.
+    """
+    migrations = load_migrations(directory)
+    conn = psycopg2.connect(dsn or os.environ.get("DATABASE_URL"))
+    try:
+        cur = conn.cursor()
+        applied = applied_migrations(cur)
+        conn.rollback()
+        check_checksums(migrations, applied)
+        if all(version in applied for version, _, _, _ in migrations):
+            return []
+
+        # Outro processo migrando espera aqui e depois relê o registro
+        cur.execute("SELECT pg_advisory_lock(%s)", (LOCK_KEY,))
+        try:
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS app_schema_migrations (
+                    version VARCHAR(50) PRIMARY KEY,
+                    name VARCHAR(200) NOT NULL,
+                    checksum CHAR(64) NOT NULL,
+                    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    duration_ms INTEGER
+                );
+            ''')
+            conn.commit()
+            applied = applied_migrations(cur)
+            check_checksums(migrations, applied)
+
+            done = []
+            for version, name, path, checksum in migrations:
+                if version in applied:
+                    continue
+                start = time.perf_counter()
+                cur.execute(path.read_text(encoding='utf-8'))
+                cur.execute(
+                    "INSERT INTO app_schema_migrations (version, name, checksum, duration_ms) "
+                    "VALUES (%s, %s, %s, %s)",
+                    (version, name, checksum, round((time.perf_counter() - start) * 1000)),
+                )
+                conn.commit()
+                done.append(version)
+            return done
+        finally:
+            conn.rollback()
+            cur.execute("SELECT pg_advisory_unlock(%s)", (LOCK_KEY,))
+            conn.commit()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    try:
+        done = run_migrations()
+    except (psycopg2.Error, MigrationError) as e:
+        print(f"Erro ao aplicar migrações: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Migrações aplicadas: {', '.join(done)}" if done else "Schema em dia.")
@@ -0,0 +1,22 @@
+-- Tabelas da aplicação web: livros e empréstimos
+
+CREATE TABLE IF NOT EXISTS books (
+    id SERIAL PRIMARY KEY,
+    title VARCHAR(150) NOT NULL,
+    author VARCHAR(100) NOT NULL,
+    total_copies INTEGER NOT NULL,
+    available_copies INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS loans (
+    id SERIAL PRIMARY KEY,
+    book_id INTEGER NOT NULL,
+    borrower_name VARCHAR(100) NOT NULL,
+    checkout_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    FOREIGN KEY (book_id) REFERENCES books (id) ON DELETE CASCADE
+);
+
+-- Índices da paginação por chave da página principal
+CREATE INDEX IF NOT EXISTS idx_books_title_id ON books (title, id);
+CREATE INDEX IF NOT EXISTS idx_loans_checkout_date_id ON loans (checkout_date, id);
+CREATE INDEX IF NOT EXISTS idx_loans_book_id ON loans (book_id);
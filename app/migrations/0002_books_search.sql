@@ -0,0 +1,11 @@
+-- Busca textual do acervo (rota /book/search)
+-- Coluna gerada com o tsvector do título (peso A) e do autor (peso B),
+-- recalculada pelo próprio PostgreSQL a cada INSERT/UPDATE e indexada por GIN
+
+ALTER TABLE books ADD COLUMN IF NOT EXISTS search tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('portuguese', coalesce(author, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_books_search ON books USING GIN (search);
@@ -0,0 +1,6 @@
+-- Índice GIN só do título, para a rota /book/search ranquear primeiro os
+-- livros em que os termos aparecem no título (peso A de books.search).
+-- A expressão é a mesma da coluna gerada e de SEARCH_SQL.
+
+CREATE INDEX IF NOT EXISTS idx_books_search_title
+    ON books USING GIN (to_tsvector('portuguese', coalesce(title, '')));
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DatabaseOperations (síncrono, consultas em série) x
+AsyncDatabaseOperations (asyncpg, consultas em paralelo com asyncio.gather)
+
+A carga de cada rodada é a da tela inicial e dos relatórios: as quatro
+contagens exatas, os dois relatórios e `--buscas` consultas de livro por id.
+O cache de leitura do DatabaseOperations é desativado para medir o banco.
+
+Exemplo:
+    python benchmark/async_vs_sync.py --rodadas 20 --buscas 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tabulate import tabulate
+from models.cache import CacheLRU
+from models.database_operations import DatabaseOperations
+from models.async_database_operations import AsyncDatabaseOperations
+
+
+def rodada_sincrona(db_ops, ids):
+    db_ops.get_table_counts()
+    db_ops.relatorio_vendas_por_genero()
+    db_ops.relatorio_pedidos_detalhado()
+    for id_livro in ids:
+        db_ops.obter_livro_por_id(id_livro)
+
+
+async def rodada_assincrona(db_ops, ids):
+    await asyncio.gather(
+        db_ops.get_table_counts(),
+        db_ops.relatorio_vendas_por_genero(),
+        db_ops.relatorio_pedidos_detalhado(),
+        *(db_ops.obter_livro_por_id(id_livro) for id_livro in ids),
+    )
+
+
+def resumir(nome, tempos):
+    return [
+        nome,
+        f"{min(tempos) * 1000:.2f}",
+        f"{statistics.median(tempos) * 1000:.2f}",
+        f"{max(tempos) * 1000:.2f}",
+    ]
+
+
+async def medir_assincrono(rodadas, ids):
+    tempos = []
+    async with AsyncDatabaseOperations() as db_ops:
+        await rodada_assincrona(db_ops, ids)  # aquecimento: abre as conexões do pool
+        for _ in range(rodadas):
+            inicio = time.perf_counter()
+            await rodada_assincrona(db_ops, ids)
+            tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de parede: consultas síncronas x assíncronas")
+    parser.add_argument("--rodadas", type=int, default=20, help="rodadas medidas (padrão: 20)")
+    parser.add_argument("--buscas", type=int, default=10, help="buscas de livro por id por rodada (padrão: 10)")
+    args = parser.parse_args()
+
+    db_ops = DatabaseOperations()
+    db_ops.cache = CacheLRU(tamanho=0)
+    ids = [livro[0] for livro in db_ops.listar_livros_pagina(tamanho=args.buscas)]
+
+    db_ops.db_config.pool.preencher()
+    rodada_sincrona(db_ops, ids)  # aquecimento
+    tempos_sync = []
+    for _ in range(args.rodadas):
+        inicio = time.perf_counter()
+        rodada_sincrona(db_ops, ids)
+        tempos_sync.append(time.perf_counter() - inicio)
+
+    tempos_async = asyncio.run(medir_assincrono(args.rodadas, ids))
+
+    print(f"Rodadas: {args.rodadas} | consultas por rodada: {5 + len(ids)}")
+    print(tabulate(
+        [resumir("DatabaseOperations (série)", tempos_sync),
+         resumir("AsyncDatabaseOperations (gather)", tempos_async)],
+        headers=["IMPLEMENTAÇÃO", "MÍN (ms)", "MEDIANA (ms)", "MÁX (ms)"],
+        tablefmt="grid"
+    ))
+    ganho = statistics.median(tempos_sync) / statistics.median(tempos_async)
+    print(f"Ganho da mediana: {ganho:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
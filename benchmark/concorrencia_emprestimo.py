@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Teste de concorrência do empréstimo de livros (app Flask)
+
+Várias threads tentam emprestar o mesmo livro ao mesmo tempo. Para cada
+implementação, mede a vazão (tentativas por segundo) e verifica se houve
+empréstimo acima do número de cópias:
+
+- atomico: CHECKOUT_SQL da aplicação (uma única instrução)
+- rota: POST /book/checkout/<id> pelo test client do Flask
+- legado: SELECT + UPDATE + INSERT (fluxo anterior da rota, três idas ao banco);
+  só roda quando pedido em --modos, para comparação
+
+O livro de teste é removido no final. O script termina com código 1 se algum
+modo medido deixar cópias disponíveis negativas, emprestar mais do que as
+cópias do livro ou perder a contagem (disponíveis != cópias - empréstimos),
+o que torna o legado uma falha esperada.
+
+Exemplo:
+    python benchmark/concorrencia_emprestimo.py --threads 16 --tentativas 50 --copias 200
+    python benchmark/concorrencia_emprestimo.py --modos legado,atomico,rota
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações; o da aplicação web
+# entra no fim do path só para os módulos dela (db, metrics, migrate)
+RAIZ = Path(__file__).parent.parent
+APP_WEB = RAIZ / 'app' / 'app.py'
+sys.path.append(str(RAIZ))
+sys.path.append(str(APP_WEB.parent))
+
+import psycopg2
+from psycopg2.extensions import make_dsn
+from tabulate import tabulate
+from config.database import DatabaseConfig
+
+
+def checkout_legado(cur, book_id, borrower_name):
+    """Fluxo anterior: verifica, atualiza e insere em instruções separadas"""
+    cur.execute('SELECT available_copies FROM books WHERE id = %s;', (book_id,))
+    book = cur.fetchone()
+    if book and book[0] > 0:
+        cur.execute('UPDATE books SET available_copies = available_copies - 1 WHERE id = %s;', (book_id,))
+        cur.execute('INSERT INTO loans (book_id, borrower_name) VALUES (%s, %s);', (book_id, borrower_name))
+        return True
+    return False
+
+
+def carregar_app_web():
+    """Importa app/app.py pelo caminho do arquivo (a raiz também tem um diretório app)"""
+    spec = importlib.util.spec_from_file_location('app_web', APP_WEB)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = modulo  # o Flask localiza templates pelo módulo registrado
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def checkout_atomico(checkout_sql):
+    """Empréstimo com a instrução única da aplicação"""
+    def checkout(cur, book_id, borrower_name):
+        cur.execute(checkout_sql, {'book_id': book_id, 'borrower_name': borrower_name})
+        return cur.fetchone() is not None
+    return checkout
+
+
+def trabalhador_sql(dsn, checkout, book_id, tentativas, barreira):
+    conn = psycopg2.connect(dsn)
+    cur = conn.cursor()
+    barreira.wait()
+    for i in range(tentativas):
+        try:
+            checkout(cur, book_id, f'leitor-{threading.get_ident()}-{i}')
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()
+    cur.close()
+    conn.close()
+
+
+def trabalhador_rota(dsn, app_flask, book_id, tentativas, barreira):
+    cliente = app_flask.test_client()
+    barreira.wait()
+    for i in range(tentativas):
+        cliente.post(f'/book/checkout/{book_id}', data={'borrower_name': f'leitor-{i}'})
+
+
+def executar(dsn, nome, trabalhador, checkout, args):
+    conn = psycopg2.connect(dsn)
+    cur = conn.cursor()
+    cur.execute(
+        'INSERT INTO books (title, author, total_copies, available_copies) VALUES (%s, %s, %s, %s) RETURNING id;',
+        (f'Teste de concorrência ({nome})', 'Benchmark', args.copias, args.copias)
+    )
+    book_id = cur.fetchone()[0]
+    conn.commit()
+
+    barreira = threading.Barrier(args.threads + 1)
+    threads = [
+        threading.Thread(target=trabalhador, args=(dsn, checkout, book_id, args.tentativas, barreira))
+        for _ in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    cur.execute('SELECT available_copies FROM books WHERE id = %s;', (book_id,))
+    disponiveis = cur.fetchone()[0]
+    cur.execute('SELECT COUNT(*) FROM loans WHERE book_id = %s;', (book_id,))
+    emprestimos = cur.fetchone()[0]
+    cur.execute('DELETE FROM books WHERE id = %s;', (book_id,))
+    conn.commit()
+    cur.close()
+    conn.close()
+
+    tentativas = args.threads * args.tentativas
+    correto = disponiveis >= 0 and emprestimos <= args.copias and disponiveis == args.copias - emprestimos
+    return {
+        'nome': nome,
+        'tentativas': tentativas,
+        'emprestimos': emprestimos,
+        'disponiveis': disponiveis,
+        'vazao': tentativas / duracao,
+        'correto': correto,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Empréstimos concorrentes do mesmo livro")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--tentativas", type=int, default=50, help="tentativas de empréstimo por thread")
+    parser.add_argument("--copias", type=int, default=200, help="cópias do livro de teste")
+    parser.add_argument("--modos", default="atomico,rota",
+                        help="implementações a medir, separadas por vírgula (atomico, rota, legado)")
+    args = parser.parse_args()
+
+    config = DatabaseConfig()
+    dsn = os.environ.get('DATABASE_URL') or make_dsn(
+        host=config.host, port=config.port, dbname=config.database,
+        user=config.user, password=config.password
+    )
+    os.environ['DATABASE_URL'] = dsn
+    os.environ.setdefault('DB_POOL_MAX', str(args.threads))
+
+    web = carregar_app_web()
+    from migrate import run_migrations
+    run_migrations(dsn)  # cria as tabelas da aplicação, se necessário
+
+    modos = {
+        'legado': (trabalhador_sql, checkout_legado),
+        'atomico': (trabalhador_sql, checkout_atomico(web.CHECKOUT_SQL)),
+        'rota': (trabalhador_rota, web.app),
+    }
+    resultados = [executar(dsn, nome, *modos[nome], args) for nome in args.modos.split(',')]
+
+    print(f"{args.threads} threads x {args.tentativas} tentativas sobre um livro com {args.copias} cópias")
+    print(tabulate(
+        [[r['nome'], r['tentativas'], r['emprestimos'], r['disponiveis'], f"{r['vazao']:.0f}",
+          "OK" if r['correto'] else "EMPRÉSTIMO ACIMA DO ESTOQUE"] for r in resultados],
+        headers=["MODO", "TENTATIVAS", "EMPRÉSTIMOS", "CÓPIAS DISPONÍVEIS", "TENTATIVAS/S", "RESULTADO"],
+        tablefmt="grid"
+    ))
+    falhas = [r['nome'] for r in resultados if not r['correto']]
+    if falhas:
+        print(f"❌ Empréstimo acima do estoque em: {', '.join(falhas)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos índices de chaves estrangeiras e ordenação
+
+Compara os planos de execução (EXPLAIN ANALYZE) das consultas de listagem,
+verificação de dependências, cascade e relatórios com e sem os índices da
+migração 20261018110000_indices_fk_e_relatorios.sql e da paginação por chave.
+
+Tudo roda em uma única transação que é desfeita no final: os dados sintéticos
+(--escala) e a remoção dos índices nunca são gravados. Os índices ficam
+bloqueados (ACCESS EXCLUSIVE) durante a execução, então use um banco local.
+
+Exemplo:
+    python benchmark/planos_indices.py --escala 200000 --planos planos.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tabulate import tabulate
+from config.database import DatabaseConfig
+
+INDICES = [
+    'idx_itens_pedido_pedido',
+    'idx_itens_pedido_livro',
+    'idx_livros_autor',
+    'idx_livros_titulo_id',
+    'idx_autores_nome_id',
+    'idx_pedidos_data_id',
+]
+
+# (nome, consulta) - usam ids existentes escolhidos depois da carga
+CONSULTAS = [
+    ("remover_autor: dependências",
+     "SELECT COUNT(*) FROM livros WHERE id_autor = {id_autor}"),
+    ("remover_livro: dependências",
+     "SELECT COUNT(*) FROM itens_pedido WHERE id_livro = {id_livro}"),
+    ("remover_pedido: ON DELETE CASCADE",
+     "DELETE FROM pedidos WHERE id_pedido = {id_pedido}"),
+    ("listar_livros_pagina",
+     """SELECT l.id_livro, l.titulo, a.nome_autor, l.genero, l.preco, l.quantidade_estoque
+        FROM livros l INNER JOIN autores a ON l.id_autor = a.id_autor
+        ORDER BY l.titulo, l.id_livro LIMIT 20"""),
+    ("listar_autores_pagina",
+     """SELECT id_autor, nome_autor, nacionalidade, data_nascimento
+        FROM autores ORDER BY nome_autor, id_autor LIMIT 20"""),
+    ("listar_pedidos_pagina",
+     """SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total
+        FROM pedidos ORDER BY data_pedido DESC, id_pedido DESC LIMIT 20"""),
+    ("relatorio_pedidos_detalhado (100 primeiras)",
+     """SELECT p.id_pedido, p.data_pedido, p.nome_cliente, l.titulo, a.nome_autor,
+               ip.quantidade, ip.preco_unitario, ip.subtotal
+        FROM pedidos p
+        INNER JOIN itens_pedido ip ON p.id_pedido = ip.id_pedido
+        INNER JOIN livros l ON ip.id_livro = l.id_livro
+        INNER JOIN autores a ON l.id_autor = a.id_autor
+        ORDER BY p.data_pedido DESC, p.id_pedido LIMIT 100"""),
+    ("pedido com itens (JOIN por id_pedido)",
+     """SELECT ip.id_livro, ip.quantidade, ip.subtotal
+        FROM itens_pedido ip WHERE ip.id_pedido = {id_pedido}"""),
+]
+
+
+def carregar_dados(cursor, escala):
+    """Gera `escala` livros e pedidos (e proporcionais autores/itens) com generate_series"""
+    autores = max(escala // 20, 1)
+    # Os ids iniciais vêm do RETURNING: subconsultas sobre tabelas recém-carregadas
+    # (sem estatísticas) podem virar laços aninhados quadráticos no planejador
+    cursor.execute("""
+        WITH novos AS (
+            INSERT INTO autores (nome_autor, nacionalidade, data_nascimento, biografia)
+            SELECT 'Autor ' || md5(g::text), 'Nacionalidade ' || mod(g, 30),
+                   DATE '1900-01-01' + mod(g, 36500), 'Biografia ' || g
+            FROM generate_series(1, %s) g
+            RETURNING id_autor
+        )
+        SELECT MIN(id_autor) FROM novos
+    """, (autores,))
+    primeiro_autor = cursor.fetchone()[0]
+    cursor.execute("""
+        WITH novos AS (
+            INSERT INTO livros (titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque)
+            SELECT 'Livro ' || md5(g::text), %s + mod(g, %s), 'Gênero ' || mod(g, 25),
+                   1900 + mod(g, 125), 10 + mod(g, 90), mod(g, 50)
+            FROM generate_series(1, %s) g
+            RETURNING id_livro
+        )
+        SELECT MIN(id_livro) FROM novos
+    """, (primeiro_autor, autores, escala))
+    primeiro_livro = cursor.fetchone()[0]
+    cursor.execute("""
+        WITH novos AS (
+            INSERT INTO pedidos (data_pedido, nome_cliente, email_cliente, valor_total)
+            SELECT DATE '2020-01-01' + mod(g, 2000), 'Cliente ' || g, 'cliente' || g || '@email.com', 0
+            FROM generate_series(1, %s) g
+            RETURNING id_pedido
+        )
+        SELECT MIN(id_pedido) FROM novos
+    """, (escala,))
+    primeiro_pedido = cursor.fetchone()[0]
+    cursor.execute("ANALYZE autores; ANALYZE livros; ANALYZE pedidos;")
+    cursor.execute("""
+        INSERT INTO itens_pedido (id_pedido, id_livro, quantidade, preco_unitario, subtotal)
+        SELECT p, %s + mod(p * 7 + n * 131, %s), 1 + n, 20, 20 * (1 + n)
+        FROM generate_series(%s, %s) p
+        CROSS JOIN generate_series(0, 2) n
+    """, (primeiro_livro, escala, primeiro_pedido, primeiro_pedido + escala - 1))
+    cursor.execute("ANALYZE autores; ANALYZE livros; ANALYZE pedidos; ANALYZE itens_pedido;")
+
+
+def escolher_ids(cursor):
+    """Ids reais para as consultas pontuais (um livro e um pedido com itens)"""
+    cursor.execute("""
+        SELECT l.id_autor, ip.id_livro, ip.id_pedido
+        FROM itens_pedido ip INNER JOIN livros l ON l.id_livro = ip.id_livro
+        ORDER BY ip.id_item DESC LIMIT 1
+    """)
+    linha = cursor.fetchone()
+    if not linha:
+        raise SystemExit("Nenhum item de pedido encontrado. Use --escala para gerar dados.")
+    return {'id_autor': linha[0], 'id_livro': linha[1], 'id_pedido': linha[2]}
+
+
+def resumir_plano(plano):
+    """Lista os nós de acesso às tabelas (ex.: 'Seq Scan livros')"""
+    nos = []
+
+    def visitar(no):
+        if 'Relation Name' in no:
+            indice = f" [{no['Index Name']}]" if 'Index Name' in no else ""
+            nos.append(f"{no['Node Type']} {no['Relation Name']}{indice}")
+        for filho in no.get('Plans', []):
+            visitar(filho)
+
+    visitar(plano['Plan'])
+    for gatilho in plano.get('Triggers', []):
+        nos.append(f"Gatilho {gatilho['Trigger Name']} ({gatilho['Time']:.2f} ms)")
+    return nos
+
+
+def medir(cursor, consultas, ids):
+    """Executa EXPLAIN ANALYZE de cada consulta (desfazendo efeitos com savepoint)"""
+    resultados = {}
+    for nome, consulta in consultas:
+        cursor.execute("SAVEPOINT medicao")
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + consulta.format(**ids))
+        plano = cursor.fetchone()[0][0]
+        cursor.execute("ROLLBACK TO SAVEPOINT medicao")
+        tempo = plano['Execution Time'] + sum(g['Time'] for g in plano.get('Triggers', []))
+        resultados[nome] = {'tempo_ms': tempo, 'nos': resumir_plano(plano), 'plano': plano}
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planos com e sem os índices de FK/ORDER BY")
+    parser.add_argument("--escala", type=int, default=0,
+                        help="livros e pedidos sintéticos a gerar (descartados no final)")
+    parser.add_argument("--planos", metavar="ARQUIVO",
+                        help="grava os planos completos em JSON")
+    args = parser.parse_args()
+
+    conn = DatabaseConfig().connect()
+    try:
+        cursor = conn.cursor()
+        if args.escala:
+            print(f"Gerando dados sintéticos (escala {args.escala})...")
+            carregar_dados(cursor, args.escala)
+        ids = escolher_ids(cursor)
+
+        com_indices = medir(cursor, CONSULTAS, ids)
+
+        for indice in INDICES:
+            cursor.execute(f"DROP INDEX IF EXISTS {indice}")
+        cursor.execute("ANALYZE autores; ANALYZE livros; ANALYZE pedidos; ANALYZE itens_pedido;")
+        sem_indices = medir(cursor, CONSULTAS, ids)
+    finally:
+        conn.rollback()
+        conn.close()
+
+    linhas = []
+    for nome, _ in CONSULTAS:
+        antes, depois = sem_indices[nome], com_indices[nome]
+        ganho = antes['tempo_ms'] / depois['tempo_ms'] if depois['tempo_ms'] else float('inf')
+        linhas.append([
+            nome,
+            f"{antes['tempo_ms']:.2f}",
+            f"{depois['tempo_ms']:.2f}",
+            f"{ganho:.1f}x",
+            "\n".join(antes['nos']),
+            "\n".join(depois['nos']),
+        ])
+    print(tabulate(linhas, headers=["CONSULTA", "SEM ÍNDICES (ms)", "COM ÍNDICES (ms)", "GANHO",
+                                    "PLANO SEM ÍNDICES", "PLANO COM ÍNDICES"], tablefmt="grid"))
+
+    if args.planos:
+        with open(args.planos, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'escala': args.escala,
+                'sem_indices': {nome: r['plano'] for nome, r in sem_indices.items()},
+                'com_indices': {nome: r['plano'] for nome, r in com_indices.items()},
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"Planos completos gravados em {args.planos}")
+
+
+if __name__ == "__main__":
+    main()
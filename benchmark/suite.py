@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmark: métodos públicos do DatabaseOperations e rotas da aplicação web
+
+Para cada tamanho de base, mede cada operação (relatórios, listagens, buscas,
+inserções, atualizações e remoções) e as rotas Flask (pelo test client, com
+requisições concorrentes), registrando p50/p95/p99, vazão e memória alocada
+(pico do tracemalloc na primeira chamada, que também serve de aquecimento).
+O resultado é gravado em JSON; duas execuções podem ser comparadas depois.
+
+Os registros criados pelas operações de escrita são removidos no final. Com
+--tamanhos, as tabelas são esvaziadas e recriadas pelo gerador de dados
+sintéticos, o que exige --recriar-dados; sem ele, mede-se a base atual.
+
+Exemplos:
+    python benchmark/suite.py -o atual.json
+    python benchmark/suite.py --tamanhos 1000,100000 --recriar-dados -o escala.json
+    python benchmark/suite.py --comparar antes.json depois.json --tolerancia 15
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona o diretório raiz e o da aplicação web ao path para importações
+RAIZ = Path(__file__).parent.parent
+sys.path.append(str(RAIZ))
+sys.path.insert(0, str(RAIZ / 'app'))
+
+from psycopg2.extensions import make_dsn
+from tabulate import tabulate
+from models.cache import CacheLRU
+from models.database_operations import DatabaseOperations
+from models.geracao import GeradorDados
+
+PADRAO_ID = re.compile(r"ID: (\d+)")
+
+# Estoque dos livros criados pela suíte, para os pedidos nunca falharem por falta de estoque
+ESTOQUE_BENCHMARK = 1000000
+
+
+def volumes_para(tamanho):
+    """Volumes do gerador para um tamanho de base (quantidade de pedidos)"""
+    return {
+        'autores': max(tamanho // 50, 1),
+        'livros': max(tamanho // 5, 1),
+        'pedidos': tamanho,
+        'books': max(tamanho // 50, 10),
+        'loans': tamanho // 25,
+    }
+
+
+def percentis(tempos):
+    """(p50, p95, p99) em milissegundos"""
+    if len(tempos) == 1:
+        return (tempos[0] * 1000,) * 3
+    cortes = statistics.quantiles(tempos, n=100, method='inclusive')
+    return cortes[49] * 1000, cortes[94] * 1000, cortes[98] * 1000
+
+
+def resultado(tamanho, grupo, operacao, tempos, duracao, memoria, falhas):
+    p50, p95, p99 = percentis(tempos)
+    return {
+        'tamanho': tamanho,
+        'grupo': grupo,
+        'operacao': operacao,
+        'amostras': len(tempos),
+        'falhas': falhas,
+        'p50_ms': round(p50, 3),
+        'p95_ms': round(p95, 3),
+        'p99_ms': round(p99, 3),
+        'ops_por_s': round(len(tempos) / duracao, 1) if duracao else None,
+        'memoria_kb': round(memoria / 1024, 1),
+    }
+
+
+def medir_memoria(funcao):
+    """Executa a função uma vez com o tracemalloc ativo. Retorna (retorno, pico em bytes)"""
+    tracemalloc.start()
+    try:
+        retorno = funcao()
+        return retorno, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# ==================== DatabaseOperations ====================
+
+def id_criado(resultado_escrita):
+    """Id informado na mensagem de sucesso de uma inserção ("... ID: 42")"""
+    sucesso, mensagem = resultado_escrita
+    encontrado = PADRAO_ID.search(mensagem) if sucesso else None
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def consumir(gerador):
+    """Percorre um gerador até o fim, retornando a quantidade de itens"""
+    return sum(1 for _ in gerador)
+
+
+def preparar_contexto(db_ops):
+    """Amostra ids e chaves de paginação existentes para as operações de leitura"""
+    conn = db_ops.db_config.get_connection()
+    cursor = conn.cursor()
+    contexto = {'criados': {'autores': [], 'livros': [], 'pedidos': []}}
+    consultas = {
+        'autores': "SELECT id_autor, nome_autor FROM autores ORDER BY random() LIMIT 200",
+        'livros': "SELECT id_livro, titulo FROM livros ORDER BY random() LIMIT 200",
+        'pedidos': "SELECT id_pedido, data_pedido FROM pedidos ORDER BY random() LIMIT 200",
+    }
+    for tabela, consulta in consultas.items():
+        cursor.execute(consulta)
+        contexto[tabela] = cursor.fetchall() or [(0, None)]
+    cursor.close()
+    db_ops.db_config.release_connection(conn)
+    return contexto
+
+
+def amostra(contexto, tabela, i):
+    linhas = contexto[tabela]
+    return linhas[i % len(linhas)]
+
+
+def lote(contexto, tabela, i, tamanho=50):
+    linhas = contexto[tabela]
+    return [linhas[(i + k) % len(linhas)][0] for k in range(min(tamanho, len(linhas)))]
+
+
+def criado(contexto, tabela, i):
+    criados = contexto['criados'][tabela]
+    return criados[i % len(criados)] if criados else 0
+
+
+def registrar(contexto, tabela, resultado_escrita):
+    novo_id = id_criado(resultado_escrita)
+    if novo_id:
+        contexto['criados'][tabela].append(novo_id)
+    return resultado_escrita
+
+
+def remover_criado(contexto, tabela, remover):
+    criados = contexto['criados'][tabela]
+    return remover(criados.pop()) if criados else (False, f"Nenhum registro criado em {tabela}")
+
+
+# (nome, chamada(db_ops, contexto, i)). As escritas vêm depois das leituras e em
+# ordem de dependência: tudo o que é inserido é removido pelas operações finais
+OPERACOES = [
+    ('get_table_counts', lambda db, ctx, i: db.get_table_counts()),
+    ('get_table_counts(estimado)', lambda db, ctx, i: db.get_table_counts(estimado=True)),
+    ('relatorio_vendas_por_genero', lambda db, ctx, i: db.relatorio_vendas_por_genero()),
+    ('relatorio_pedidos_detalhado', lambda db, ctx, i: db.relatorio_pedidos_detalhado()),
+    ('iterar_relatorio_pedidos_detalhado', lambda db, ctx, i: consumir(db.iterar_relatorio_pedidos_detalhado())),
+    ('reconstruir_resumo_vendas', lambda db, ctx, i: db.reconstruir_resumo_vendas()),
+    ('listar_autores', lambda db, ctx, i: db.listar_autores()),
+    ('listar_livros', lambda db, ctx, i: db.listar_livros()),
+    ('listar_pedidos', lambda db, ctx, i: db.listar_pedidos()),
+    ('listar_autores_pagina', lambda db, ctx, i: db.listar_autores_pagina(*amostra(ctx, 'autores', i)[::-1])),
+    ('listar_livros_pagina', lambda db, ctx, i: db.listar_livros_pagina(*amostra(ctx, 'livros', i)[::-1])),
+    ('listar_pedidos_pagina', lambda db, ctx, i: db.listar_pedidos_pagina(*amostra(ctx, 'pedidos', i)[::-1])),
+    ('obter_autor_por_id', lambda db, ctx, i: db.obter_autor_por_id(amostra(ctx, 'autores', i)[0])),
+    ('obter_livro_por_id', lambda db, ctx, i: db.obter_livro_por_id(amostra(ctx, 'livros', i)[0])),
+    ('obter_pedido_por_id', lambda db, ctx, i: db.obter_pedido_por_id(amostra(ctx, 'pedidos', i)[0])),
+    ('obter_autores_por_ids', lambda db, ctx, i: db.obter_autores_por_ids(lote(ctx, 'autores', i))),
+    ('obter_livros_por_ids', lambda db, ctx, i: db.obter_livros_por_ids(lote(ctx, 'livros', i))),
+    ('obter_pedidos_por_ids', lambda db, ctx, i: db.obter_pedidos_por_ids(lote(ctx, 'pedidos', i))),
+    ('buscar_livros', lambda db, ctx, i: db.buscar_livros(amostra(ctx, 'livros', i)[1])),
+    ('buscar_autores', lambda db, ctx, i: db.buscar_autores(amostra(ctx, 'autores', i)[1][:5])),
+    ('inserir_autor', lambda db, ctx, i: registrar(ctx, 'autores', db.inserir_autor(
+        f"Autor Benchmark {i}", "Brasileira", "1950-01-01", "Criado pela suíte de benchmark"))),
+    ('atualizar_autor', lambda db, ctx, i: db.atualizar_autor(
+        criado(ctx, 'autores', i), f"Autor Benchmark {i}", "Portuguesa", "1950-01-01", "Atualizado")),
+    ('inserir_livro', lambda db, ctx, i: registrar(ctx, 'livros', db.inserir_livro(
+        f"Livro Benchmark {i}", criado(ctx, 'autores', i), "Benchmark", 2000, 10.0, ESTOQUE_BENCHMARK))),
+    ('atualizar_livro', lambda db, ctx, i: db.atualizar_livro(
+        criado(ctx, 'livros', i), f"Livro Benchmark {i}", criado(ctx, 'autores', i), "Benchmark",
+        2001, 12.5, ESTOQUE_BENCHMARK)),
+    ('inserir_pedido', lambda db, ctx, i: registrar(ctx, 'pedidos', db.inserir_pedido(
+        f"Cliente Benchmark {i}", "benchmark@email.com"))),
+    ('registrar_pedido_com_itens', lambda db, ctx, i: registrar(ctx, 'pedidos', db.registrar_pedido_com_itens(
+        f"Cliente Benchmark {i}", "benchmark@email.com",
+        [(criado(ctx, 'livros', i), 1), (criado(ctx, 'livros', i + 1), 2)]))),
+    ('atualizar_pedido', lambda db, ctx, i: db.atualizar_pedido(
+        criado(ctx, 'pedidos', i), f"Cliente Benchmark {i}", "benchmark2@email.com")),
+    ('remover_pedido', lambda db, ctx, i: remover_criado(ctx, 'pedidos', db.remover_pedido)),
+    ('remover_livro', lambda db, ctx, i: remover_criado(ctx, 'livros', db.remover_livro)),
+    ('remover_autor', lambda db, ctx, i: remover_criado(ctx, 'autores', db.remover_autor)),
+]
+
+
+def falhou(retorno):
+    """Escritas retornam (sucesso, mensagem); leituras, lista/dicionário/None"""
+    if isinstance(retorno, tuple) and len(retorno) == 2 and isinstance(retorno[0], bool):
+        return not retorno[0]
+    return False
+
+
+def remover_restantes(db_ops, contexto):
+    """Remove o que sobrou das escritas (remoções que falharam ou pedidos extras)"""
+    conn = db_ops.db_config.get_connection()
+    cursor = conn.cursor()
+    criados = contexto['criados']
+    cursor.execute("DELETE FROM pedidos WHERE id_pedido = ANY(%s)", (criados['pedidos'],))
+    cursor.execute("DELETE FROM livros WHERE id_livro = ANY(%s)", (criados['livros'],))
+    cursor.execute("DELETE FROM autores WHERE id_autor = ANY(%s)", (criados['autores'],))
+    conn.commit()
+    cursor.close()
+    db_ops.db_config.release_connection(conn)
+    db_ops.cache.limpar()
+
+
+def medir_operacoes(db_ops, tamanho, args, filtro):
+    contexto = preparar_contexto(db_ops)
+    resultados = []
+    try:
+        for nome, chamada in OPERACOES:
+            if filtro and not filtro.search(nome):
+                continue
+            primeira, memoria = medir_memoria(lambda: chamada(db_ops, contexto, 0))
+            falhas = int(falhou(primeira))
+            if falhas:
+                print(f"⚠️  {nome}: {primeira[1]}")
+
+            tempos = []
+            for i in range(1, args.repeticoes + 1):
+                inicio = time.perf_counter()
+                retorno = chamada(db_ops, contexto, i)
+                tempos.append(time.perf_counter() - inicio)
+                falhas += falhou(retorno)
+            resultados.append(resultado(tamanho, 'DatabaseOperations', nome, tempos, sum(tempos), memoria, falhas))
+            print(f"  {nome}: p50 {resultados[-1]['p50_ms']} ms")
+    finally:
+        remover_restantes(db_ops, contexto)
+    return resultados
+
+
+# ==================== Rotas Flask ====================
+
+def medir_rotas(web, db_ops, tamanho, args, filtro):
+    """Rotas da aplicação web com `--concorrencia` clientes simultâneos"""
+    conn = db_ops.db_config.get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO books (title, author, total_copies, available_copies) VALUES (%s, %s, %s, %s) RETURNING id",
+        ('Livro Benchmark', 'Benchmark', ESTOQUE_BENCHMARK, ESTOQUE_BENCHMARK)
+    )
+    book_id = cursor.fetchone()[0]
+    cursor.execute("SELECT title, id FROM books ORDER BY title, id OFFSET (SELECT COUNT(*) / 2 FROM books) LIMIT 1")
+    meio = cursor.fetchone() or ('', 0)
+    conn.commit()
+
+    clientes = threading.local()
+
+    def cliente():
+        if not hasattr(clientes, 'cliente'):
+            clientes.cliente = web.app.test_client()
+        return clientes.cliente
+
+    def requisicao(nome, metodo, url, **kwargs):
+        inicio = time.perf_counter()
+        resposta = getattr(cliente(), metodo)(url, **kwargs)
+        return nome, time.perf_counter() - inicio, resposta
+
+    def emprestimo_e_devolucao(i):
+        nome, duracao, resposta = requisicao('POST /book/checkout/batch', 'post', '/book/checkout/batch',
+                                             json={'book_ids': [book_id], 'borrower_name': f'Leitor {i}'})
+        medidas = [(nome, duracao, resposta.status_code)]
+        loan_ids = (resposta.get_json() or {}).get('loan_ids')
+        if loan_ids:
+            nome, duracao, resposta = requisicao('POST /loan/return/batch', 'post', '/loan/return/batch',
+                                                 json={'loan_ids': loan_ids})
+            medidas.append((nome, duracao, resposta.status_code))
+        return medidas
+
+    def simples(nome, url, **kwargs):
+        def tarefa(i):
+            _, duracao, resposta = requisicao(nome, 'get', url, **kwargs)
+            return [(nome, duracao, resposta.status_code)]
+        return nome, tarefa
+
+    cenarios = [
+        simples('GET /', '/'),
+        simples('GET /?q=', '/', query_string={'q': 'Jardim'}),
+        simples('GET / (página do meio)', '/', query_string={'b_title': meio[0], 'b_id': meio[1], 'b_dir': 'next'}),
+        simples('GET /book/search', '/book/search', query_string={'q': 'Jardim'}),
+        simples('GET /pool/stats', '/pool/stats'),
+        ('POST checkout/return em lote', emprestimo_e_devolucao),
+    ]
+
+    resultados = []
+    try:
+        for cenario, tarefa in cenarios:
+            if filtro and not filtro.search(cenario):
+                continue
+            _, memoria = medir_memoria(lambda: tarefa(0))
+
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concorrencia) as executor:
+                medidas = [m for lista in executor.map(tarefa, range(1, args.requisicoes + 1)) for m in lista]
+            duracao = time.perf_counter() - inicio
+
+            for nome in dict.fromkeys(nome for nome, _, _ in medidas):
+                tempos = [d for n, d, _ in medidas if n == nome]
+                falhas = sum(1 for n, _, status in medidas if n == nome and status >= 400)
+                resultados.append(resultado(tamanho, 'Flask', nome, tempos, duracao, memoria, falhas))
+                print(f"  {nome}: p50 {resultados[-1]['p50_ms']} ms")
+    finally:
+        cursor.execute("DELETE FROM books WHERE id = %s", (book_id,))
+        conn.commit()
+        cursor.close()
+        db_ops.db_config.release_connection(conn)
+    return resultados
+
+
+def importar_app(db_ops, concorrencia):
+    """Importa a aplicação web apontando para o mesmo banco (cria as tabelas, se necessário)"""
+    config = db_ops.db_config
+    os.environ['DATABASE_URL'] = make_dsn(
+        host=config.host, port=config.port, dbname=config.database,
+        user=config.user, password=config.password
+    )
+    os.environ.setdefault('DB_POOL_MAX', str(concorrencia))
+    try:
+        import app as web
+        from migrate import run_migrations
+    except ImportError as e:
+        print(f"⚠️  Rotas Flask ignoradas: {e}")
+        return None
+    run_migrations(os.environ['DATABASE_URL'])
+    return web
+
+
+# ==================== Comparação ====================
+
+def variacao(antes, depois):
+    if not antes or depois is None:
+        return None
+    return (depois - antes) / antes * 100
+
+
+def comparar(arquivo_antes, arquivo_depois, tolerancia):
+    """Compara duas execuções. Retorna True se houver regressão acima da tolerância (%)"""
+    with open(arquivo_antes, encoding='utf-8') as arquivo:
+        antes = {(r['tamanho'], r['grupo'], r['operacao']): r for r in json.load(arquivo)['resultados']}
+    with open(arquivo_depois, encoding='utf-8') as arquivo:
+        depois = json.load(arquivo)['resultados']
+
+    linhas = []
+    regressoes = 0
+    for r in depois:
+        base = antes.get((r['tamanho'], r['grupo'], r['operacao']))
+        if base is None:
+            linhas.append([r['tamanho'], r['operacao'], '-', r['p50_ms'], '-', '-', '-', 'NOVA'])
+            continue
+        deltas = [variacao(base[chave], r[chave]) for chave in ('p50_ms', 'p95_ms', 'memoria_kb')]
+        regrediu = any(d is not None and d > tolerancia for d in deltas[:2])
+        regressoes += regrediu
+        linhas.append([
+            r['tamanho'], r['operacao'], base['p50_ms'], r['p50_ms'],
+            *(f"{d:+.1f}%" if d is not None else '-' for d in deltas),
+            '⚠️  REGRESSÃO' if regrediu else 'OK',
+        ])
+
+    print(tabulate(linhas, headers=["TAMANHO", "OPERAÇÃO", "P50 ANTES (ms)", "P50 DEPOIS (ms)",
+                                    "Δ P50", "Δ P95", "Δ MEMÓRIA", "RESULTADO"], tablefmt="grid"))
+    print(f"{regressoes} regressão(ões) acima de {tolerancia:.0f}% no p50 ou p95")
+    return regressoes > 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do DatabaseOperations e das rotas Flask")
+    parser.add_argument("--tamanhos", help="quantidades de pedidos da base, separadas por vírgula "
+                                           "(recria os dados; exige --recriar-dados)")
+    parser.add_argument("--recriar-dados", action="store_true",
+                        help="permite esvaziar as tabelas e gerar os dados de cada tamanho")
+    parser.add_argument("--semente", type=int, default=42, help="semente do gerador de dados (padrão: 42)")
+    parser.add_argument("--repeticoes", type=int, default=20, help="chamadas medidas por operação (padrão: 20)")
+    parser.add_argument("--requisicoes", type=int, default=200, help="requisições por rota (padrão: 200)")
+    parser.add_argument("--concorrencia", type=int, default=8, help="clientes simultâneos nas rotas (padrão: 8)")
+    parser.add_argument("--operacoes", metavar="REGEX", help="mede apenas as operações/rotas cujo nome casar")
+    parser.add_argument("--sem-rotas", action="store_true", help="não mede as rotas Flask")
+    parser.add_argument("--com-cache", action="store_true", help="mantém o cache de leitura ativo")
+    parser.add_argument("-o", "--saida", default="benchmark.json", help="arquivo JSON de saída")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"), help="compara duas execuções")
+    parser.add_argument("--tolerancia", type=float, default=10.0,
+                        help="aumento percentual tolerado na comparação (padrão: 10)")
+    args = parser.parse_args()
+
+    if args.comparar:
+        sys.exit(1 if comparar(*args.comparar, args.tolerancia) else 0)
+    if args.tamanhos and not args.recriar_dados:
+        parser.error("--tamanhos apaga e recria os dados das tabelas; confirme com --recriar-dados")
+    if args.repeticoes < 1 or args.requisicoes < 1 or args.concorrencia < 1:
+        parser.error("repetições, requisições e concorrência devem ser positivas")
+
+    db_ops = DatabaseOperations()
+    if not args.com_cache:
+        db_ops.cache = CacheLRU(tamanho=0)
+    filtro = re.compile(args.operacoes) if args.operacoes else None
+    web = None if args.sem_rotas else importar_app(db_ops, args.concorrencia)
+
+    tamanhos = [int(t) for t in args.tamanhos.split(',')] if args.tamanhos else [None]
+    resultados = []
+    contagens = {}
+    for tamanho in tamanhos:
+        if tamanho is not None:
+            print(f"Gerando base com {tamanho} pedidos...")
+            sucesso, resumo = GeradorDados(db_ops, semente=args.semente).gerar(volumes_para(tamanho), limpar=True)
+            if not sucesso:
+                print(f"❌ {resumo}")
+                sys.exit(1)
+            rotulo = str(tamanho)
+        else:
+            rotulo = "atual"
+
+        contagens[rotulo] = db_ops.get_table_counts()
+        print(f"📊 Base {rotulo}: {contagens[rotulo]}")
+        resultados += medir_operacoes(db_ops, rotulo, args, filtro)
+        if web is not None:
+            resultados += medir_rotas(web, db_ops, rotulo, args, filtro)
+
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump({
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'parametros': {chave: valor for chave, valor in vars(args).items()
+                           if chave not in ('comparar', 'saida', 'tolerancia')},
+            'contagens': contagens,
+            'resultados': resultados,
+        }, arquivo, ensure_ascii=False, indent=2)
+
+    print(tabulate(
+        [[r['tamanho'], r['grupo'], r['operacao'], r['p50_ms'], r['p95_ms'], r['p99_ms'],
+          r['ops_por_s'], r['memoria_kb'], r['falhas']] for r in resultados],
+        headers=["TAMANHO", "GRUPO", "OPERAÇÃO", "P50 (ms)", "P95 (ms)", "P99 (ms)", "OPS/S",
+                 "MEMÓRIA (KB)", "FALHAS"],
+        tablefmt="grid"
+    ))
+    print(f"✅ Resultados gravados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,17 @@ Configuração de conexão com o banco de dados PostgreSQL
 import psycopg2
 from psycopg2 import sql
 import os
+import threading
+import time
+from config.metricas import CursorInstrumentado, obter_metricas
+from config.pool import PoolConexoes
+from config.preparados import ConexaoPreparada, estatisticas_preparados
 
 class DatabaseConfig:
+    # Pools compartilhados por todas as instâncias, um por destino de conexão
+    _pools = {}
+    _pools_lock = threading.Lock()
+
     def __init__(self):
         # Configurações do banco de dados
         self.host = os.getenv('DB_HOST', 'localhost')
@@ -13,23 +22,103 @@ class DatabaseConfig:
         self.database = os.getenv('DB_NAME', 'mydatabase')
         self.user = os.getenv('DB_USER', 'user')
         self.password = os.getenv('DB_PASSWORD', 'password')
+
+        # Configurações do pool de conexões
+        self.pool_min = int(os.getenv('DB_POOL_MIN', '1'))
+        self.pool_max = int(os.getenv('DB_POOL_MAX', '10'))
+        self.pool_max_ocioso = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+        self.pool_max_vida = float(os.getenv('DB_POOL_MAX_LIFETIME', '3600'))
+        self.pool_verificacao = float(os.getenv('DB_POOL_HEALTH_CHECK', '30'))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+
+        # Instruções preparadas no servidor para as consultas mais frequentes
+        self.prepared = os.getenv('DB_PREPARED', '1') == '1'
+
+        # Tempo de cada consulta e da espera por conexão (config/metricas.py)
+        self.metricas = os.getenv('DB_METRICAS', '1') == '1'
+
+    def connect(self):
+        """
+        Abre uma nova conexão física com o banco de dados (fora do pool)
+        """
+        return psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.user,
+            password=self.password,
+            connection_factory=ConexaoPreparada if self.prepared else None,
+            cursor_factory=CursorInstrumentado if self.metricas else None
+        )
+
+    @property
+    def pool(self):
+        """
+        Pool de conexões compartilhado para este destino, criado sob demanda
+        """
+        chave = (self.host, self.port, self.database, self.user)
+        pool = DatabaseConfig._pools.get(chave)
+        if pool is None:
+            with DatabaseConfig._pools_lock:
+                pool = DatabaseConfig._pools.get(chave)
+                if pool is None:
+                    pool = PoolConexoes(
+                        self.connect,
+                        minconn=self.pool_min,
+                        maxconn=self.pool_max,
+                        max_ocioso=self.pool_max_ocioso,
+                        max_vida=self.pool_max_vida,
+                        intervalo_verificacao=self.pool_verificacao,
+                        timeout=self.pool_timeout
+                    )
+                    DatabaseConfig._pools[chave] = pool
+        return pool
     
     def get_connection(self):
         """
-        Estabelece e retorna uma conexão com o banco de dados
+        Empresta uma conexão do pool. Deve ser devolvida com release_connection
         """
         try:
-            connection = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            return connection
+            if not self.metricas:
+                return self.pool.obter()
+            inicio = time.perf_counter()
+            conn = self.pool.obter()
+            obter_metricas().registrar_espera(time.perf_counter() - inicio)
+            return conn
         except psycopg2.Error as e:
             print(f"Erro ao conectar com o banco de dados: {e}")
             return None
+
+    def release_connection(self, conn, descartar=False):
+        """
+        Devolve ao pool uma conexão obtida com get_connection
+        """
+        self.pool.devolver(conn, descartar=descartar)
+
+    def pool_stats(self):
+        """
+        Estatísticas de uso do pool de conexões
+        """
+        return self.pool.estatisticas()
+
+    def prepared_stats(self):
+        """
+        Contadores de PREPARE/EXECUTE das instruções preparadas
+        """
+        return dict(estatisticas_preparados(), ativo=self.prepared)
+
+    def query_stats(self):
+        """
+        Latência das consultas por operação, espera por conexão e consultas lentas
+        """
+        metricas = obter_metricas()
+        return {
+            'ativo': self.metricas,
+            'limite_lento_ms': metricas.limite_lento_ms,
+            'operacoes': metricas.operacoes(),
+            'espera_conexao': metricas.espera_conexao(),
+            'lentas': metricas.consultas_lentas(),
+        }
     
     def test_connection(self):
         """
@@ -42,9 +131,10 @@ class DatabaseConfig:
                 cursor.execute("SELECT version();")
                 version = cursor.fetchone()
                 cursor.close()
-                conn.close()
+                self.release_connection(conn)
                 return True, f"Conexão bem-sucedida! PostgreSQL: {version[0]}"
             except psycopg2.Error as e:
+                self.release_connection(conn)
                 return False, f"Erro na consulta: {e}"
         else:
             return False, "Não foi possível estabelecer conexão"
@@ -65,9 +155,9 @@ class DatabaseConfig:
             cursor.execute(script)
             conn.commit()
             cursor.close()
-            conn.close()
+            self.release_connection(conn)
             return True, "Script executado com sucesso"
         except Exception as e:
             conn.rollback()
-            conn.close()
+            self.release_connection(conn)
             return False, f"Erro ao executar script: {e}"
\ No newline at end of file
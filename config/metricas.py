@@ -0,0 +1,282 @@
+"""
+Métricas das consultas: latência por operação, linhas retornadas, espera por
+conexão do pool e registro de consultas lentas
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import types
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+
+from psycopg2 import extensions, sql
+
+from config.preparados import texto_preparado
+
+# Limites superiores dos baldes dos histogramas, em milissegundos
+LIMITES_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Flag de código de funções geradoras (inspect.CO_GENERATOR); evita importar
+# inspect, que pesa na inicialização do sistema
+CO_GENERATOR = 0x20
+
+# Operação (método do DatabaseOperations) em execução no contexto atual
+_operacao = contextvars.ContextVar('operacao', default=None)
+
+
+class Histograma:
+    """Histograma de latências com baldes fixos (LIMITES_MS). Não é thread-safe: use sob o lock de Metricas"""
+
+    def __init__(self):
+        self.baldes = [0] * (len(LIMITES_MS) + 1)
+        self.contagem = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def observar(self, ms):
+        self.baldes[bisect_left(LIMITES_MS, ms)] += 1
+        self.contagem += 1
+        self.soma += ms
+        self.maximo = max(self.maximo, ms)
+
+    def percentil(self, fracao):
+        """Limite superior do balde que contém o percentil (o máximo observado no último balde)"""
+        alvo = fracao * self.contagem
+        acumulado = 0
+        for indice, quantidade in enumerate(self.baldes):
+            acumulado += quantidade
+            if quantidade and acumulado >= alvo:
+                return min(LIMITES_MS[indice], self.maximo) if indice < len(LIMITES_MS) else self.maximo
+        return 0.0
+
+    def resumo(self):
+        return {
+            'contagem': self.contagem,
+            'media_ms': self.soma / self.contagem if self.contagem else 0.0,
+            'p50_ms': self.percentil(0.50),
+            'p95_ms': self.percentil(0.95),
+            'p99_ms': self.percentil(0.99),
+            'max_ms': self.maximo,
+        }
+
+
+class Metricas:
+    """
+    Métricas de todas as conexões do processo. Consultas acima de
+    `limite_lento_ms` entram no registro de consultas lentas (as últimas
+    `tamanho_registro`) e, se `arquivo_lentas` for informado, são gravadas nele em JSONL.
+    """
+
+    def __init__(self, limite_lento_ms=200.0, tamanho_registro=100, arquivo_lentas=None):
+        self.limite_lento_ms = limite_lento_ms
+        self.arquivo_lentas = arquivo_lentas
+        self._lock = threading.Lock()
+        self._consultas = {}  # operação -> Histograma
+        self._linhas = {}     # operação -> linhas retornadas/afetadas
+        self._erros = {}      # operação -> consultas com erro
+        self._espera = Histograma()
+        self._lentas = deque(maxlen=tamanho_registro)
+
+    def registrar_consulta(self, operacao, consulta, segundos, linhas, erro=False):
+        ms = segundos * 1000
+        with self._lock:
+            histograma = self._consultas.get(operacao)
+            if histograma is None:
+                histograma = self._consultas[operacao] = Histograma()
+                self._linhas[operacao] = 0
+                self._erros[operacao] = 0
+            histograma.observar(ms)
+            self._linhas[operacao] += max(linhas, 0)
+            self._erros[operacao] += erro
+
+        if ms >= self.limite_lento_ms:
+            self.registrar_lenta(operacao, consulta, ms, linhas)
+
+    def registrar_lenta(self, operacao, consulta, ms, linhas):
+        registro = {
+            'quando': datetime.now().isoformat(timespec='seconds'),
+            'operacao': operacao,
+            'ms': round(ms, 2),
+            'linhas': linhas,
+            'consulta': " ".join(consulta.split()),
+        }
+        with self._lock:
+            self._lentas.append(registro)
+        if self.arquivo_lentas:
+            with open(self.arquivo_lentas, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+    def registrar_espera(self, segundos):
+        """Tempo para obter uma conexão do pool (inclui abrir uma nova, se necessário)"""
+        with self._lock:
+            self._espera.observar(segundos * 1000)
+
+    def operacoes(self):
+        """Resumo por operação, da maior para a menor latência total"""
+        with self._lock:
+            resumo = {
+                operacao: dict(histograma.resumo(), total_ms=histograma.soma,
+                               linhas=self._linhas[operacao], erros=self._erros[operacao])
+                for operacao, histograma in self._consultas.items()
+            }
+        return dict(sorted(resumo.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def espera_conexao(self):
+        with self._lock:
+            return self._espera.resumo()
+
+    def consultas_lentas(self):
+        """Consultas lentas registradas, da mais recente para a mais antiga"""
+        with self._lock:
+            return list(reversed(self._lentas))
+
+    def limpar(self):
+        with self._lock:
+            self._consultas.clear()
+            self._linhas.clear()
+            self._erros.clear()
+            self._espera = Histograma()
+            self._lentas.clear()
+
+
+_metricas_padrao = None
+_metricas_lock = threading.Lock()
+
+
+def obter_metricas():
+    """
+    Métricas compartilhadas pelas conexões do processo, configuradas por
+    DB_SLOW_QUERY_MS e DB_SLOW_QUERY_LOG
+    """
+    global _metricas_padrao
+    with _metricas_lock:
+        if _metricas_padrao is None:
+            _metricas_padrao = Metricas(
+                limite_lento_ms=float(os.getenv('DB_SLOW_QUERY_MS', '200')),
+                arquivo_lentas=os.getenv('DB_SLOW_QUERY_LOG') or None,
+            )
+        return _metricas_padrao
+
+
+def nome_operacao(consulta):
+    """Operação atual ou, fora de uma, o primeiro comando da consulta (ex.: 'sql:copy')"""
+    operacao = _operacao.get()
+    if operacao is not None:
+        return operacao
+    comando = consulta.split(None, 1)
+    return f"sql:{comando[0].lower()}" if comando else "sql"
+
+
+def texto_consulta(consulta, cursor):
+    if isinstance(consulta, sql.Composable):
+        consulta = consulta.as_string(cursor)
+    if isinstance(consulta, bytes):
+        consulta = consulta.decode('utf-8', 'replace')
+    # EXECUTE de instrução preparada: registra o SQL original
+    if consulta.startswith('EXECUTE prep_'):
+        return texto_preparado(consulta.split(None, 2)[1]) or consulta
+    return consulta
+
+
+class CursorInstrumentado(extensions.cursor):
+    """
+    Cursor psycopg2 que mede cada execução e registra em obter_metricas().
+    Em cursores nomeados (no servidor), mede-se a abertura, não a leitura dos lotes.
+    """
+
+    def _registrar(self, consulta, inicio, erro):
+        segundos = time.perf_counter() - inicio
+        texto = texto_consulta(consulta, self)
+        obter_metricas().registrar_consulta(nome_operacao(texto), texto, segundos, self.rowcount, erro)
+
+    def execute(self, query, vars=None):
+        inicio = time.perf_counter()
+        erro = True
+        try:
+            resultado = super().execute(query, vars)
+            erro = False
+            return resultado
+        finally:
+            self._registrar(query, inicio, erro)
+
+    def executemany(self, query, vars_list):
+        inicio = time.perf_counter()
+        erro = True
+        try:
+            resultado = super().executemany(query, vars_list)
+            erro = False
+            return resultado
+        finally:
+            self._registrar(query, inicio, erro)
+
+    def copy_expert(self, query, file, size=8192):
+        inicio = time.perf_counter()
+        erro = True
+        try:
+            resultado = super().copy_expert(query, file, size)
+            erro = False
+            return resultado
+        finally:
+            self._registrar(query, inicio, erro)
+
+
+def _com_operacao(nome, funcao, /, *args, **kwargs):
+    """
+    Chama a função com `nome` como operação atual das consultas. Chamadas
+    feitas dentro de outra operação (ex.: obter_por_ids) não trocam o nome dela.
+    """
+    if _operacao.get() is not None:
+        return funcao(*args, **kwargs)
+    token = _operacao.set(nome)
+    try:
+        return funcao(*args, **kwargs)
+    finally:
+        _operacao.reset(token)
+
+
+def _medir(nome, metodo):
+    """
+    Executa o método com `nome` como operação atual das consultas. Um gerador
+    é conduzido passo a passo e o nome vale só durante cada passo: entre duas
+    linhas, as consultas de quem o consome contam para a operação de quem as fez.
+    """
+    if metodo.__code__.co_flags & CO_GENERATOR:
+        @functools.wraps(metodo)
+        def gerador(*args, **kwargs):
+            interno = metodo(*args, **kwargs)
+            passo, argumento = interno.send, None
+            while True:
+                try:
+                    valor = _com_operacao(nome, passo, argumento)
+                except StopIteration as fim:
+                    return fim.value
+                try:
+                    argumento = yield valor
+                    passo = interno.send
+                except GeneratorExit:
+                    # close(): a limpeza do gerador (ex.: fechar o cursor) também é medida
+                    _com_operacao(nome, interno.close)
+                    raise
+                except BaseException as erro:
+                    passo, argumento = interno.throw, erro
+        return gerador
+
+    @functools.wraps(metodo)
+    def wrapper(*args, **kwargs):
+        return _com_operacao(nome, metodo, *args, **kwargs)
+    return wrapper
+
+
+def instrumentar(classe):
+    """
+    Decorator de classe: as consultas feitas dentro de cada método público
+    são registradas com o nome do método como operação
+    """
+    for nome, metodo in list(vars(classe).items()):
+        if not nome.startswith('_') and isinstance(metodo, types.FunctionType):
+            setattr(classe, nome, _medir(nome, metodo))
+    return classe
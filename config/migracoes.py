@@ -0,0 +1,176 @@
+"""
+Migrações versionadas do schema - cada script de supabase/migrations é aplicado uma única vez
+"""
+import hashlib
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import psycopg2
+
+from config.database import DatabaseConfig
+
+DIRETORIO_MIGRACOES = Path(__file__).parent.parent / 'supabase' / 'migrations'
+
+# Chave do pg_advisory_lock que serializa processos migrando o mesmo banco
+CHAVE_LOCK = 7_274_862_010_301_001
+
+Migracao = namedtuple('Migracao', ['versao', 'nome', 'caminho', 'checksum'])
+
+
+def listar_migracoes(diretorio=DIRETORIO_MIGRACOES):
+    """Scripts <versão>_<nome>.sql do diretório, em ordem de versão"""
+    migracoes = []
+    for caminho in Path(diretorio).glob('*.sql'):
+        versao, _, nome = caminho.stem.partition('_')
+        checksum = hashlib.sha256(caminho.read_bytes()).hexdigest()
+        migracoes.append(Migracao(versao, nome, caminho, checksum))
+    return sorted(migracoes, key=lambda migracao: migracao.versao)
+
+
+class MigradorSchema:
+    """
+    Aplica as migrações pendentes e registra cada uma em schema_migrations
+    (versão, checksum e duração). Quando tudo já está aplicado, custa uma
+    única consulta, sem DDL nem lock. Um script alterado depois de aplicado
+    interrompe a migração em vez de ser reaplicado.
+    """
+
+    def __init__(self, db_config=None, diretorio=DIRETORIO_MIGRACOES):
+        self.db_config = db_config or DatabaseConfig()
+        self.diretorio = diretorio
+
+    def aplicadas(self, cursor):
+        """{versão: checksum} das migrações registradas (vazio se a tabela não existir)"""
+        cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        if not cursor.fetchone()[0]:
+            return {}
+        cursor.execute("SELECT versao, checksum FROM schema_migrations")
+        return dict(cursor.fetchall())
+
+    def verificar(self, migracoes, aplicadas):
+        """Mensagem de erro se algum script aplicado foi alterado, senão None"""
+        alteradas = [m.caminho.name for m in migracoes
+                     if m.versao in aplicadas and aplicadas[m.versao] != m.checksum]
+        if alteradas:
+            return (f"Migração alterada depois de aplicada: {', '.join(alteradas)}. "
+                    f"Crie um novo script em vez de editar um já aplicado.")
+        return None
+
+    def migrar(self, conn=None):
+        """
+        Aplica as migrações pendentes, cada uma em sua transação.
+        Com `conn`, usa a conexão já emprestada pelo chamador, sem devolvê-la.
+        Retorna (True, {'aplicadas': [versões], 'baseline': versão ou None})
+        ou (False, mensagem de erro)
+        """
+        if conn is not None:
+            return self._migrar(conn)
+
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+        try:
+            return self._migrar(conn)
+        finally:
+            self.db_config.release_connection(conn)
+
+    def _migrar(self, conn):
+        migracoes = listar_migracoes(self.diretorio)
+        try:
+            cursor = conn.cursor()
+            aplicadas = self.aplicadas(cursor)
+            conn.rollback()
+            erro = self.verificar(migracoes, aplicadas)
+            if erro:
+                return False, erro
+            if all(m.versao in aplicadas for m in migracoes):
+                return True, {'aplicadas': [], 'baseline': None}
+
+            # Lock de sessão: outro processo migrando espera aqui e depois relê o registro
+            cursor.execute("SELECT pg_advisory_lock(%s)", (CHAVE_LOCK,))
+            try:
+                return self._aplicar_pendentes(conn, cursor, migracoes)
+            finally:
+                conn.rollback()
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (CHAVE_LOCK,))
+                conn.commit()
+        except (psycopg2.Error, OSError) as e:
+            conn.rollback()
+            return False, f"Erro ao aplicar migrações: {e}"
+
+    def _aplicar_pendentes(self, conn, cursor, migracoes):
+        """Executado sob o advisory lock"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                versao VARCHAR(50) PRIMARY KEY,
+                nome VARCHAR(200) NOT NULL,
+                checksum CHAR(64) NOT NULL,
+                aplicada_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                duracao_ms INTEGER
+            )
+        """)
+        conn.commit()
+
+        aplicadas = self.aplicadas(cursor)
+        erro = self.verificar(migracoes, aplicadas)
+        if erro:
+            return False, erro
+
+        resultado = {'aplicadas': [], 'baseline': None}
+        # Banco criado antes do registro de migrações: o script inicial (tabelas e
+        # dados de exemplo) já foi executado e não pode rodar de novo
+        cursor.execute("SELECT to_regclass('autores') IS NOT NULL")
+        if not aplicadas and cursor.fetchone()[0]:
+            inicial = migracoes[0]
+            cursor.execute(
+                "INSERT INTO schema_migrations (versao, nome, checksum) VALUES (%s, %s, %s)",
+                (inicial.versao, inicial.nome, inicial.checksum)
+            )
+            conn.commit()
+            aplicadas[inicial.versao] = inicial.checksum
+            resultado['baseline'] = inicial.versao
+
+        for migracao in migracoes:
+            if migracao.versao in aplicadas:
+                continue
+            inicio = time.perf_counter()
+            cursor.execute(migracao.caminho.read_text(encoding='utf-8'))
+            cursor.execute(
+                "INSERT INTO schema_migrations (versao, nome, checksum, duracao_ms) VALUES (%s, %s, %s, %s)",
+                (migracao.versao, migracao.nome, migracao.checksum,
+                 round((time.perf_counter() - inicio) * 1000))
+            )
+            conn.commit()
+            resultado['aplicadas'].append(migracao.versao)
+
+        return True, resultado
+
+    def status(self):
+        """Lista (versão, nome, situação) de cada script: aplicada, pendente ou alterada"""
+        migracoes = listar_migracoes(self.diretorio)
+        conn = self.db_config.get_connection()
+        if not conn:
+            return None
+        try:
+            cursor = conn.cursor()
+            aplicadas = self.aplicadas(cursor)
+            conn.rollback()
+            cursor.close()
+        except psycopg2.Error as e:
+            print(f"Erro ao consultar migrações: {e}")
+            conn.rollback()
+            return None
+        finally:
+            self.db_config.release_connection(conn)
+
+        situacoes = []
+        for migracao in migracoes:
+            if migracao.versao not in aplicadas:
+                situacao = 'pendente'
+            elif aplicadas[migracao.versao] != migracao.checksum:
+                situacao = 'alterada'
+            else:
+                situacao = 'aplicada'
+            situacoes.append((migracao.versao, migracao.nome, situacao))
+        return situacoes
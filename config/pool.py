@@ -0,0 +1,218 @@
+"""
+Pool de conexões com o banco de dados PostgreSQL
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PoolConexoes:
+    """
+    Pool limitado e thread-safe de conexões psycopg2.
+
+    - Mantém entre `minconn` e `maxconn` conexões abertas
+    - Verifica a saúde de conexões ociosas antes de entregá-las
+    - Recicla conexões ociosas há mais de `max_ocioso` segundos
+      (sem descer abaixo de `minconn`) e conexões mais velhas que `max_vida`
+    - Recria o pool automaticamente quando o processo sofre fork
+    """
+
+    def __init__(self, conectar, minconn=1, maxconn=10, max_ocioso=300.0,
+                 max_vida=3600.0, intervalo_verificacao=30.0, timeout=30.0):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Tamanhos inválidos para o pool de conexões")
+
+        self._conectar = conectar
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.max_ocioso = max_ocioso
+        self.max_vida = max_vida
+        self.intervalo_verificacao = intervalo_verificacao
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._iniciar_estado()
+
+    def _iniciar_estado(self):
+        self._pid = os.getpid()
+        self._livres = deque()   # (conexao, criada_em, devolvida_em)
+        self._em_uso = {}        # id(conexao) -> (conexao, criada_em)
+        self._reservadas = 0     # vagas reservadas durante conexão/verificação
+        self._fechado = False
+        self._criadas = 0
+        self._descartadas = 0
+        self._emprestimos = 0
+        self._esperas = 0
+
+    def _verificar_fork(self):
+        """Após um fork, as conexões herdadas pertencem ao processo pai"""
+        if self._pid != os.getpid():
+            self._iniciar_estado()
+
+    def _total(self):
+        return len(self._livres) + len(self._em_uso) + self._reservadas
+
+    def _abrir(self):
+        conn = self._conectar()
+        self._criadas += 1
+        return conn
+
+    def _descartar(self, conn):
+        with self._cond:
+            self._descartadas += 1
+        try:
+            if not conn.closed:
+                conn.close()
+        except psycopg2.Error:
+            pass
+
+    def _saudavel(self, conn, devolvida_em, agora):
+        if conn.closed:
+            return False
+        if agora - devolvida_em < self.intervalo_verificacao:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reciclar_ociosas(self, agora):
+        """Fecha conexões ociosas ou velhas demais, preservando o mínimo"""
+        mantidas = deque()
+        while self._livres:
+            conn, criada_em, devolvida_em = self._livres.popleft()
+            ociosa = agora - devolvida_em > self.max_ocioso
+            velha = self.max_vida and agora - criada_em > self.max_vida
+            excedente = len(mantidas) + len(self._livres) + len(self._em_uso) >= self.minconn
+            if conn.closed or velha or (ociosa and excedente):
+                self._descartar(conn)
+            else:
+                mantidas.append((conn, criada_em, devolvida_em))
+        self._livres = mantidas
+
+    def preencher(self):
+        """Abre conexões até atingir o tamanho mínimo"""
+        with self._cond:
+            self._verificar_fork()
+            agora = time.monotonic()
+            while self._total() < self.minconn:
+                self._livres.append((self._abrir(), agora, agora))
+
+    def obter(self):
+        """
+        Empresta uma conexão do pool, aguardando até `timeout` segundos
+        quando todas as conexões estiverem em uso
+        """
+        limite = time.monotonic() + self.timeout
+        while True:
+            candidata = None
+            with self._cond:
+                self._verificar_fork()
+                while True:
+                    if self._fechado:
+                        raise PoolError("O pool de conexões está fechado")
+
+                    agora = time.monotonic()
+                    self._reciclar_ociosas(agora)
+                    if self._livres:
+                        candidata = self._livres.pop()
+                        self._reservadas += 1
+                        break
+                    if self._total() < self.maxconn:
+                        self._reservadas += 1
+                        break
+
+                    restante = limite - agora
+                    if restante <= 0:
+                        raise PoolError(
+                            f"Tempo esgotado aguardando conexão livre (máximo: {self.maxconn})"
+                        )
+                    self._esperas += 1
+                    self._cond.wait(restante)
+
+            # Verificação de saúde e handshake acontecem fora do lock
+            conn = None
+            try:
+                if candidata is not None:
+                    conn, criada_em, devolvida_em = candidata
+                    if not self._saudavel(conn, devolvida_em, time.monotonic()):
+                        self._descartar(conn)
+                        conn = None
+                else:
+                    conn = self._conectar()
+                    criada_em = time.monotonic()
+            finally:
+                with self._cond:
+                    self._reservadas -= 1
+                    if conn is not None:
+                        if candidata is None:
+                            self._criadas += 1
+                        self._em_uso[id(conn)] = (conn, criada_em)
+                        self._emprestimos += 1
+                    else:
+                        self._cond.notify()
+
+            if conn is not None:
+                return conn
+
+    def devolver(self, conn, descartar=False):
+        """
+        Devolve uma conexão ao pool. Transações pendentes são desfeitas e
+        conexões quebradas são descartadas.
+        """
+        if self._pid != os.getpid():
+            # Conexão herdada do processo pai: não pertence a este pool
+            return
+
+        if not descartar and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    descartar = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                descartar = True
+
+        with self._cond:
+            registro = self._em_uso.pop(id(conn), None)
+            if registro is None:
+                raise PoolError("Conexão não pertence a este pool")
+
+            if descartar or conn.closed or self._fechado:
+                self._descartar(conn)
+            else:
+                self._livres.append((conn, registro[1], time.monotonic()))
+            self._cond.notify()
+
+    def fechar(self):
+        """Fecha todas as conexões livres e impede novos empréstimos"""
+        with self._cond:
+            self._fechado = True
+            while self._livres:
+                self._descartar(self._livres.popleft()[0])
+            self._cond.notify_all()
+
+    def estatisticas(self):
+        """Retorna um resumo do estado atual do pool"""
+        with self._cond:
+            return {
+                'minimo': self.minconn,
+                'maximo': self.maxconn,
+                'em_uso': len(self._em_uso),
+                'livres': len(self._livres),
+                'criadas': self._criadas,
+                'descartadas': self._descartadas,
+                'emprestimos': self._emprestimos,
+                'esperas': self._esperas,
+            }
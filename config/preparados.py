@@ -0,0 +1,116 @@
+"""
+Instruções preparadas no servidor (PREPARE/EXECUTE) por conexão
+"""
+import hashlib
+import re
+import threading
+
+from psycopg2 import extensions
+
+# %s, %(nome)s e o escape %% do psycopg2
+_MARCADORES = re.compile(r"%%|%s|%\((\w+)\)s")
+
+_conversoes = {}
+_textos = {}  # nome da instrução -> SQL preparado
+_lock = threading.Lock()
+_contadores = {'preparacoes': 0, 'execucoes': 0}
+
+
+def converter_parametros(query):
+    """
+    Converte os marcadores do psycopg2 para parâmetros posicionais ($1, $2...).
+    Retorna (sql, ordem), onde ordem é None para marcadores posicionais ou a
+    lista de nomes na ordem dos parâmetros. Um nome repetido reutiliza o mesmo $n.
+    """
+    ordem = []
+    nomeados = {}
+    posicionais = 0
+
+    def substituir(marcador):
+        nonlocal posicionais
+        if marcador.group(0) == '%%':
+            return '%'
+        nome = marcador.group(1)
+        if nome is None:
+            posicionais += 1
+            return f"${posicionais}"
+        if nome not in nomeados:
+            ordem.append(nome)
+            nomeados[nome] = len(ordem)
+        return f"${nomeados[nome]}"
+
+    sql_posicional = _MARCADORES.sub(substituir, query)
+    if posicionais and nomeados:
+        raise ValueError("Consulta mistura parâmetros posicionais e nomeados")
+    return sql_posicional, (ordem if nomeados else None)
+
+
+def _converter(query):
+    """Conversão e nome da instrução, memorizados por texto de consulta"""
+    conversao = _conversoes.get(query)
+    if conversao is None:
+        sql_posicional, ordem = converter_parametros(query)
+        nome = "prep_" + hashlib.sha1(sql_posicional.encode('utf-8')).hexdigest()[:16]
+        conversao = (nome, sql_posicional, ordem)
+        with _lock:
+            _conversoes[query] = conversao
+            _textos[nome] = sql_posicional
+    return conversao
+
+
+def texto_preparado(nome):
+    """SQL de uma instrução preparada pelo nome (None se desconhecida)"""
+    return _textos.get(nome)
+
+
+def _contar(chave):
+    with _lock:
+        _contadores[chave] += 1
+
+
+class ConexaoPreparada(extensions.connection):
+    """
+    Conexão psycopg2 que lembra as instruções já preparadas nela.
+    Instruções preparadas não são desfeitas por ROLLBACK e duram até a
+    conexão ser fechada, junto com este registro.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preparados = set()
+
+    def executar_preparado(self, cursor, query, params=None):
+        nome, sql_posicional, ordem = _converter(query)
+        if nome not in self.preparados:
+            cursor.execute(f"PREPARE {nome} AS {sql_posicional}")
+            self.preparados.add(nome)
+            _contar('preparacoes')
+
+        if ordem is not None:
+            params = [params[chave] for chave in ordem]
+        if params:
+            marcadores = ", ".join(["%s"] * len(params))
+            cursor.execute(f"EXECUTE {nome} ({marcadores})", params)
+        else:
+            cursor.execute(f"EXECUTE {nome}")
+        _contar('execucoes')
+
+
+def executar(cursor, query, params=None):
+    """
+    Executa a consulta como instrução preparada quando a conexão do cursor
+    for uma ConexaoPreparada (DB_PREPARED=1); caso contrário, usa execute comum.
+    Sem parâmetros o execute comum recebe () para que o psycopg2 também
+    converta %% em %, como acontece na instrução preparada.
+    """
+    conn = cursor.connection
+    if isinstance(conn, ConexaoPreparada):
+        conn.executar_preparado(cursor, query, params)
+    else:
+        cursor.execute(query, () if params is None else params)
+
+
+def estatisticas_preparados():
+    """Preparações (PREPARE) e execuções (EXECUTE) feitas pelo processo"""
+    with _lock:
+        return dict(_contadores, consultas_distintas=len(_conversoes))
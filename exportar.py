@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Exportação de tabelas e relatórios da biblioteca para CSV/JSONL
+
+Exemplos:
+    python exportar.py livros -o livros.csv
+    python exportar.py pedidos_detalhado --formato jsonl -o pedidos.jsonl.gz
+    python exportar.py vendas_por_genero --formato jsonl | jq .
+
+Os dados saem do banco por COPY TO STDOUT e são gravados bloco a bloco,
+sem passar por tuplas Python. Arquivos terminados em .gz são compactados.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações
+sys.path.append(str(Path(__file__).parent))
+
+from models.exportacao import Exportador, ALVOS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportação via COPY TO STDOUT")
+    parser.add_argument("alvo", choices=ALVOS, help="tabela ou relatório a exportar")
+    parser.add_argument("-o", "--saida", default="-",
+                        help="arquivo de destino (padrão: saída padrão)")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--gzip", action="store_true",
+                        help="compacta a saída (automático para arquivos .gz)")
+    args = parser.parse_args()
+
+    compactar = args.gzip or args.saida.endswith(".gz")
+    sucesso, mensagem = Exportador().exportar(args.alvo, args.saida, args.formato, compactar)
+
+    # Mensagens vão para stderr para não misturar com os dados em stdout
+    print(f"{'✅' if sucesso else '❌'} {mensagem}", file=sys.stderr)
+    sys.exit(0 if sucesso else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Geração de dados sintéticos para testes de escala
+
+Exemplo:
+    python gerar_dados.py --autores 20000 --livros 200000 --pedidos 1000000 --semente 7 --limpar
+
+Gera autores, livros, pedidos e itens com distribuições realistas (poucos livros
+concentram a maior parte das vendas, pedidos espalhados pelos últimos anos com
+pico no fim do ano, mistura ponderada de gêneros) e, se as tabelas da aplicação
+web existirem no mesmo banco, livros e empréstimos dela. A mesma semente e os
+mesmos parâmetros geram sempre os mesmos dados. A carga é feita com COPY FROM STDIN.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações
+sys.path.append(str(Path(__file__).parent))
+
+from tabulate import tabulate
+from models.geracao import GeradorDados, VOLUMES_PADRAO, DATA_FINAL_PADRAO
+
+
+def quantidade(valor):
+    numero = int(valor)
+    if numero < 0:
+        raise argparse.ArgumentTypeError("a quantidade não pode ser negativa")
+    return numero
+
+
+def data(valor):
+    try:
+        return datetime.strptime(valor, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {valor!r} (use YYYY-MM-DD)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geração de dados sintéticos via COPY")
+    parser.add_argument("--autores", type=quantidade, default=VOLUMES_PADRAO['autores'])
+    parser.add_argument("--livros", type=quantidade, default=VOLUMES_PADRAO['livros'])
+    parser.add_argument("--pedidos", type=quantidade, default=VOLUMES_PADRAO['pedidos'],
+                        help="pedidos, com 1 a 5 itens cada")
+    parser.add_argument("--livros-web", dest="books", type=quantidade, default=VOLUMES_PADRAO['books'],
+                        help="livros da aplicação web (tabela books)")
+    parser.add_argument("--emprestimos", dest="loans", type=quantidade, default=VOLUMES_PADRAO['loans'],
+                        help="empréstimos da aplicação web (tabela loans)")
+    parser.add_argument("--semente", type=int, default=42, help="semente do gerador (padrão: 42)")
+    parser.add_argument("--ate", type=data, default=DATA_FINAL_PADRAO, metavar="YYYY-MM-DD",
+                        help=f"data do último pedido (padrão: {DATA_FINAL_PADRAO})")
+    parser.add_argument("--anos", type=int, default=5, help="anos cobertos pelos pedidos (padrão: 5)")
+    parser.add_argument("--limpar", action="store_true",
+                        help="esvazia as tabelas antes de gerar (TRUNCATE ... RESTART IDENTITY)")
+    args = parser.parse_args()
+
+    volumes = {tabela: getattr(args, tabela) for tabela in VOLUMES_PADRAO}
+    gerador = GeradorDados(semente=args.semente, data_final=args.ate, anos=args.anos)
+    sucesso, resumo = gerador.gerar(volumes, limpar=args.limpar)
+    if not sucesso:
+        print(f"❌ {resumo}")
+        sys.exit(1)
+
+    segundos = resumo.pop('segundos')
+    print(tabulate([[tabela, linhas] for tabela, linhas in resumo.items()],
+                   headers=["TABELA", "LINHAS GERADAS"], tablefmt="grid"))
+    total = sum(resumo.values())
+    print(f"✅ {total} linhas em {segundos:.1f}s ({total / segundos:.0f} linhas/s)")
+    if 'books' not in resumo:
+        print("ℹ️  Tabelas books/loans não encontradas: dados da aplicação web não gerados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Importação em massa de arquivos CSV/JSONL para o banco da biblioteca
+
+Exemplo:
+    python importar.py --autores autores.csv --livros livros.jsonl \
+        --pedidos pedidos.csv --itens-pedido itens.csv --rejeitados rejeitados.jsonl
+
+Os arquivos são carregados com COPY FROM STDIN em tabelas de staging, as chaves
+estrangeiras são validadas no banco e os registros válidos entram nas tabelas
+reais por upsert (registros com id existente são atualizados).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações
+sys.path.append(str(Path(__file__).parent))
+
+from tabulate import tabulate
+from models.importacao import ImportadorEmMassa, ORDEM_TABELAS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importação em massa via COPY")
+    for tabela in ORDEM_TABELAS:
+        parser.add_argument(f"--{tabela.replace('_', '-')}", dest=tabela, metavar="ARQUIVO",
+                            help=f"arquivo CSV ou JSONL com registros de {tabela}")
+    parser.add_argument("--formato", choices=["csv", "jsonl"],
+                        help="força o formato (padrão: pela extensão do arquivo)")
+    parser.add_argument("--rejeitados", metavar="ARQUIVO",
+                        help="grava as linhas rejeitadas em JSONL")
+    args = parser.parse_args()
+
+    arquivos = {tabela: getattr(args, tabela) for tabela in ORDEM_TABELAS if getattr(args, tabela)}
+    if not arquivos:
+        parser.error("informe ao menos um arquivo para importar")
+
+    importador = ImportadorEmMassa(arquivo_rejeitados=args.rejeitados)
+    houve_erro = False
+    linhas_resumo = []
+
+    for tabela, resultado in importador.importar_varios(arquivos, args.formato).items():
+        sucesso, resumo = resultado
+        if not sucesso:
+            print(f"❌ {resumo}")
+            houve_erro = True
+            continue
+
+        linhas_resumo.append([tabela, resumo['lidas'], resumo['inseridas'],
+                              resumo['atualizadas'], resumo['rejeitadas']])
+        for linha, motivo in resumo['amostra_rejeicoes']:
+            print(f"⚠️  {tabela}, linha {linha}: {motivo}")
+
+    if linhas_resumo:
+        print(tabulate(linhas_resumo, headers=["TABELA", "LIDAS", "INSERIDAS", "ATUALIZADAS", "REJEITADAS"],
+                       tablefmt="grid"))
+    sys.exit(1 if houve_erro else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,68 +17,118 @@ Desenvolvido por:
 - Ana Paula Ferreira
 """
 
-import sys
+import time
+
+INICIO = time.perf_counter()
+
+import argparse
+import importlib.util
 import os
-from pathlib import Path
+import sys
+from contextlib import contextmanager
 
 # Adiciona o diretório raiz ao path para importações
-sys.path.append(str(Path(__file__).parent))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos importados só para verificar que existem; a importação de fato
+# acontece no primeiro uso. O tabulate fica de fora: o menu não o usa, só os
+# scripts importar/migrar/gerar_dados e os benchmarks
+DEPENDENCIAS = {'psycopg2': 'psycopg2-binary', 'colorama': 'colorama'}
+
+
+class PerfilInicializacao:
+    """Tempo de cada fase da inicialização, exibido com --profile-startup"""
+
+    def __init__(self):
+        self.fases = []
+
+    @contextmanager
+    def fase(self, nome):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases.append((nome, time.perf_counter() - inicio))
+
+    def imprimir(self):
+        total = time.perf_counter() - INICIO
+        print(f"\n⏱️  Inicialização até o menu: {total * 1000:.1f} ms (a partir do início do main.py)")
+        print(f"   {'FASE':<44} {'MS':>8} {'%':>6}")
+        for nome, segundos in self.fases + [("outros (main.py, saída no terminal)", total - sum(s for _, s in self.fases))]:
+            print(f"   {nome:<44} {segundos * 1000:8.1f} {segundos / total:6.1%}")
+        print("   Detalhe por módulo: python -X importtime main.py --profile-startup")
 
-from config.database import DatabaseConfig
-from views.interface import Interface
 
 def verificar_dependencias():
     """
-    Verifica se todas as dependências estão instaladas
+    Verifica se todas as dependências estão instaladas, sem importá-las
     """
-    try:
-        import psycopg2
-        import tabulate
-        import colorama
-        return True, "Todas as dependências estão instaladas"
-    except ImportError as e:
-        return False, f"Dependência faltando: {e}. Execute: pip install -r requirements.txt"
-
-def inicializar_banco():
+    faltando = [pacote for modulo, pacote in DEPENDENCIAS.items() if importlib.util.find_spec(modulo) is None]
+    if faltando:
+        return False, f"Dependência faltando: {', '.join(faltando)}. Execute: pip install -r requirements.txt"
+    return True, "Todas as dependências estão instaladas"
+
+def inicializar_banco(db_ops):
     """
-    Inicializa o banco de dados executando o script de schema
+    Verificações de inicialização em uma única conexão do pool: a própria
+    conexão, as migrações pendentes (supabase/migrations) e as contagens da
+    splash screen. Com o schema em dia, as migrações custam uma consulta, sem DDL.
+    Retorna (True, contagens) ou (False, mensagem de erro)
     """
-    db_config = DatabaseConfig()
-    
-    # Testa a conexão
-    sucesso, mensagem = db_config.test_connection()
-    if not sucesso:
-        return False, f"Erro de conexão: {mensagem}"
+    from config.migracoes import MigradorSchema
+
+    db_config = db_ops.db_config
+    conn = db_config.get_connection()
+    if not conn:
+        return False, "Erro de conexão: Não foi possível estabelecer conexão"
     
-    # Executa o script de criação das tabelas
-    script_path = Path(__file__).parent / "database" / "schema.sql"
-    if script_path.exists():
-        sucesso, mensagem = db_config.execute_script(script_path)
+    try:
+        sucesso, resultado = MigradorSchema(db_config).migrar(conn)
         if not sucesso:
-            return False, f"Erro ao executar script: {mensagem}"
-    else:
-        return False, f"Script SQL não encontrado: {script_path}"
-    
-    return True, "Banco de dados inicializado com sucesso"
+            return False, resultado
+        
+        if resultado['baseline']:
+            print(f"📌 Banco existente registrado na migração {resultado['baseline']}")
+        if resultado['aplicadas']:
+            print(f"🧱 Migrações aplicadas: {', '.join(resultado['aplicadas'])}")
+        
+        return True, db_ops.get_table_counts(estimado=True, conn=conn)
+    finally:
+        db_config.release_connection(conn)
 
 def main():
     """
     Função principal do sistema
     """
+    parser = argparse.ArgumentParser(description="Sistema de Gerenciamento de Biblioteca")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="mede cada fase da inicialização até o menu, exibe o detalhamento e sai")
+    args = parser.parse_args()
+    perfil = PerfilInicializacao()
+
     print("🔄 Iniciando Sistema de Gerenciamento de Biblioteca...")
     
     # Verifica dependências
     print("📦 Verificando dependências...")
-    sucesso, mensagem = verificar_dependencias()
+    with perfil.fase("verificar dependências"):
+        sucesso, mensagem = verificar_dependencias()
     if not sucesso:
         print(f"❌ {mensagem}")
         sys.exit(1)
     
+    # psycopg2 é importado de fato aqui, pelo config.database
+    with perfil.fase("import config e models (psycopg2)"):
+        from models.database_operations import DatabaseOperations
+    with perfil.fase("import views (colorama)"):
+        from views.interface import Interface
+    
     # Inicializa banco de dados
     print("🗄️  Inicializando banco de dados...")
-    sucesso, mensagem = inicializar_banco()
+    with perfil.fase("conexão, migrações e contagens"):
+        db_ops = DatabaseOperations()
+        sucesso, resultado = inicializar_banco(db_ops)
     if not sucesso:
-        print(f"❌ {mensagem}")
+        print(f"❌ {resultado}")
         print("\n💡 Dicas para resolver:")
         print("   1. Verifique se o PostgreSQL está rodando")
         print("   2. Confirme as credenciais no docker-compose.yml")
@@ -90,8 +140,13 @@ def main():
     
     # Inicia a interface
     try:
-        interface = Interface()
-        interface.splash_screen()
+        interface = Interface(db_ops)
+        if args.profile_startup:
+            with perfil.fase("splash screen"):
+                interface.splash_screen(resultado, pausar=False)
+            perfil.imprimir()
+            return
+        interface.splash_screen(resultado)
         interface.menu_principal()
     except KeyboardInterrupt:
         print("\n\n👋 Sistema interrompido pelo usuário. Até logo!")
@@ -101,4 +156,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Migrações do schema (supabase/migrations)
+
+Exemplo:
+    python migrar.py            # aplica as pendentes
+    python migrar.py --status   # lista a situação de cada script
+
+Cada script é aplicado uma única vez, sob um advisory lock, e registrado em
+schema_migrations com o checksum. O sistema também aplica as pendentes ao iniciar.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para importações
+sys.path.append(str(Path(__file__).parent))
+
+from tabulate import tabulate
+from config.migracoes import MigradorSchema
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrações do schema")
+    parser.add_argument("--status", action="store_true",
+                        help="apenas lista as migrações aplicadas, pendentes ou alteradas")
+    args = parser.parse_args()
+
+    migrador = MigradorSchema()
+    if args.status:
+        situacoes = migrador.status()
+        if situacoes is None:
+            print("❌ Não foi possível consultar as migrações")
+            sys.exit(1)
+        print(tabulate(situacoes, headers=["VERSÃO", "NOME", "SITUAÇÃO"], tablefmt="grid"))
+        sys.exit(1 if any(situacao == 'alterada' for _, _, situacao in situacoes) else 0)
+
+    sucesso, resultado = migrador.migrar()
+    if not sucesso:
+        print(f"❌ {resultado}")
+        sys.exit(1)
+    if resultado['baseline']:
+        print(f"📌 Banco existente registrado na migração {resultado['baseline']}")
+    if resultado['aplicadas']:
+        print(f"✅ Migrações aplicadas: {', '.join(resultado['aplicadas'])}")
+    else:
+        print("✅ Schema em dia")
+
+
+if __name__ == "__main__":
+    main()
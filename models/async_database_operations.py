@@ -0,0 +1,640 @@
+"""
+Operações de banco de dados assíncronas (asyncio + asyncpg) - Queries SQL manuais
+
+Mesma interface do DatabaseOperations, com métodos `async`. Cada consulta usa
+uma conexão própria do pool, então operações independentes (contagens,
+relatórios, buscas) podem rodar ao mesmo tempo com asyncio.gather.
+"""
+import asyncio
+from datetime import date
+
+from config.database import DatabaseConfig
+from config.preparados import converter_parametros
+from models.database_operations import DatabaseOperations, escapar_like
+
+try:
+    import asyncpg
+except ImportError:  # dependência opcional, verificada ao criar o pool
+    asyncpg = None
+
+# Erros tratados como falha de banco (mensagem e retorno vazio, como na versão síncrona)
+ERROS_BANCO = (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) if asyncpg else (OSError,)
+
+
+class _Desfazer(Exception):
+    """Interrompe a transação de uma escrita que retornou (False, mensagem)"""
+
+
+def _posicional(query):
+    """Converte uma consulta no formato do psycopg2 (%s) para o do asyncpg ($n)"""
+    return converter_parametros(query)[0]
+
+
+def _data(valor):
+    """O asyncpg exige objetos date; a interface informa datas como 'YYYY-MM-DD'"""
+    if isinstance(valor, str):
+        return date.fromisoformat(valor) if valor else None
+    return valor
+
+
+def _tuplas(registros):
+    """Converte asyncpg.Record em tuplas, como as retornadas pelo psycopg2"""
+    return [tuple(registro) for registro in registros]
+
+
+class AsyncDatabaseOperations:
+    # Consultas compartilhadas com a versão síncrona
+    SQL_VENDAS_POR_GENERO = DatabaseOperations.SQL_VENDAS_POR_GENERO
+    SQL_VENDAS_POR_GENERO_COMPLETO = DatabaseOperations.SQL_VENDAS_POR_GENERO_COMPLETO
+    SQL_DIVERGENCIAS_RESUMO_VENDAS = DatabaseOperations.SQL_DIVERGENCIAS_RESUMO_VENDAS
+    SQL_RECONSTRUIR_RESUMO_VENDAS = DatabaseOperations.SQL_RECONSTRUIR_RESUMO_VENDAS
+    SQL_PEDIDOS_DETALHADO = DatabaseOperations.SQL_PEDIDOS_DETALHADO
+    TABELAS_CONTAGEM = DatabaseOperations.TABELAS_CONTAGEM
+    SQL_CONTAGEM_ESTIMADA = _posicional(DatabaseOperations.SQL_CONTAGEM_ESTIMADA)
+    LIMITE_CANDIDATOS = DatabaseOperations.LIMITE_CANDIDATOS
+    SQL_BUSCAR_LIVROS, ORDEM_BUSCAR_LIVROS = converter_parametros(
+        DatabaseOperations.SQL_BUSCAR_LIVROS
+    )
+    TAMANHO_MINIMO_FRAGMENTO = DatabaseOperations.TAMANHO_MINIMO_FRAGMENTO
+    SQL_BUSCAR_AUTORES, ORDEM_BUSCAR_AUTORES = converter_parametros(
+        DatabaseOperations.SQL_BUSCAR_AUTORES
+    )
+    SQL_BUSCAR_AUTORES_TRECHO, ORDEM_BUSCAR_AUTORES_TRECHO = converter_parametros(
+        DatabaseOperations.SQL_BUSCAR_AUTORES_TRECHO
+    )
+    SQL_TRIGRAMAS_DISPONIVEIS = DatabaseOperations.SQL_TRIGRAMAS_DISPONIVEIS
+    SQL_REGISTRAR_PEDIDO, ORDEM_REGISTRAR_PEDIDO = converter_parametros(
+        DatabaseOperations.SQL_REGISTRAR_PEDIDO
+    )
+    SQL_LISTAR_AUTORES_PAGINA = tuple(map(_posicional, DatabaseOperations.SQL_LISTAR_AUTORES_PAGINA))
+    SQL_LISTAR_LIVROS_PAGINA = tuple(map(_posicional, DatabaseOperations.SQL_LISTAR_LIVROS_PAGINA))
+    SQL_LISTAR_PEDIDOS_PAGINA = tuple(map(_posicional, DatabaseOperations.SQL_LISTAR_PEDIDOS_PAGINA))
+    SQL_REMOVER_AUTORES = _posicional(DatabaseOperations.SQL_REMOVER_AUTORES)
+    SQL_DEPENDENCIAS_AUTORES = _posicional(DatabaseOperations.SQL_DEPENDENCIAS_AUTORES)
+    SQL_REMOVER_LIVROS = _posicional(DatabaseOperations.SQL_REMOVER_LIVROS)
+    SQL_DEPENDENCIAS_LIVROS = _posicional(DatabaseOperations.SQL_DEPENDENCIAS_LIVROS)
+    SQL_REMOVER_PEDIDOS = _posicional(DatabaseOperations.SQL_REMOVER_PEDIDOS)
+    SQL_AUTORES_POR_IDS = _posicional(DatabaseOperations.SQL_AUTORES_POR_IDS)
+    SQL_LIVROS_POR_IDS = _posicional(DatabaseOperations.SQL_LIVROS_POR_IDS)
+    SQL_PEDIDOS_POR_IDS = _posicional(DatabaseOperations.SQL_PEDIDOS_POR_IDS)
+
+    def __init__(self, db_config=None):
+        self.db_config = db_config or DatabaseConfig()
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self.trigramas = None  # pg_trgm disponível? (verificado na primeira busca de autores)
+
+    async def __aenter__(self):
+        await self.pool()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.fechar()
+
+    async def pool(self):
+        """
+        Pool de conexões asyncpg, criado sob demanda no event loop atual com os
+        mesmos limites do pool síncrono (DB_POOL_MIN/DB_POOL_MAX)
+        """
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    if asyncpg is None:
+                        raise RuntimeError("asyncpg não instalado. Execute: pip install asyncpg")
+                    self._pool = await asyncpg.create_pool(
+                        host=self.db_config.host,
+                        port=int(self.db_config.port),
+                        database=self.db_config.database,
+                        user=self.db_config.user,
+                        password=self.db_config.password,
+                        min_size=self.db_config.pool_min,
+                        max_size=self.db_config.pool_max,
+                        max_inactive_connection_lifetime=self.db_config.pool_max_ocioso,
+                    )
+        return self._pool
+
+    async def fechar(self):
+        """Fecha o pool de conexões"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def consultar(self, query, *args, erro="Erro na consulta"):
+        """Executa uma consulta de leitura e retorna a lista de tuplas ([] em caso de erro)"""
+        try:
+            pool = await self.pool()
+            return _tuplas(await pool.fetch(query, *args))
+        except ERROS_BANCO as e:
+            print(f"{erro}: {e}")
+            return []
+
+    async def consultar_um(self, query, *args, erro="Erro na consulta"):
+        """Executa uma consulta de uma linha e retorna a tupla (None se não houver)"""
+        try:
+            pool = await self.pool()
+            registro = await pool.fetchrow(query, *args)
+            return tuple(registro) if registro else None
+        except ERROS_BANCO as e:
+            print(f"{erro}: {e}")
+            return None
+
+    async def get_table_counts(self, estimado=False):
+        """
+        Conta registros em todas as tabelas para o splash screen.
+        No modo exato, os COUNT(*) rodam em paralelo, um por conexão.
+        """
+        try:
+            pool = await self.pool()
+            if estimado:
+                registros = await pool.fetch(self.SQL_CONTAGEM_ESTIMADA, self.TABELAS_CONTAGEM)
+                return {registro[0]: registro[1] for registro in registros}
+            totais = await asyncio.gather(*(
+                pool.fetchval(f"SELECT COUNT(*) FROM {table}") for table in self.TABELAS_CONTAGEM
+            ))
+            return dict(zip(self.TABELAS_CONTAGEM, totais))
+        except ERROS_BANCO as e:
+            print(f"Erro ao contar registros: {e}")
+            return {}
+
+    async def carregar_painel(self, estimado=False):
+        """
+        Contagens e os dois relatórios de uma só vez, com as consultas em paralelo
+        """
+        contagens, vendas, pedidos = await asyncio.gather(
+            self.get_table_counts(estimado=estimado),
+            self.relatorio_vendas_por_genero(),
+            self.relatorio_pedidos_detalhado(),
+        )
+        return {'contagens': contagens, 'vendas_por_genero': vendas, 'pedidos_detalhado': pedidos}
+
+    # ==================== RELATÓRIOS ====================
+
+    async def relatorio_vendas_por_genero(self, reconstruir=False):
+        """
+        Relatório com GROUP BY - Vendas por gênero, lido do resumo mantido pelos gatilhos
+        """
+        if reconstruir:
+            sucesso, resultado = await self.reconstruir_resumo_vendas()
+            if not sucesso:
+                print(resultado)
+                return []
+        return await self.consultar(self.SQL_VENDAS_POR_GENERO, erro="Erro no relatório por gênero")
+
+    async def reconstruir_resumo_vendas(self):
+        """
+        Recalcula o resumo de vendas por gênero e retorna (True, divergências)
+        ou (False, mensagem), como na versão síncrona
+        """
+        try:
+            pool = await self.pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("LOCK TABLE itens_pedido, livros IN SHARE MODE")
+                    registros = await conn.fetch(self.SQL_DIVERGENCIAS_RESUMO_VENDAS)
+                    divergencias = [(row[0], tuple(row[1:4]), tuple(row[4:7])) for row in registros]
+
+                    await conn.execute(self.SQL_RECONSTRUIR_RESUMO_VENDAS)
+            return True, divergencias
+        except ERROS_BANCO as e:
+            return False, f"Erro ao reconstruir resumo de vendas: {e}"
+
+    async def relatorio_pedidos_detalhado(self):
+        """
+        Relatório com JOIN - Pedidos com detalhes dos livros
+        """
+        return await self.consultar(self.SQL_PEDIDOS_DETALHADO, erro="Erro no relatório detalhado")
+
+    async def iterar_relatorio_pedidos_detalhado(self, itersize=2000):
+        """
+        Relatório com JOIN em modo streaming (gerador assíncrono) - cursor no
+        servidor que traz as linhas em lotes de `itersize`
+        """
+        try:
+            pool = await self.pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    async for registro in conn.cursor(self.SQL_PEDIDOS_DETALHADO, prefetch=itersize):
+                        yield tuple(registro)
+        except ERROS_BANCO as e:
+            print(f"Erro no relatório detalhado: {e}")
+
+    # ==================== ESCRITA ====================
+
+    async def escrever(self, operacao, erro):
+        """
+        Executa `operacao(conn)` em uma transação e retorna (sucesso, mensagem).
+        A operação retorna (sucesso, mensagem); com sucesso False a transação é desfeita.
+        """
+        resultado = None
+        try:
+            pool = await self.pool()
+            async with pool.acquire() as conn:
+                try:
+                    async with conn.transaction():
+                        resultado = await operacao(conn)
+                        if not resultado[0]:
+                            raise _Desfazer()
+                except _Desfazer:
+                    pass
+            return resultado
+        except ERROS_BANCO as e:
+            return False, f"{erro}: {e}"
+
+    @staticmethod
+    def _linhas_afetadas(status):
+        """Número de linhas do status de comando do asyncpg (ex.: 'UPDATE 1')"""
+        return int(status.split()[-1])
+
+    async def inserir_autor(self, nome, nacionalidade, data_nascimento, biografia):
+        """
+        Insere um novo autor
+        """
+        async def operacao(conn):
+            autor_id = await conn.fetchval("""
+                INSERT INTO autores (nome_autor, nacionalidade, data_nascimento, biografia)
+                VALUES ($1, $2, $3, $4)
+                RETURNING id_autor
+            """, nome, nacionalidade, _data(data_nascimento), biografia)
+            return True, f"Autor inserido com sucesso! ID: {autor_id}"
+        return await self.escrever(operacao, "Erro ao inserir autor")
+
+    async def inserir_livro(self, titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque):
+        """
+        Insere um novo livro
+        """
+        async def operacao(conn):
+            if not await conn.fetchval("SELECT id_autor FROM autores WHERE id_autor = $1", id_autor):
+                return False, "Autor não encontrado"
+            livro_id = await conn.fetchval("""
+                INSERT INTO livros (titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque)
+                VALUES ($1, $2, $3, $4, $5, $6)
+                RETURNING id_livro
+            """, titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque)
+            return True, f"Livro inserido com sucesso! ID: {livro_id}"
+        return await self.escrever(operacao, "Erro ao inserir livro")
+
+    async def inserir_pedido(self, nome_cliente, email_cliente):
+        """
+        Insere um novo pedido
+        """
+        async def operacao(conn):
+            pedido_id = await conn.fetchval("""
+                INSERT INTO pedidos (nome_cliente, email_cliente, valor_total)
+                VALUES ($1, $2, 0.00)
+                RETURNING id_pedido
+            """, nome_cliente, email_cliente)
+            return True, f"Pedido inserido com sucesso! ID: {pedido_id}"
+        return await self.escrever(operacao, "Erro ao inserir pedido")
+
+    async def registrar_pedido_com_itens(self, nome_cliente, email_cliente, itens):
+        """
+        Registra um pedido completo (itens, estoque e valor_total) em uma
+        transação, com os livros bloqueados em ordem de id
+        """
+        quantidades = {}
+        for id_livro, quantidade in itens:
+            if quantidade <= 0:
+                return False, f"Quantidade inválida para o livro {id_livro}"
+            quantidades[id_livro] = quantidades.get(id_livro, 0) + quantidade
+        if not quantidades:
+            return False, "O pedido precisa de pelo menos um item"
+
+        ids = sorted(quantidades)
+        parametros = {
+            'livros': ids,
+            'quantidades': [quantidades[i] for i in ids],
+            'nome_cliente': nome_cliente,
+            'email_cliente': email_cliente,
+        }
+
+        async def operacao(conn):
+            estoque = {row[0]: row for row in await conn.fetch("""
+                SELECT id_livro, titulo, quantidade_estoque
+                FROM livros
+                WHERE id_livro = ANY($1::int[])
+                ORDER BY id_livro
+                FOR UPDATE
+            """, ids)}
+
+            problemas = []
+            for id_livro in ids:
+                if id_livro not in estoque:
+                    problemas.append(f"livro {id_livro} não encontrado")
+                elif estoque[id_livro][2] < quantidades[id_livro]:
+                    _, titulo, disponivel = estoque[id_livro]
+                    problemas.append(f"'{titulo}' tem apenas {disponivel} em estoque")
+            if problemas:
+                return False, "Pedido não registrado: " + "; ".join(problemas)
+
+            pedido_id, valor_total, total_itens = await conn.fetchrow(
+                self.SQL_REGISTRAR_PEDIDO, *(parametros[nome] for nome in self.ORDEM_REGISTRAR_PEDIDO)
+            )
+            return True, (f"Pedido registrado com sucesso! ID: {pedido_id} | "
+                          f"{total_itens} item(ns) | Total: R$ {float(valor_total):.2f}")
+        return await self.escrever(operacao, "Erro ao registrar pedido")
+
+    # ==================== LISTAR REGISTROS ====================
+
+    async def listar_autores(self):
+        """
+        Lista todos os autores
+        """
+        return await self.consultar(
+            "SELECT id_autor, nome_autor, nacionalidade, data_nascimento FROM autores ORDER BY nome_autor",
+            erro="Erro ao listar autores"
+        )
+
+    async def listar_livros(self):
+        """
+        Lista todos os livros com nome do autor
+        """
+        return await self.consultar("""
+            SELECT l.id_livro, l.titulo, a.nome_autor, l.genero, l.preco, l.quantidade_estoque
+            FROM livros l
+            INNER JOIN autores a ON l.id_autor = a.id_autor
+            ORDER BY l.titulo
+        """, erro="Erro ao listar livros")
+
+    async def listar_pedidos(self):
+        """
+        Lista todos os pedidos
+        """
+        return await self.consultar(
+            "SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total FROM pedidos ORDER BY data_pedido DESC",
+            erro="Erro ao listar pedidos"
+        )
+
+    async def listar_autores_pagina(self, ultimo_nome=None, ultimo_id=None, tamanho=20):
+        """
+        Lista uma página de autores (paginação por chave: nome + id)
+        """
+        primeira, seguinte = self.SQL_LISTAR_AUTORES_PAGINA
+        if ultimo_id is None:
+            return await self.consultar(primeira, tamanho, erro="Erro ao listar autores")
+        return await self.consultar(seguinte, ultimo_nome, ultimo_id, tamanho, erro="Erro ao listar autores")
+
+    async def listar_livros_pagina(self, ultimo_titulo=None, ultimo_id=None, tamanho=20):
+        """
+        Lista uma página de livros com nome do autor (paginação por chave: título + id)
+        """
+        primeira, seguinte = self.SQL_LISTAR_LIVROS_PAGINA
+        if ultimo_id is None:
+            return await self.consultar(primeira, tamanho, erro="Erro ao listar livros")
+        return await self.consultar(seguinte, ultimo_titulo, ultimo_id, tamanho, erro="Erro ao listar livros")
+
+    async def listar_pedidos_pagina(self, ultima_data=None, ultimo_id=None, tamanho=20):
+        """
+        Lista uma página de pedidos, dos mais recentes para os mais antigos
+        (paginação por chave: data + id)
+        """
+        primeira, seguinte = self.SQL_LISTAR_PEDIDOS_PAGINA
+        if ultimo_id is None:
+            return await self.consultar(primeira, tamanho, erro="Erro ao listar pedidos")
+        return await self.consultar(seguinte, _data(ultima_data), ultimo_id, tamanho, erro="Erro ao listar pedidos")
+
+    # ==================== BUSCA ====================
+
+    async def buscar_livros(self, texto, limite=20):
+        """
+        Busca textual por título, gênero e biografia do autor, da maior para a
+        menor relevância (ver DatabaseOperations.buscar_livros)
+        """
+        if not texto or not texto.strip():
+            return []
+        parametros = {'texto': texto.strip(), 'candidatos': self.LIMITE_CANDIDATOS, 'limite': limite}
+        return await self.consultar(
+            self.SQL_BUSCAR_LIVROS, *(parametros[nome] for nome in self.ORDEM_BUSCAR_LIVROS),
+            erro="Erro ao buscar livros"
+        )
+
+    async def buscar_autores(self, fragmento, limite=10):
+        """
+        Busca aproximada de autores por um trecho do nome (ver
+        DatabaseOperations.buscar_autores)
+        """
+        fragmento = (fragmento or "").strip()
+        if len(fragmento) < self.TAMANHO_MINIMO_FRAGMENTO:
+            return []
+        parametros = {'fragmento': fragmento, 'padrao': f"%{escapar_like(fragmento)}%", 'limite': limite}
+        try:
+            pool = await self.pool()
+            if self.trigramas is None:
+                self.trigramas = await pool.fetchval(self.SQL_TRIGRAMAS_DISPONIVEIS)
+            if self.trigramas:
+                query, ordem = self.SQL_BUSCAR_AUTORES, self.ORDEM_BUSCAR_AUTORES
+            else:
+                query, ordem = self.SQL_BUSCAR_AUTORES_TRECHO, self.ORDEM_BUSCAR_AUTORES_TRECHO
+            return _tuplas(await pool.fetch(query, *(parametros[nome] for nome in ordem)))
+        except ERROS_BANCO as e:
+            print(f"Erro ao buscar autores: {e}")
+            return None
+
+    # ==================== REMOVER REGISTROS ====================
+
+    async def remover_autor(self, id_autor):
+        """
+        Remove um autor (verifica dependências)
+        """
+        async def operacao(conn):
+            count = await conn.fetchval("SELECT COUNT(*) FROM livros WHERE id_autor = $1", id_autor)
+            if count > 0:
+                return False, f"Não é possível remover. Autor possui {count} livro(s) cadastrado(s)."
+            status = await conn.execute("DELETE FROM autores WHERE id_autor = $1", id_autor)
+            if self._linhas_afetadas(status) == 0:
+                return False, "Autor não encontrado"
+            return True, "Autor removido com sucesso"
+        return await self.escrever(operacao, "Erro ao remover autor")
+
+    async def remover_livro(self, id_livro):
+        """
+        Remove um livro (verifica dependências)
+        """
+        async def operacao(conn):
+            count = await conn.fetchval("SELECT COUNT(*) FROM itens_pedido WHERE id_livro = $1", id_livro)
+            if count > 0:
+                return False, f"Não é possível remover. Livro possui {count} item(ns) em pedidos."
+            status = await conn.execute("DELETE FROM livros WHERE id_livro = $1", id_livro)
+            if self._linhas_afetadas(status) == 0:
+                return False, "Livro não encontrado"
+            return True, "Livro removido com sucesso"
+        return await self.escrever(operacao, "Erro ao remover livro")
+
+    async def remover_pedido(self, id_pedido):
+        """
+        Remove um pedido (CASCADE remove itens automaticamente)
+        """
+        async def operacao(conn):
+            status = await conn.execute("DELETE FROM pedidos WHERE id_pedido = $1", id_pedido)
+            if self._linhas_afetadas(status) == 0:
+                return False, "Pedido não encontrado"
+            return True, "Pedido removido com sucesso"
+        return await self.escrever(operacao, "Erro ao remover pedido")
+
+    async def remover_por_ids(self, ids, query_remover, query_dependencias=None, bloqueio=None, nome="Registro"):
+        """
+        Remove vários registros em uma única transação (ver
+        DatabaseOperations.remover_por_ids). Retorna (True, {id: (sucesso, mensagem)})
+        ou (False, mensagem de erro)
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return True, {}
+
+        async def operacao(conn):
+            bloqueados = {}
+            if query_dependencias:
+                bloqueados = dict(await conn.fetch(query_dependencias, ids))
+            livres = [i for i in ids if i not in bloqueados]
+            removidos = {row[0] for row in await conn.fetch(query_remover, livres)} if livres else set()
+
+            resultados = {}
+            for id_registro in ids:
+                if id_registro in bloqueados:
+                    resultados[id_registro] = (False, bloqueio.format(bloqueados[id_registro]))
+                elif id_registro in removidos:
+                    resultados[id_registro] = (True, f"{nome} removido com sucesso")
+                else:
+                    resultados[id_registro] = (False, f"{nome} não encontrado")
+            return True, resultados
+        return await self.escrever(operacao, f"Erro ao remover {nome.lower()}(s)")
+
+    async def remover_autores_em_lote(self, ids):
+        """
+        Remove vários autores de uma vez; autores com livros ficam de fora
+        """
+        return await self.remover_por_ids(
+            ids,
+            self.SQL_REMOVER_AUTORES,
+            self.SQL_DEPENDENCIAS_AUTORES,
+            "Não é possível remover. Autor possui {} livro(s) cadastrado(s).",
+            "Autor"
+        )
+
+    async def remover_livros_em_lote(self, ids):
+        """
+        Remove vários livros de uma vez; livros com itens em pedidos ficam de fora
+        """
+        return await self.remover_por_ids(
+            ids,
+            self.SQL_REMOVER_LIVROS,
+            self.SQL_DEPENDENCIAS_LIVROS,
+            "Não é possível remover. Livro possui {} item(ns) em pedidos.",
+            "Livro"
+        )
+
+    async def remover_pedidos_em_lote(self, ids):
+        """
+        Remove vários pedidos de uma vez (CASCADE remove os itens)
+        """
+        return await self.remover_por_ids(
+            ids,
+            self.SQL_REMOVER_PEDIDOS,
+            nome="Pedido"
+        )
+
+    # ==================== ATUALIZAR REGISTROS ====================
+
+    async def atualizar_autor(self, id_autor, nome, nacionalidade, data_nascimento, biografia):
+        """
+        Atualiza um autor
+        """
+        async def operacao(conn):
+            status = await conn.execute("""
+                UPDATE autores
+                SET nome_autor = $1, nacionalidade = $2, data_nascimento = $3, biografia = $4
+                WHERE id_autor = $5
+            """, nome, nacionalidade, _data(data_nascimento), biografia, id_autor)
+            if self._linhas_afetadas(status) == 0:
+                return False, "Autor não encontrado"
+            return True, "Autor atualizado com sucesso"
+        return await self.escrever(operacao, "Erro ao atualizar autor")
+
+    async def atualizar_livro(self, id_livro, titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque):
+        """
+        Atualiza um livro
+        """
+        async def operacao(conn):
+            if not await conn.fetchval("SELECT id_autor FROM autores WHERE id_autor = $1", id_autor):
+                return False, "Autor não encontrado"
+            status = await conn.execute("""
+                UPDATE livros
+                SET titulo = $1, id_autor = $2, genero = $3, ano_publicacao = $4, preco = $5, quantidade_estoque = $6
+                WHERE id_livro = $7
+            """, titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque, id_livro)
+            if self._linhas_afetadas(status) == 0:
+                return False, "Livro não encontrado"
+            return True, "Livro atualizado com sucesso"
+        return await self.escrever(operacao, "Erro ao atualizar livro")
+
+    async def atualizar_pedido(self, id_pedido, nome_cliente, email_cliente):
+        """
+        Atualiza um pedido
+        """
+        async def operacao(conn):
+            status = await conn.execute("""
+                UPDATE pedidos
+                SET nome_cliente = $1, email_cliente = $2
+                WHERE id_pedido = $3
+            """, nome_cliente, email_cliente, id_pedido)
+            if self._linhas_afetadas(status) == 0:
+                return False, "Pedido não encontrado"
+            return True, "Pedido atualizado com sucesso"
+        return await self.escrever(operacao, "Erro ao atualizar pedido")
+
+    # ==================== CONSULTAS POR ID ====================
+
+    async def obter_autor_por_id(self, id_autor):
+        """
+        Obtém dados de um autor específico
+        """
+        return await self.consultar_um(
+            "SELECT id_autor, nome_autor, nacionalidade, data_nascimento, biografia FROM autores WHERE id_autor = $1",
+            id_autor, erro="Erro ao obter autor"
+        )
+
+    async def obter_livro_por_id(self, id_livro):
+        """
+        Obtém dados de um livro específico
+        """
+        return await self.consultar_um("""
+            SELECT l.id_livro, l.titulo, l.id_autor, a.nome_autor, l.genero, l.ano_publicacao, l.preco, l.quantidade_estoque
+            FROM livros l
+            INNER JOIN autores a ON l.id_autor = a.id_autor
+            WHERE l.id_livro = $1
+        """, id_livro, erro="Erro ao obter livro")
+
+    async def obter_pedido_por_id(self, id_pedido):
+        """
+        Obtém dados de um pedido específico
+        """
+        return await self.consultar_um(
+            "SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total FROM pedidos WHERE id_pedido = $1",
+            id_pedido, erro="Erro ao obter pedido"
+        )
+
+    async def obter_autores_por_ids(self, ids):
+        """
+        Obtém vários autores em uma única consulta: {id_autor: registro}
+        """
+        registros = await self.consultar(
+            self.SQL_AUTORES_POR_IDS, list(dict.fromkeys(ids)), erro="Erro ao obter autores"
+        )
+        return {row[0]: row for row in registros}
+
+    async def obter_livros_por_ids(self, ids):
+        """
+        Obtém vários livros (com nome do autor) em uma única consulta: {id_livro: registro}
+        """
+        registros = await self.consultar(
+            self.SQL_LIVROS_POR_IDS, list(dict.fromkeys(ids)), erro="Erro ao obter livros"
+        )
+        return {row[0]: row for row in registros}
+
+    async def obter_pedidos_por_ids(self, ids):
+        """
+        Obtém vários pedidos em uma única consulta: {id_pedido: registro}
+        """
+        registros = await self.consultar(
+            self.SQL_PEDIDOS_POR_IDS, list(dict.fromkeys(ids)), erro="Erro ao obter pedidos"
+        )
+        return {row[0]: row for row in registros}
@@ -0,0 +1,166 @@
+"""
+Cache em memória para as consultas de leitura do DatabaseOperations
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache LRU thread-safe com expiração por tempo (TTL).
+
+    Cada entrada é associada aos namespaces (tabelas) de que depende, para que
+    uma escrita em 'autores' invalide também as listagens de livros, que trazem
+    o nome do autor. O cache é local ao processo: alterações feitas por outros
+    processos só aparecem depois que a entrada expira.
+    """
+
+    def __init__(self, tamanho=512, ttl=60.0):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # chave -> (valor, expira_em, namespaces)
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._falhas = 0
+        self._expiradas = 0
+        self._removidas = 0
+        self._invalidadas = 0
+
+    @property
+    def ativo(self):
+        return self.tamanho > 0 and self.ttl > 0
+
+    def obter(self, chave):
+        """Retorna (encontrado, valor), atualizando a ordem de uso"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self._falhas += 1
+                return False, None
+            if entrada[1] <= time.monotonic():
+                del self._entradas[chave]
+                self._expiradas += 1
+                self._falhas += 1
+                return False, None
+            self._entradas.move_to_end(chave)
+            self._acertos += 1
+            return True, entrada[0]
+
+    def guardar(self, chave, valor, namespaces):
+        """Guarda um valor, descartando as entradas menos usadas se o cache estiver cheio"""
+        if not self.ativo:
+            return
+        with self._lock:
+            self._entradas[chave] = (valor, time.monotonic() + self.ttl, frozenset(namespaces))
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho:
+                self._entradas.popitem(last=False)
+                self._removidas += 1
+
+    def invalidar(self, *namespaces):
+        """Remove as entradas que dependem de qualquer um dos namespaces"""
+        alvo = set(namespaces)
+        with self._lock:
+            chaves = [chave for chave, (_, _, deps) in self._entradas.items() if deps & alvo]
+            for chave in chaves:
+                del self._entradas[chave]
+            self._invalidadas += len(chaves)
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._invalidadas += len(self._entradas)
+            self._entradas.clear()
+
+    def estatisticas(self):
+        """Retorna um resumo do uso do cache"""
+        with self._lock:
+            consultas = self._acertos + self._falhas
+            return {
+                'tamanho': self.tamanho,
+                'ttl': self.ttl,
+                'entradas': len(self._entradas),
+                'acertos': self._acertos,
+                'falhas': self._falhas,
+                'taxa_acerto': self._acertos / consultas if consultas else 0.0,
+                'expiradas': self._expiradas,
+                'removidas': self._removidas,
+                'invalidadas': self._invalidadas,
+            }
+
+
+_cache_padrao = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache():
+    """
+    Cache compartilhado pelas instâncias de DatabaseOperations do processo,
+    configurado por DB_CACHE_TAMANHO e DB_CACHE_TTL (0 desativa)
+    """
+    global _cache_padrao
+    with _cache_lock:
+        if _cache_padrao is None:
+            _cache_padrao = CacheLRU(
+                tamanho=int(os.getenv('DB_CACHE_TAMANHO', '512')),
+                ttl=float(os.getenv('DB_CACHE_TTL', '60')),
+            )
+        return _cache_padrao
+
+
+def conjunto_de_ids(ids):
+    """Chave de cache de uma lista de ids: a mesma para qualquer ordem, repetição ou tipo de sequência"""
+    return tuple(sorted(set(ids)))
+
+
+def em_cache(*namespaces, chave=None):
+    """
+    Decorator para métodos de leitura: guarda resultados não vazios no cache
+    da instância (self.cache), indexados pelo nome do método e argumentos.
+    Resultados vazios ([] ou None) não são guardados, pois também indicam erro.
+    `chave`, se informada, converte o primeiro argumento antes de montar a
+    chave (ex.: conjunto_de_ids, para que listas e tuplas de ids compartilhem a entrada).
+    """
+    def decorator(metodo):
+        @functools.wraps(metodo)
+        def wrapper(self, *args, **kwargs):
+            cache = self.cache
+            if not cache.ativo:
+                return metodo(self, *args, **kwargs)
+
+            argumentos = (chave(args[0]),) + args[1:] if chave and args else args
+            chave_cache = (metodo.__name__, argumentos, tuple(sorted(kwargs.items())))
+            try:
+                encontrado, valor = cache.obter(chave_cache)
+            except TypeError:
+                # Argumentos não hasheáveis: consulta direto no banco
+                return metodo(self, *args, **kwargs)
+            if not encontrado:
+                valor = metodo(self, *args, **kwargs)
+                if valor:
+                    cache.guardar(chave_cache, valor, namespaces)
+            # Listas e dicionários são copiados para que o chamador não altere a entrada em cache
+            if isinstance(valor, (list, dict)):
+                return type(valor)(valor)
+            return valor
+        return wrapper
+    return decorator
+
+
+def invalida(*namespaces):
+    """
+    Decorator para métodos de escrita que retornam (sucesso, mensagem):
+    após uma escrita bem-sucedida, invalida as entradas dos namespaces
+    """
+    def decorator(metodo):
+        @functools.wraps(metodo)
+        def wrapper(self, *args, **kwargs):
+            resultado = metodo(self, *args, **kwargs)
+            if resultado and resultado[0]:
+                self.cache.invalidar(*namespaces)
+            return resultado
+        return wrapper
+    return decorator
@@ -3,72 +3,196 @@ Operações de banco de dados sem ORM - Queries SQL manuais
 """
 import psycopg2
 from config.database import DatabaseConfig
-from tabulate import tabulate
+from config.metricas import instrumentar
+from config.preparados import executar
+from models.cache import conjunto_de_ids, em_cache, invalida, obter_cache
 
+
+def escapar_like(texto):
+    """Escapa os curingas do LIKE para buscar o texto literalmente"""
+    return texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+@instrumentar
 class DatabaseOperations:
+    # Consultas dos relatórios, compartilhadas com os modos streaming e exportação
+    SQL_VENDAS_POR_GENERO = """
+        SELECT genero, total_vendas, quantidade_vendida, valor_total_vendas
+        FROM vendas_por_genero_resumo
+        WHERE total_vendas > 0
+        ORDER BY valor_total_vendas DESC
+    """
+
+    # Agregação completa sobre itens_pedido, usada para reconstruir e verificar o resumo
+    SQL_VENDAS_POR_GENERO_COMPLETO = """
+        SELECT 
+            l.genero,
+            COUNT(ip.id_item) as total_vendas,
+            SUM(ip.quantidade) as quantidade_vendida,
+            SUM(ip.subtotal) as valor_total_vendas
+        FROM livros l
+        INNER JOIN itens_pedido ip ON l.id_livro = ip.id_livro
+        GROUP BY l.genero
+        ORDER BY valor_total_vendas DESC
+    """
+
+    # Gêneros em que o resumo difere da agregação completa: (gênero, resumo, recalculado)
+    SQL_DIVERGENCIAS_RESUMO_VENDAS = f"""
+        SELECT
+            COALESCE(r.genero, c.genero),
+            r.total_vendas, r.quantidade_vendida, r.valor_total_vendas,
+            c.total_vendas, c.quantidade_vendida, c.valor_total_vendas
+        FROM (
+            SELECT * FROM vendas_por_genero_resumo
+            WHERE total_vendas <> 0 OR quantidade_vendida <> 0 OR valor_total_vendas <> 0
+        ) r
+        FULL OUTER JOIN ({SQL_VENDAS_POR_GENERO_COMPLETO}) c ON c.genero = r.genero
+        WHERE (r.total_vendas, r.quantidade_vendida, r.valor_total_vendas)
+              IS DISTINCT FROM (c.total_vendas, c.quantidade_vendida, c.valor_total_vendas)
+        ORDER BY 1
+    """
+
+    SQL_RECONSTRUIR_RESUMO_VENDAS = f"""
+        DELETE FROM vendas_por_genero_resumo;
+        INSERT INTO vendas_por_genero_resumo (genero, total_vendas, quantidade_vendida, valor_total_vendas)
+        SELECT genero, total_vendas, quantidade_vendida, valor_total_vendas
+        FROM ({SQL_VENDAS_POR_GENERO_COMPLETO}) c
+    """
+
+    SQL_PEDIDOS_DETALHADO = """
+        SELECT 
+            p.id_pedido,
+            p.data_pedido,
+            p.nome_cliente,
+            l.titulo,
+            a.nome_autor,
+            ip.quantidade,
+            ip.preco_unitario,
+            ip.subtotal
+        FROM pedidos p
+        INNER JOIN itens_pedido ip ON p.id_pedido = ip.id_pedido
+        INNER JOIN livros l ON ip.id_livro = l.id_livro
+        INNER JOIN autores a ON l.id_autor = a.id_autor
+        ORDER BY p.data_pedido DESC, p.id_pedido
+    """
+
     def __init__(self):
         self.db_config = DatabaseConfig()
+        self.cache = obter_cache()
+        self.trigramas = None  # pg_trgm disponível? (verificado na primeira busca de autores)
     
-    def get_table_counts(self):
+    TABELAS_CONTAGEM = ['autores', 'livros', 'pedidos', 'itens_pedido']
+
+    # Estimativa pelas estatísticas do planejador: densidade (reltuples/relpages)
+    # vezes o número atual de páginas, como o próprio planejador faz. Tabelas
+    # nunca analisadas (reltuples = -1) usam n_live_tup do coletor de estatísticas.
+    SQL_CONTAGEM_ESTIMADA = """
+        SELECT t.tabela,
+               COALESCE(CASE
+                   WHEN c.reltuples >= 0 AND c.relpages > 0 THEN
+                       round(c.reltuples / c.relpages
+                             * (pg_relation_size(c.oid) / current_setting('block_size')::int))
+                   ELSE s.n_live_tup
+               END, 0)::bigint AS total
+        FROM unnest(%s::text[]) WITH ORDINALITY AS t(tabela, ordem)
+        LEFT JOIN pg_class c ON c.oid = to_regclass(t.tabela)
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+        ORDER BY t.ordem
+    """
+
+    def get_table_counts(self, estimado=False, conn=None):
         """
-        Conta registros em todas as tabelas para o splash screen
+        Conta registros em todas as tabelas para o splash screen, em uma única consulta.
+        Com estimado=True usa as estatísticas do PostgreSQL (pg_class/pg_stat_user_tables)
+        em vez de COUNT(*), com custo constante independente do tamanho das tabelas.
+        Com `conn`, usa a conexão já emprestada pelo chamador, sem devolvê-la.
         """
-        conn = self.db_config.get_connection()
-        if not conn:
-            return {}
-        
-        counts = {}
-        tables = ['autores', 'livros', 'pedidos', 'itens_pedido']
+        emprestada = conn is None
+        if emprestada:
+            conn = self.db_config.get_connection()
+            if not conn:
+                return {}
         
         try:
             cursor = conn.cursor()
-            for table in tables:
-                query = f"SELECT COUNT(1) as total_{table} FROM {table}"
-                cursor.execute(query)
-                result = cursor.fetchone()
-                counts[table] = result[0] if result else 0
+            if estimado:
+                cursor.execute(self.SQL_CONTAGEM_ESTIMADA, (self.TABELAS_CONTAGEM,))
+                counts = dict(cursor.fetchall())
+            else:
+                subconsultas = ", ".join(
+                    f"(SELECT COUNT(*) FROM {table})" for table in self.TABELAS_CONTAGEM
+                )
+                cursor.execute(f"SELECT {subconsultas}")
+                counts = dict(zip(self.TABELAS_CONTAGEM, cursor.fetchone()))
             
             cursor.close()
-            conn.close()
             return counts
         except psycopg2.Error as e:
             print(f"Erro ao contar registros: {e}")
-            conn.close()
+            conn.rollback()
             return {}
+        finally:
+            if emprestada:
+                self.db_config.release_connection(conn)
     
     # ==================== RELATÓRIOS ====================
     
-    def relatorio_vendas_por_genero(self):
+    def relatorio_vendas_por_genero(self, reconstruir=False):
         """
-        Relatório com GROUP BY - Vendas por gênero
+        Relatório com GROUP BY - Vendas por gênero, lido do resumo mantido pelos
+        gatilhos de itens_pedido e livros (uma linha por gênero).
+        Com reconstruir=True, o resumo é recalculado do zero antes da leitura.
         """
+        if reconstruir:
+            sucesso, resultado = self.reconstruir_resumo_vendas()
+            if not sucesso:
+                print(resultado)
+                return []
+        
         conn = self.db_config.get_connection()
         if not conn:
             return []
         
         try:
             cursor = conn.cursor()
-            query = """
-                SELECT 
-                    l.genero,
-                    COUNT(ip.id_item) as total_vendas,
-                    SUM(ip.quantidade) as quantidade_vendida,
-                    SUM(ip.subtotal) as valor_total_vendas
-                FROM livros l
-                INNER JOIN itens_pedido ip ON l.id_livro = ip.id_livro
-                GROUP BY l.genero
-                ORDER BY valor_total_vendas DESC
-            """
-            cursor.execute(query)
+            cursor.execute(self.SQL_VENDAS_POR_GENERO)
             results = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return results
         except psycopg2.Error as e:
             print(f"Erro no relatório por gênero: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
             return []
     
+    def reconstruir_resumo_vendas(self):
+        """
+        Recalcula o resumo de vendas por gênero a partir de itens_pedido e compara
+        com o resumo anterior. Retorna (True, divergências) ou (False, mensagem).
+        Cada divergência é (gênero, valores do resumo, valores recalculados).
+        """
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+        
+        try:
+            cursor = conn.cursor()
+            # Bloqueia escritas concorrentes enquanto o resumo é recalculado
+            cursor.execute("LOCK TABLE itens_pedido, livros IN SHARE MODE")
+            
+            cursor.execute(self.SQL_DIVERGENCIAS_RESUMO_VENDAS)
+            divergencias = [(row[0], row[1:4], row[4:7]) for row in cursor.fetchall()]
+            
+            cursor.execute(self.SQL_RECONSTRUIR_RESUMO_VENDAS)
+            conn.commit()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return True, divergencias
+        except psycopg2.Error as e:
+            conn.rollback()
+            self.db_config.release_connection(conn)
+            return False, f"Erro ao reconstruir resumo de vendas: {e}"
+    
     def relatorio_pedidos_detalhado(self):
         """
         Relatório com JOIN - Pedidos com detalhes dos livros
@@ -79,34 +203,42 @@ class DatabaseOperations:
         
         try:
             cursor = conn.cursor()
-            query = """
-                SELECT 
-                    p.id_pedido,
-                    p.data_pedido,
-                    p.nome_cliente,
-                    l.titulo,
-                    a.nome_autor,
-                    ip.quantidade,
-                    ip.preco_unitario,
-                    ip.subtotal
-                FROM pedidos p
-                INNER JOIN itens_pedido ip ON p.id_pedido = ip.id_pedido
-                INNER JOIN livros l ON ip.id_livro = l.id_livro
-                INNER JOIN autores a ON l.id_autor = a.id_autor
-                ORDER BY p.data_pedido DESC, p.id_pedido
-            """
-            cursor.execute(query)
+            cursor.execute(self.SQL_PEDIDOS_DETALHADO)
             results = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return results
         except psycopg2.Error as e:
             print(f"Erro no relatório detalhado: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
             return []
     
+    def iterar_relatorio_pedidos_detalhado(self, itersize=2000):
+        """
+        Relatório com JOIN em modo streaming - usa um cursor nomeado (no servidor)
+        e traz as linhas em lotes de `itersize`, gerando uma linha por vez.
+        A conexão fica emprestada até o gerador terminar ou ser fechado.
+        """
+        conn = self.db_config.get_connection()
+        if not conn:
+            return
+        
+        try:
+            cursor = conn.cursor(name='relatorio_pedidos_detalhado')
+            cursor.itersize = itersize
+            cursor.execute(self.SQL_PEDIDOS_DETALHADO)
+            for row in cursor:
+                yield row
+            cursor.close()
+        except psycopg2.Error as e:
+            print(f"Erro no relatório detalhado: {e}")
+        finally:
+            # A transação do cursor nomeado é desfeita ao devolver a conexão
+            self.db_config.release_connection(conn)
+    
     # ==================== INSERIR REGISTROS ====================
     
+    @invalida('autores')
     def inserir_autor(self, nome, nacionalidade, data_nascimento, biografia):
         """
         Insere um novo autor
@@ -126,13 +258,14 @@ class DatabaseOperations:
             autor_id = cursor.fetchone()[0]
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, f"Autor inserido com sucesso! ID: {autor_id}"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao inserir autor: {e}"
     
+    @invalida('livros')
     def inserir_livro(self, titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque):
         """
         Insere um novo livro
@@ -144,10 +277,10 @@ class DatabaseOperations:
         try:
             cursor = conn.cursor()
             # Verifica se o autor existe
-            cursor.execute("SELECT id_autor FROM autores WHERE id_autor = %s", (id_autor,))
+            executar(cursor, "SELECT id_autor FROM autores WHERE id_autor = %s", (id_autor,))
             if not cursor.fetchone():
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Autor não encontrado"
             
             query = """
@@ -159,13 +292,14 @@ class DatabaseOperations:
             livro_id = cursor.fetchone()[0]
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, f"Livro inserido com sucesso! ID: {livro_id}"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao inserir livro: {e}"
     
+    @invalida('pedidos')
     def inserir_pedido(self, nome_cliente, email_cliente):
         """
         Insere um novo pedido
@@ -185,15 +319,109 @@ class DatabaseOperations:
             pedido_id = cursor.fetchone()[0]
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, f"Pedido inserido com sucesso! ID: {pedido_id}"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao inserir pedido: {e}"
     
+    # Grava o pedido, os itens (inserção multi-linha) e a baixa de estoque em uma
+    # única instrução; os preços vêm de livros.preco no momento da compra
+    SQL_REGISTRAR_PEDIDO = """
+        WITH linhas AS (
+            SELECT t.id_livro, t.quantidade, l.preco
+            FROM unnest(%(livros)s::int[], %(quantidades)s::int[]) AS t(id_livro, quantidade)
+            INNER JOIN livros l ON l.id_livro = t.id_livro
+        ),
+        pedido AS (
+            INSERT INTO pedidos (nome_cliente, email_cliente, valor_total)
+            SELECT %(nome_cliente)s, %(email_cliente)s, SUM(quantidade * preco)
+            FROM linhas
+            RETURNING id_pedido, valor_total
+        ),
+        itens AS (
+            INSERT INTO itens_pedido (id_pedido, id_livro, quantidade, preco_unitario, subtotal)
+            SELECT p.id_pedido, li.id_livro, li.quantidade, li.preco, li.quantidade * li.preco
+            FROM pedido p
+            CROSS JOIN linhas li
+            RETURNING id_item
+        ),
+        estoque AS (
+            UPDATE livros l
+            SET quantidade_estoque = l.quantidade_estoque - li.quantidade
+            FROM linhas li
+            WHERE l.id_livro = li.id_livro
+            RETURNING l.id_livro
+        )
+        SELECT id_pedido, valor_total, (SELECT COUNT(*) FROM itens) FROM pedido
+    """
+
+    @invalida('pedidos', 'livros')
+    def registrar_pedido_com_itens(self, nome_cliente, email_cliente, itens):
+        """
+        Registra um pedido completo em uma transação: `itens` é uma lista de
+        (id_livro, quantidade). Os livros são bloqueados em ordem de id (evita
+        deadlock entre pedidos concorrentes), o estoque é verificado e então
+        pedido, itens, estoque e valor_total são gravados em uma única instrução.
+        """
+        quantidades = {}
+        for id_livro, quantidade in itens:
+            if quantidade <= 0:
+                return False, f"Quantidade inválida para o livro {id_livro}"
+            quantidades[id_livro] = quantidades.get(id_livro, 0) + quantidade
+        if not quantidades:
+            return False, "O pedido precisa de pelo menos um item"
+        
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+        
+        try:
+            cursor = conn.cursor()
+            ids = sorted(quantidades)
+            executar(cursor, """
+                SELECT id_livro, titulo, quantidade_estoque
+                FROM livros
+                WHERE id_livro = ANY(%s)
+                ORDER BY id_livro
+                FOR UPDATE
+            """, (ids,))
+            estoque = {row[0]: row for row in cursor.fetchall()}
+            
+            problemas = []
+            for id_livro in ids:
+                if id_livro not in estoque:
+                    problemas.append(f"livro {id_livro} não encontrado")
+                elif estoque[id_livro][2] < quantidades[id_livro]:
+                    _, titulo, disponivel = estoque[id_livro]
+                    problemas.append(f"'{titulo}' tem apenas {disponivel} em estoque")
+            if problemas:
+                conn.rollback()
+                cursor.close()
+                self.db_config.release_connection(conn)
+                return False, "Pedido não registrado: " + "; ".join(problemas)
+            
+            executar(cursor, self.SQL_REGISTRAR_PEDIDO, {
+                'livros': ids,
+                'quantidades': [quantidades[i] for i in ids],
+                'nome_cliente': nome_cliente,
+                'email_cliente': email_cliente,
+            })
+            pedido_id, valor_total, total_itens = cursor.fetchone()
+            conn.commit()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return True, (f"Pedido registrado com sucesso! ID: {pedido_id} | "
+                          f"{total_itens} item(ns) | Total: R$ {float(valor_total):.2f}")
+        except psycopg2.Error as e:
+            conn.rollback()
+            self.db_config.release_connection(conn)
+            return False, f"Erro ao registrar pedido: {e}"
+    
     # ==================== LISTAR REGISTROS ====================
     
+    @em_cache('autores')
     def listar_autores(self):
         """
         Lista todos os autores
@@ -205,16 +433,17 @@ class DatabaseOperations:
         try:
             cursor = conn.cursor()
             query = "SELECT id_autor, nome_autor, nacionalidade, data_nascimento FROM autores ORDER BY nome_autor"
-            cursor.execute(query)
+            executar(cursor, query)
             results = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return results
         except psycopg2.Error as e:
             print(f"Erro ao listar autores: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
             return []
     
+    @em_cache('livros', 'autores')
     def listar_livros(self):
         """
         Lista todos os livros com nome do autor
@@ -231,16 +460,17 @@ class DatabaseOperations:
                 INNER JOIN autores a ON l.id_autor = a.id_autor
                 ORDER BY l.titulo
             """
-            cursor.execute(query)
+            executar(cursor, query)
             results = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return results
         except psycopg2.Error as e:
             print(f"Erro ao listar livros: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
             return []
     
+    @em_cache('pedidos')
     def listar_pedidos(self):
         """
         Lista todos os pedidos
@@ -252,18 +482,253 @@ class DatabaseOperations:
         try:
             cursor = conn.cursor()
             query = "SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total FROM pedidos ORDER BY data_pedido DESC"
-            cursor.execute(query)
+            executar(cursor, query)
             results = cursor.fetchall()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return results
         except psycopg2.Error as e:
             print(f"Erro ao listar pedidos: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
+            return []
+    
+    # Paginação por chave: (primeira página, páginas após a última chave lida)
+    SQL_LISTAR_AUTORES_PAGINA = tuple(f"""
+        SELECT id_autor, nome_autor, nacionalidade, data_nascimento
+        FROM autores
+        {filtro}
+        ORDER BY nome_autor, id_autor
+        LIMIT %s
+    """ for filtro in ("", "WHERE (nome_autor, id_autor) > (%s, %s)"))
+
+    SQL_LISTAR_LIVROS_PAGINA = tuple(f"""
+        SELECT l.id_livro, l.titulo, a.nome_autor, l.genero, l.preco, l.quantidade_estoque
+        FROM livros l
+        INNER JOIN autores a ON l.id_autor = a.id_autor
+        {filtro}
+        ORDER BY l.titulo, l.id_livro
+        LIMIT %s
+    """ for filtro in ("", "WHERE (l.titulo, l.id_livro) > (%s, %s)"))
+
+    SQL_LISTAR_PEDIDOS_PAGINA = tuple(f"""
+        SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total
+        FROM pedidos
+        {filtro}
+        ORDER BY data_pedido DESC, id_pedido DESC
+        LIMIT %s
+    """ for filtro in ("", "WHERE (data_pedido, id_pedido) < (%s, %s)"))
+
+    @em_cache('autores')
+    def listar_autores_pagina(self, ultimo_nome=None, ultimo_id=None, tamanho=20):
+        """
+        Lista uma página de autores (paginação por chave: nome + id)
+        """
+        conn = self.db_config.get_connection()
+        if not conn:
+            return []
+        
+        try:
+            cursor = conn.cursor()
+            query = self.SQL_LISTAR_AUTORES_PAGINA[ultimo_id is not None]
+            params = (ultimo_nome, ultimo_id, tamanho) if ultimo_id is not None else (tamanho,)
+            executar(cursor, query, params)
+            results = cursor.fetchall()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return results
+        except psycopg2.Error as e:
+            print(f"Erro ao listar autores: {e}")
+            self.db_config.release_connection(conn)
+            return []
+    
+    @em_cache('livros', 'autores')
+    def listar_livros_pagina(self, ultimo_titulo=None, ultimo_id=None, tamanho=20):
+        """
+        Lista uma página de livros com nome do autor (paginação por chave: título + id)
+        """
+        conn = self.db_config.get_connection()
+        if not conn:
+            return []
+        
+        try:
+            cursor = conn.cursor()
+            query = self.SQL_LISTAR_LIVROS_PAGINA[ultimo_id is not None]
+            params = (ultimo_titulo, ultimo_id, tamanho) if ultimo_id is not None else (tamanho,)
+            executar(cursor, query, params)
+            results = cursor.fetchall()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return results
+        except psycopg2.Error as e:
+            print(f"Erro ao listar livros: {e}")
+            self.db_config.release_connection(conn)
             return []
     
+    @em_cache('pedidos')
+    def listar_pedidos_pagina(self, ultima_data=None, ultimo_id=None, tamanho=20):
+        """
+        Lista uma página de pedidos, dos mais recentes para os mais antigos
+        (paginação por chave: data + id)
+        """
+        conn = self.db_config.get_connection()
+        if not conn:
+            return []
+        
+        try:
+            cursor = conn.cursor()
+            query = self.SQL_LISTAR_PEDIDOS_PAGINA[ultimo_id is not None]
+            params = (ultima_data, ultimo_id, tamanho) if ultimo_id is not None else (tamanho,)
+            executar(cursor, query, params)
+            results = cursor.fetchall()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return results
+        except psycopg2.Error as e:
+            print(f"Erro ao listar pedidos: {e}")
+            self.db_config.release_connection(conn)
+            return []
+
+    # ==================== BUSCA ====================
+
+    # Quantos livros que contêm os termos são ranqueados por busca. Termos
+    # muito comuns casam com dezenas de milhares de livros; ranquear todos
+    # custaria centenas de ms, então a relevância é calculada só em até
+    # LIMITE_CANDIDATOS livros: primeiro os que casam pelo título (peso A,
+    # índice idx_livros_busca_titulo), depois os demais lidos de idx_livros_busca
+    LIMITE_CANDIDATOS = 1000
+
+    # A última coluna (truncado) indica que havia mais livros com os termos do
+    # que candidatos ranqueados. O filtro final por livros.busca mantém as
+    # exclusões (-termo) que o título sozinho não vê
+    SQL_BUSCAR_LIVROS = """
+        WITH encontrados AS (
+            (SELECT l.id_livro, 0 AS ordem
+             FROM websearch_to_tsquery('portuguese', %(texto)s) q, livros l
+             WHERE to_tsvector('portuguese', coalesce(l.titulo, '')) @@ q
+             LIMIT %(candidatos)s)
+            UNION ALL
+            (SELECT l.id_livro, 1
+             FROM websearch_to_tsquery('portuguese', %(texto)s) q, livros l
+             WHERE l.busca @@ q
+             LIMIT %(candidatos)s + 1)
+        ),
+        candidatos AS (
+            SELECT id_livro, MIN(ordem) AS ordem
+            FROM encontrados
+            GROUP BY id_livro
+        )
+        SELECT l.id_livro, l.titulo, a.nome_autor, l.genero, l.preco,
+               l.quantidade_estoque, ts_rank(l.busca, q) AS relevancia,
+               (SELECT COUNT(*) FROM candidatos) > %(candidatos)s AS truncado
+        FROM (
+            SELECT id_livro FROM candidatos
+            ORDER BY ordem, id_livro
+            LIMIT %(candidatos)s
+        ) c
+        CROSS JOIN websearch_to_tsquery('portuguese', %(texto)s) q
+        INNER JOIN livros l ON l.id_livro = c.id_livro
+        INNER JOIN autores a ON l.id_autor = a.id_autor
+        WHERE l.busca @@ q
+        ORDER BY relevancia DESC, l.id_livro
+        LIMIT %(limite)s
+    """
+
+    @em_cache('livros', 'autores')
+    def buscar_livros(self, texto, limite=20):
+        """
+        Busca textual por título, gênero e biografia do autor (coluna livros.busca),
+        da maior para a menor relevância. Aceita a sintaxe de websearch_to_tsquery:
+        "frase exata", -excluir, termo1 or termo2. Cada linha termina com a
+        relevância e com truncado (True se só parte dos livros foi ranqueada)
+        """
+        if not texto or not texto.strip():
+            return []
+
+        conn = self.db_config.get_connection()
+        if not conn:
+            return []
+
+        try:
+            cursor = conn.cursor()
+            executar(cursor, self.SQL_BUSCAR_LIVROS, {
+                'texto': texto.strip(),
+                'candidatos': self.LIMITE_CANDIDATOS,
+                'limite': limite,
+            })
+            results = cursor.fetchall()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return results
+        except psycopg2.Error as e:
+            print(f"Erro ao buscar livros: {e}")
+            self.db_config.release_connection(conn)
+            return []
+
+    # Fragmentos menores que um trigrama não podem usar idx_autores_nome_trgm
+    TAMANHO_MINIMO_FRAGMENTO = 3
+
+    # Trechos do nome vêm primeiro; depois, nomes parecidos (erros de digitação),
+    # pela similaridade com a palavra mais próxima do nome
+    SQL_BUSCAR_AUTORES = """
+        SELECT id_autor, nome_autor, nacionalidade, data_nascimento,
+               word_similarity(%(fragmento)s, nome_autor) AS similaridade
+        FROM autores
+        WHERE nome_autor ILIKE %(padrao)s OR %(fragmento)s <%% nome_autor
+        ORDER BY nome_autor ILIKE %(padrao)s DESC, similaridade DESC, nome_autor, id_autor
+        LIMIT %(limite)s
+    """
+
+    # Sem pg_trgm (a migração do índice de trigramas é opcional): só trechos do
+    # nome, sem tolerar erros de digitação
+    SQL_BUSCAR_AUTORES_TRECHO = """
+        SELECT id_autor, nome_autor, nacionalidade, data_nascimento,
+               1.0::real AS similaridade
+        FROM autores
+        WHERE nome_autor ILIKE %(padrao)s
+        ORDER BY nome_autor, id_autor
+        LIMIT %(limite)s
+    """
+
+    SQL_TRIGRAMAS_DISPONIVEIS = "SELECT to_regprocedure('word_similarity(text, text)') IS NOT NULL"
+
+    @em_cache('autores')
+    def buscar_autores(self, fragmento, limite=10):
+        """
+        Busca aproximada de autores por um trecho do nome (pg_trgm), para escolher
+        o autor sem listar todos. Retorna até `limite` autores, os mais parecidos
+        primeiro, [] se o trecho tiver menos de TAMANHO_MINIMO_FRAGMENTO letras
+        ou None em caso de erro. Sem pg_trgm no servidor, busca só por trecho (ILIKE)
+        """
+        fragmento = (fragmento or "").strip()
+        if len(fragmento) < self.TAMANHO_MINIMO_FRAGMENTO:
+            return []
+
+        conn = self.db_config.get_connection()
+        if not conn:
+            return None
+
+        try:
+            cursor = conn.cursor()
+            if self.trigramas is None:
+                cursor.execute(self.SQL_TRIGRAMAS_DISPONIVEIS)
+                self.trigramas = cursor.fetchone()[0]
+            executar(cursor, self.SQL_BUSCAR_AUTORES if self.trigramas else self.SQL_BUSCAR_AUTORES_TRECHO, {
+                'fragmento': fragmento,
+                'padrao': f"%{escapar_like(fragmento)}%",
+                'limite': limite,
+            })
+            results = cursor.fetchall()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return results
+        except psycopg2.Error as e:
+            print(f"Erro ao buscar autores: {e}")
+            self.db_config.release_connection(conn)
+            return None
+
     # ==================== REMOVER REGISTROS ====================
     
+    @invalida('autores')
     def remover_autor(self, id_autor):
         """
         Remove um autor (verifica dependências)
@@ -276,30 +741,31 @@ class DatabaseOperations:
             cursor = conn.cursor()
             
             # Verifica se há livros deste autor
-            cursor.execute("SELECT COUNT(*) FROM livros WHERE id_autor = %s", (id_autor,))
+            executar(cursor, "SELECT COUNT(*) FROM livros WHERE id_autor = %s", (id_autor,))
             count = cursor.fetchone()[0]
             
             if count > 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, f"Não é possível remover. Autor possui {count} livro(s) cadastrado(s)."
             
             # Remove o autor
             cursor.execute("DELETE FROM autores WHERE id_autor = %s", (id_autor,))
             if cursor.rowcount == 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Autor não encontrado"
             
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, "Autor removido com sucesso"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao remover autor: {e}"
     
+    @invalida('livros')
     def remover_livro(self, id_livro):
         """
         Remove um livro (verifica dependências)
@@ -312,30 +778,31 @@ class DatabaseOperations:
             cursor = conn.cursor()
             
             # Verifica se há itens de pedido deste livro
-            cursor.execute("SELECT COUNT(*) FROM itens_pedido WHERE id_livro = %s", (id_livro,))
+            executar(cursor, "SELECT COUNT(*) FROM itens_pedido WHERE id_livro = %s", (id_livro,))
             count = cursor.fetchone()[0]
             
             if count > 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, f"Não é possível remover. Livro possui {count} item(ns) em pedidos."
             
             # Remove o livro
             cursor.execute("DELETE FROM livros WHERE id_livro = %s", (id_livro,))
             if cursor.rowcount == 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Livro não encontrado"
             
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, "Livro removido com sucesso"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao remover livro: {e}"
     
+    @invalida('pedidos')
     def remover_pedido(self, id_pedido):
         """
         Remove um pedido (CASCADE remove itens automaticamente)
@@ -349,20 +816,111 @@ class DatabaseOperations:
             cursor.execute("DELETE FROM pedidos WHERE id_pedido = %s", (id_pedido,))
             if cursor.rowcount == 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Pedido não encontrado"
             
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, "Pedido removido com sucesso"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao remover pedido: {e}"
     
+    def remover_por_ids(self, ids, query_remover, query_dependencias=None, bloqueio=None, nome="Registro"):
+        """
+        Remove vários registros em uma única transação: uma consulta de
+        dependências por `= ANY(%s)` (retorna id e quantidade) e um único
+        DELETE ... RETURNING para os que não têm dependências.
+        Retorna (True, {id: (sucesso, mensagem)}) ou (False, mensagem de erro)
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return True, {}
+        
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+        
+        try:
+            cursor = conn.cursor()
+            bloqueados = {}
+            if query_dependencias:
+                executar(cursor, query_dependencias, (ids,))
+                bloqueados = dict(cursor.fetchall())
+            
+            livres = [i for i in ids if i not in bloqueados]
+            removidos = set()
+            if livres:
+                cursor.execute(query_remover, (livres,))
+                removidos = {row[0] for row in cursor.fetchall()}
+            
+            conn.commit()
+            cursor.close()
+            self.db_config.release_connection(conn)
+        except psycopg2.Error as e:
+            conn.rollback()
+            self.db_config.release_connection(conn)
+            return False, f"Erro ao remover {nome.lower()}(s): {e}"
+        
+        resultados = {}
+        for id_registro in ids:
+            if id_registro in bloqueados:
+                resultados[id_registro] = (False, bloqueio.format(bloqueados[id_registro]))
+            elif id_registro in removidos:
+                resultados[id_registro] = (True, f"{nome} removido com sucesso")
+            else:
+                resultados[id_registro] = (False, f"{nome} não encontrado")
+        return True, resultados
+    
+    # Remoção em lote: DELETE ... RETURNING e contagem de dependências por id
+    SQL_REMOVER_AUTORES = "DELETE FROM autores WHERE id_autor = ANY(%s::int[]) RETURNING id_autor"
+    SQL_DEPENDENCIAS_AUTORES = "SELECT id_autor, COUNT(*) FROM livros WHERE id_autor = ANY(%s::int[]) GROUP BY id_autor"
+    SQL_REMOVER_LIVROS = "DELETE FROM livros WHERE id_livro = ANY(%s::int[]) RETURNING id_livro"
+    SQL_DEPENDENCIAS_LIVROS = "SELECT id_livro, COUNT(*) FROM itens_pedido WHERE id_livro = ANY(%s::int[]) GROUP BY id_livro"
+    SQL_REMOVER_PEDIDOS = "DELETE FROM pedidos WHERE id_pedido = ANY(%s::int[]) RETURNING id_pedido"
+
+    @invalida('autores')
+    def remover_autores_em_lote(self, ids):
+        """
+        Remove vários autores de uma vez; autores com livros ficam de fora
+        """
+        return self.remover_por_ids(
+            ids,
+            self.SQL_REMOVER_AUTORES,
+            self.SQL_DEPENDENCIAS_AUTORES,
+            "Não é possível remover. Autor possui {} livro(s) cadastrado(s).",
+            "Autor"
+        )
+    
+    @invalida('livros')
+    def remover_livros_em_lote(self, ids):
+        """
+        Remove vários livros de uma vez; livros com itens em pedidos ficam de fora
+        """
+        return self.remover_por_ids(
+            ids,
+            self.SQL_REMOVER_LIVROS,
+            self.SQL_DEPENDENCIAS_LIVROS,
+            "Não é possível remover. Livro possui {} item(ns) em pedidos.",
+            "Livro"
+        )
+    
+    @invalida('pedidos')
+    def remover_pedidos_em_lote(self, ids):
+        """
+        Remove vários pedidos de uma vez (CASCADE remove os itens)
+        """
+        return self.remover_por_ids(
+            ids,
+            self.SQL_REMOVER_PEDIDOS,
+            nome="Pedido"
+        )
+    
     # ==================== ATUALIZAR REGISTROS ====================
     
+    @invalida('autores')
     def atualizar_autor(self, id_autor, nome, nacionalidade, data_nascimento, biografia):
         """
         Atualiza um autor
@@ -382,18 +940,19 @@ class DatabaseOperations:
             
             if cursor.rowcount == 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Autor não encontrado"
             
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, "Autor atualizado com sucesso"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao atualizar autor: {e}"
     
+    @invalida('livros')
     def atualizar_livro(self, id_livro, titulo, id_autor, genero, ano_publicacao, preco, quantidade_estoque):
         """
         Atualiza um livro
@@ -406,10 +965,10 @@ class DatabaseOperations:
             cursor = conn.cursor()
             
             # Verifica se o autor existe
-            cursor.execute("SELECT id_autor FROM autores WHERE id_autor = %s", (id_autor,))
+            executar(cursor, "SELECT id_autor FROM autores WHERE id_autor = %s", (id_autor,))
             if not cursor.fetchone():
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Autor não encontrado"
             
             query = """
@@ -421,18 +980,19 @@ class DatabaseOperations:
             
             if cursor.rowcount == 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Livro não encontrado"
             
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, "Livro atualizado com sucesso"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao atualizar livro: {e}"
     
+    @invalida('pedidos')
     def atualizar_pedido(self, id_pedido, nome_cliente, email_cliente):
         """
         Atualiza um pedido
@@ -452,18 +1012,19 @@ class DatabaseOperations:
             
             if cursor.rowcount == 0:
                 cursor.close()
-                conn.close()
+                self.db_config.release_connection(conn)
                 return False, "Pedido não encontrado"
             
             conn.commit()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return True, "Pedido atualizado com sucesso"
         except psycopg2.Error as e:
             conn.rollback()
-            conn.close()
+            self.db_config.release_connection(conn)
             return False, f"Erro ao atualizar pedido: {e}"
     
+    @em_cache('autores')
     def obter_autor_por_id(self, id_autor):
         """
         Obtém dados de um autor específico
@@ -475,16 +1036,17 @@ class DatabaseOperations:
         try:
             cursor = conn.cursor()
             query = "SELECT id_autor, nome_autor, nacionalidade, data_nascimento, biografia FROM autores WHERE id_autor = %s"
-            cursor.execute(query, (id_autor,))
+            executar(cursor, query, (id_autor,))
             result = cursor.fetchone()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return result
         except psycopg2.Error as e:
             print(f"Erro ao obter autor: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
             return None
     
+    @em_cache('livros', 'autores')
     def obter_livro_por_id(self, id_livro):
         """
         Obtém dados de um livro específico
@@ -501,16 +1063,17 @@ class DatabaseOperations:
                 INNER JOIN autores a ON l.id_autor = a.id_autor
                 WHERE l.id_livro = %s
             """
-            cursor.execute(query, (id_livro,))
+            executar(cursor, query, (id_livro,))
             result = cursor.fetchone()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return result
         except psycopg2.Error as e:
             print(f"Erro ao obter livro: {e}")
-            conn.close()
+            self.db_config.release_connection(conn)
             return None
     
+    @em_cache('pedidos')
     def obter_pedido_por_id(self, id_pedido):
         """
         Obtém dados de um pedido específico
@@ -522,12 +1085,80 @@ class DatabaseOperations:
         try:
             cursor = conn.cursor()
             query = "SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total FROM pedidos WHERE id_pedido = %s"
-            cursor.execute(query, (id_pedido,))
+            executar(cursor, query, (id_pedido,))
             result = cursor.fetchone()
             cursor.close()
-            conn.close()
+            self.db_config.release_connection(conn)
             return result
         except psycopg2.Error as e:
             print(f"Erro ao obter pedido: {e}")
-            conn.close()
-            return None
\ No newline at end of file
+            self.db_config.release_connection(conn)
+            return None
+    
+    # ==================== CONSULTAS EM LOTE ====================
+    
+    def obter_por_ids(self, query, ids, entidade):
+        """
+        Executa uma consulta filtrada por `= ANY(%s)` e retorna {id: registro}.
+        Ids repetidos são consultados uma única vez; ids inexistentes ficam de fora.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+        
+        conn = self.db_config.get_connection()
+        if not conn:
+            return {}
+        
+        try:
+            cursor = conn.cursor()
+            executar(cursor, query, (ids,))
+            results = {row[0]: row for row in cursor.fetchall()}
+            cursor.close()
+            self.db_config.release_connection(conn)
+            return results
+        except psycopg2.Error as e:
+            print(f"Erro ao obter {entidade}: {e}")
+            self.db_config.release_connection(conn)
+            return {}
+    
+    # Consultas de vários registros por id (= ANY de um array)
+    SQL_AUTORES_POR_IDS = """
+        SELECT id_autor, nome_autor, nacionalidade, data_nascimento, biografia
+        FROM autores
+        WHERE id_autor = ANY(%s::int[])
+    """
+
+    SQL_LIVROS_POR_IDS = """
+        SELECT l.id_livro, l.titulo, l.id_autor, a.nome_autor, l.genero, l.ano_publicacao, l.preco, l.quantidade_estoque
+        FROM livros l
+        INNER JOIN autores a ON l.id_autor = a.id_autor
+        WHERE l.id_livro = ANY(%s::int[])
+    """
+
+    SQL_PEDIDOS_POR_IDS = """
+        SELECT id_pedido, data_pedido, nome_cliente, email_cliente, valor_total
+        FROM pedidos
+        WHERE id_pedido = ANY(%s::int[])
+    """
+
+    @em_cache('autores', chave=conjunto_de_ids)
+    def obter_autores_por_ids(self, ids):
+        """
+        Obtém vários autores em uma única consulta: {id_autor: registro}
+        """
+        return self.obter_por_ids(self.SQL_AUTORES_POR_IDS, ids, "autores")
+    
+    @em_cache('livros', 'autores', chave=conjunto_de_ids)
+    def obter_livros_por_ids(self, ids):
+        """
+        Obtém vários livros (com nome do autor) em uma única consulta: {id_livro: registro}
+        """
+        return self.obter_por_ids(self.SQL_LIVROS_POR_IDS, ids, "livros")
+    
+    @em_cache('pedidos', chave=conjunto_de_ids)
+    def obter_pedidos_por_ids(self, ids):
+        """
+        Obtém vários pedidos em uma única consulta: {id_pedido: registro}
+        """
+        return self.obter_por_ids(self.SQL_PEDIDOS_POR_IDS, ids, "pedidos")
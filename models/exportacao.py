@@ -0,0 +1,113 @@
+"""
+Exportação via COPY TO STDOUT - tabelas e relatórios para CSV/JSONL
+"""
+import gzip
+import sys
+
+import psycopg2
+from psycopg2 import sql
+
+from models.database_operations import DatabaseOperations
+from models.importacao import ORDEM_TABELAS, TABELAS as DEFINICOES
+
+TABELAS = ORDEM_TABELAS
+
+RELATORIOS = {
+    'vendas_por_genero': DatabaseOperations.SQL_VENDAS_POR_GENERO,
+    'pedidos_detalhado': DatabaseOperations.SQL_PEDIDOS_DETALHADO,
+}
+
+ALVOS = TABELAS + list(RELATORIOS)
+
+# Tamanho dos blocos repassados pelo copy_expert ao arquivo de destino
+TAMANHO_BLOCO = 64 * 1024
+
+
+class ContadorBytes:
+    """Repassa os blocos do COPY para o destino contando os bytes escritos"""
+
+    def __init__(self, destino):
+        self.destino = destino
+        self.total = 0
+
+    def write(self, dados):
+        self.total += len(dados)
+        return self.destino.write(dados)
+
+
+class Exportador:
+    """
+    Exporta tabelas e relatórios diretamente do COPY TO STDOUT para um arquivo
+    ou para a saída padrão, bloco a bloco, sem montar linhas em Python
+    """
+
+    def __init__(self, db_ops=None):
+        self.db_ops = db_ops or DatabaseOperations()
+        self.db_config = self.db_ops.db_config
+
+    def comando_copy(self, alvo, formato):
+        """Monta o COPY TO STDOUT para o alvo no formato pedido"""
+        if alvo in TABELAS:
+            # Só as colunas aceitas pela importação: colunas internas, como o
+            # tsvector da busca textual, ficam fora e o arquivo pode ser reimportado
+            colunas = sql.SQL(', ').join(
+                sql.Identifier(coluna[0]) for coluna in DEFINICOES[alvo]['colunas']
+            )
+            origem = sql.SQL("SELECT {} FROM {}").format(colunas, sql.Identifier(alvo))
+        else:
+            origem = sql.SQL(RELATORIOS[alvo])
+
+        if formato == 'csv':
+            if alvo in TABELAS:
+                return sql.SQL("COPY {} ({}) TO STDOUT WITH (FORMAT csv, HEADER)").format(
+                    sql.Identifier(alvo), colunas
+                )
+            return sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER)").format(origem)
+
+        # JSONL: um objeto por linha gerado pelo próprio banco. Aspas e delimitador
+        # são caracteres de controle, que o row_to_json sempre escapa, então o CSV
+        # de uma coluna sai sem nenhuma citação extra
+        return sql.SQL(
+            "COPY (SELECT row_to_json(t) FROM ({}) t) TO STDOUT "
+            "WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')"
+        ).format(origem)
+
+    def exportar(self, alvo, destino='-', formato='csv', compactar=False):
+        """
+        Exporta um alvo (tabela ou relatório) para `destino` ('-' = stdout).
+        Retorna (sucesso, mensagem)
+        """
+        if alvo not in ALVOS:
+            return False, f"Alvo desconhecido: {alvo}. Opções: {', '.join(ALVOS)}"
+        if formato not in ('csv', 'jsonl'):
+            return False, f"Formato desconhecido: {formato}"
+
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+
+        saida = None
+        try:
+            if destino == '-':
+                saida = gzip.GzipFile(fileobj=sys.stdout.buffer, mode='wb') if compactar else sys.stdout.buffer
+            else:
+                saida = gzip.open(destino, 'wb') if compactar else open(destino, 'wb')
+
+            contador = ContadorBytes(saida)
+            cursor = conn.cursor()
+            cursor.copy_expert(self.comando_copy(alvo, formato), contador, size=TAMANHO_BLOCO)
+            linhas = cursor.rowcount
+            cursor.close()
+            conn.commit()
+            self.db_config.release_connection(conn)
+            return True, f"{alvo}: {linhas} linha(s), {contador.total} bytes exportados"
+        except (psycopg2.Error, OSError) as e:
+            conn.rollback()
+            self.db_config.release_connection(conn)
+            return False, f"Erro ao exportar {alvo}: {e}"
+        finally:
+            if saida is not None:
+                if saida is sys.stdout.buffer:
+                    saida.flush()
+                else:
+                    saida.close()
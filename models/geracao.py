@@ -0,0 +1,431 @@
+"""
+Geração de dados sintéticos para testes de escala - carga via COPY FROM STDIN
+"""
+import time
+from datetime import date, timedelta
+from itertools import accumulate
+from random import Random
+
+import psycopg2
+from psycopg2 import sql
+
+from models.database_operations import DatabaseOperations
+from models.importacao import FluxoCopy
+
+# Gêneros e pesos relativos no catálogo
+GENEROS = [
+    ('Romance', 30), ('Ficção Científica', 10), ('Fantasia', 10), ('Suspense', 12),
+    ('Biografia', 6), ('História', 6), ('Poesia', 4), ('Infantil', 8),
+    ('Autoajuda', 7), ('Técnico', 7),
+]
+
+# Faixa de preço por gênero, em centavos
+PRECOS = {
+    'Poesia': (1990, 5990), 'Infantil': (1490, 4990), 'Técnico': (6990, 24990),
+    'História': (3990, 11990), 'Biografia': (3490, 9990),
+}
+PRECO_PADRAO = (2490, 8990)
+
+NACIONALIDADES = [
+    ('Brasileira', 40), ('Portuguesa', 12), ('Argentina', 6), ('Colombiana', 5),
+    ('Norte-americana', 14), ('Britânica', 10), ('Francesa', 7), ('Japonesa', 6),
+]
+
+NOMES = [
+    'Ana', 'Beatriz', 'Carlos', 'Clara', 'Daniel', 'Eduardo', 'Fernanda', 'Gabriel',
+    'Helena', 'Isabel', 'João', 'Júlia', 'Lucas', 'Luísa', 'Marcos', 'Mariana',
+    'Miguel', 'Paula', 'Pedro', 'Rafael', 'Renata', 'Sofia', 'Tiago', 'Vitória',
+]
+SOBRENOMES = [
+    'Almeida', 'Barbosa', 'Cardoso', 'Carvalho', 'Costa', 'Dias', 'Ferreira', 'Gomes',
+    'Lima', 'Martins', 'Mendes', 'Moreira', 'Nunes', 'Oliveira', 'Pereira', 'Ribeiro',
+    'Rocha', 'Santos', 'Silva', 'Souza', 'Teixeira', 'Vieira',
+]
+
+# Títulos: substantivo (com gênero, para a concordância do adjetivo opcional),
+# complemento e, na maioria das vezes, um subtítulo - dezenas de milhões de
+# combinações, para que os títulos sejam quase todos distintos mesmo com 1M de livros
+SUBSTANTIVOS = [
+    ('O Silêncio', 'm'), ('A Casa', 'f'), ('O Jardim', 'm'), ('A Sombra', 'f'), ('O Segredo', 'm'),
+    ('A Memória', 'f'), ('O Rio', 'm'), ('A Noite', 'f'), ('O Último Verão', 'm'), ('A Cidade', 'f'),
+    ('O Mapa', 'm'), ('A Viagem', 'f'), ('O Espelho', 'm'), ('A Ilha', 'f'), ('O Labirinto', 'm'),
+    ('A Canção', 'f'), ('O Inverno', 'm'), ('A Promessa', 'f'), ('O Herdeiro', 'm'), ('A Carta', 'f'),
+    ('O Relógio', 'm'), ('A Estrada', 'f'), ('O Navio', 'm'), ('A Biblioteca', 'f'), ('O Guardião', 'm'),
+    ('A Floresta', 'f'), ('O Retrato', 'm'), ('A Torre', 'f'), ('O Caminho', 'm'), ('A Fronteira', 'f'),
+    ('O Vento', 'm'), ('A Lenda', 'f'), ('O Eco', 'm'), ('A Ponte', 'f'), ('O Pacto', 'm'),
+    ('A Herança', 'f'), ('O Oráculo', 'm'), ('A Fuga', 'f'), ('O Sonho', 'm'), ('A Chave', 'f'),
+]
+ADJETIVOS = [
+    ('Perdido', 'Perdida'), ('Esquecido', 'Esquecida'), ('Secreto', 'Secreta'), ('Antigo', 'Antiga'),
+    ('Proibido', 'Proibida'), ('Eterno', 'Eterna'), ('Quebrado', 'Quebrada'), ('Sombrio', 'Sombria'),
+    ('Dourado', 'Dourada'), ('Amargo', 'Amarga'), ('Infinito', 'Infinita'), ('Vermelho', 'Vermelha'),
+    ('Submerso', 'Submersa'), ('Inacabado', 'Inacabada'), ('Profundo', 'Profunda'), ('Sagrado', 'Sagrada'),
+    ('Roubado', 'Roubada'), ('Silencioso', 'Silenciosa'), ('Distante', 'Distante'), ('Invisível', 'Invisível'),
+    ('Selvagem', 'Selvagem'), ('Frágil', 'Frágil'), ('Breve', 'Breve'), ('Azul', 'Azul'),
+]
+COMPLEMENTOS = [
+    'das Marés', 'do Tempo', 'de Vidro', 'dos Esquecidos', 'do Norte', 'sem Nome',
+    'das Estrelas', 'de Papel', 'do Farol', 'das Chuvas', 'de Ninguém', 'do Deserto',
+    'da Meia-Noite', 'das Areias', 'do Sul', 'de Cinzas', 'dos Reis', 'da Montanha',
+    'do Abismo', 'de Outono', 'das Águas', 'do Império', 'de Sal', 'dos Ventos',
+    'da Aurora', 'do Vale', 'de Ferro', 'do Passado', 'de Prata', 'dos Sonhos',
+    'da Tempestade', 'do Oriente', 'de Lisboa', 'do Sertão', 'de Outra Vida', 'do Fim do Mundo',
+    'da Lua', 'dos Anjos', 'de Inverno', 'do Mar',
+]
+SUBTITULOS = [
+    'Uma História de', 'Um Romance sobre', 'Crônicas de', 'Memórias de', 'Contos de',
+    'Um Ensaio sobre', 'Notas sobre', 'Cartas de', 'Relatos de', 'Poemas de',
+    'Uma Saga de', 'Fragmentos de', 'Um Estudo sobre', 'Diário de', 'Lições de', 'Canções de',
+]
+TEMAS = [
+    'Amor e Guerra', 'Exílio', 'Perda e Recomeço', 'Coragem', 'Família', 'Saudade',
+    'Vingança', 'Redenção', 'Liberdade', 'Infância', 'Solidão', 'Esperança',
+    'Amizade', 'Traição', 'Luto', 'Viagem e Descoberta', 'Fé', 'Ambição',
+    'Resistência', 'Obsessão', 'Culpa', 'Desejo', 'Silêncio e Ruído', 'Mar e Terra',
+    'Poder', 'Juventude', 'Velhice', 'Migração', 'Fronteiras', 'Segredos de Família',
+    'Guerra e Paz', 'Memória', 'Medo', 'Ciúme', 'Destino', 'Revolução',
+    'Loucura', 'Reencontro', 'Despedida', 'Renascimento',
+]
+PROPORCAO_ADJETIVO = 0.85
+PROPORCAO_SUBTITULO = 0.97
+
+DOMINIOS = ['email.com', 'correio.com.br', 'exemplo.org', 'livros.net']
+
+# Itens distintos por pedido e quantidade de cada item
+ITENS_POR_PEDIDO = [(1, 50), (2, 25), (3, 13), (4, 7), (5, 5)]
+QUANTIDADES = [(1, 80), (2, 15), (3, 5)]
+
+# Expoente da distribuição de Zipf das vendas: poucos livros concentram a maior parte
+EXPOENTE_ZIPF = 1.1
+
+DATA_FINAL_PADRAO = date(2025, 12, 31)
+
+# Volumes padrão por tabela
+VOLUMES_PADRAO = {
+    'autores': 1000,
+    'livros': 10000,
+    'pedidos': 50000,
+    'books': 1000,
+    'loans': 2000,
+}
+
+
+def pesos_zipf(quantidade, rng, expoente=EXPOENTE_ZIPF):
+    """
+    Pesos acumulados de uma distribuição de Zipf sobre posições embaralhadas,
+    para que os mais populares não sejam sempre os primeiros ids
+    """
+    posicoes = list(range(1, quantidade + 1))
+    rng.shuffle(posicoes)
+    return list(accumulate(1.0 / posicao ** expoente for posicao in posicoes))
+
+
+def separar(opcoes):
+    """Converte [(valor, peso), ...] em (valores, pesos acumulados)"""
+    valores = [valor for valor, _ in opcoes]
+    return valores, list(accumulate(peso for _, peso in opcoes))
+
+
+def linha_simples(valores):
+    """
+    Linha no formato texto do COPY sem escapes: os valores gerados nunca têm
+    tabulação, quebra de linha, barra invertida ou NULL (ver linha_copy)
+    """
+    return '\t'.join(map(str, valores)) + '\n'
+
+
+def centavos(valor):
+    """Formata centavos (int) como texto DECIMAL(10,2)"""
+    return f"{valor // 100}.{valor % 100:02d}"
+
+
+class GeradorDados:
+    """
+    Gera autores, livros, pedidos e itens (e os livros e empréstimos da aplicação
+    web, se as tabelas existirem) com distribuições realistas. O resultado depende
+    apenas da semente e dos parâmetros; tudo é gravado em uma única transação.
+    """
+
+    def __init__(self, db_ops=None, semente=42, data_final=DATA_FINAL_PADRAO, anos=5, lote=10000):
+        self.db_ops = db_ops or DatabaseOperations()
+        self.db_config = self.db_ops.db_config
+        self.semente = semente
+        self.data_final = data_final
+        self.anos = anos
+        self.lote = lote
+
+    def gerar(self, volumes=None, limpar=False):
+        """
+        Gera os volumes pedidos ({tabela: linhas}). Com limpar=True, as tabelas são
+        esvaziadas antes (TRUNCATE ... RESTART IDENTITY).
+        Retorna (True, {tabela: linhas geradas}) ou (False, mensagem de erro)
+        """
+        volumes = dict(VOLUMES_PADRAO, **(volumes or {}))
+        if self.anos < 1:
+            return False, "O período dos pedidos deve ter ao menos um ano"
+        if volumes['livros'] and not volumes['autores']:
+            return False, "Livros precisam de ao menos um autor"
+        if volumes['pedidos'] and not volumes['livros']:
+            return False, "Pedidos precisam de ao menos um livro"
+        if volumes['loans'] and not volumes['books']:
+            return False, "Empréstimos precisam de ao menos um livro da aplicação web"
+
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+
+        rng = Random(self.semente)
+        resumo = {}
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT to_regclass('books') IS NOT NULL AND to_regclass('loans') IS NOT NULL")
+            tabelas_web = cursor.fetchone()[0]
+            tabelas = ['autores', 'livros', 'pedidos', 'itens_pedido'] + (['books', 'loans'] if tabelas_web else [])
+
+            if limpar:
+                cursor.execute(sql.SQL("TRUNCATE {} RESTART IDENTITY").format(
+                    sql.SQL(', ').join(map(sql.Identifier, tabelas))
+                ))
+            # Os ids são atribuídos aqui: bloqueia inserções concorrentes até o commit
+            cursor.execute(sql.SQL("LOCK TABLE {} IN SHARE ROW EXCLUSIVE MODE").format(
+                sql.SQL(', ').join(map(sql.Identifier, tabelas))
+            ))
+
+            inicio = time.perf_counter()
+            chaves = self.remover_chaves_estrangeiras(cursor, tabelas)
+            precos = self.gerar_catalogo(cursor, rng, volumes, resumo)
+            self.gerar_pedidos(cursor, rng, volumes['pedidos'], precos, resumo)
+            if tabelas_web:
+                self.gerar_emprestimos(cursor, rng, volumes, resumo)
+            self.restaurar_chaves_estrangeiras(cursor, chaves)
+            conn.commit()
+            resumo['segundos'] = time.perf_counter() - inicio
+
+            cursor.close()
+            self.db_config.release_connection(conn)
+            self.db_ops.cache.limpar()
+            return True, resumo
+        except psycopg2.Error as e:
+            conn.rollback()
+            self.db_config.release_connection(conn)
+            return False, f"Erro ao gerar dados: {e}"
+
+    def copiar(self, cursor, tabela, colunas, linhas):
+        """Carrega as linhas (tuplas) com COPY FROM STDIN, sem montar o arquivo em memória"""
+        cursor.copy_expert(
+            sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT text, ENCODING 'UTF8')").format(
+                sql.Identifier(tabela), sql.SQL(', ').join(map(sql.Identifier, colunas))
+            ),
+            FluxoCopy(linha_simples(linha) for linha in linhas)
+        )
+
+    def remover_chaves_estrangeiras(self, cursor, tabelas):
+        """
+        Remove as chaves estrangeiras das tabelas durante a carga: a checagem linha
+        a linha custa mais que o próprio COPY. Retorna [(tabela, nome, definição)]
+        """
+        cursor.execute("""
+            SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = ANY(%s::regclass[])
+            ORDER BY conrelid, conname
+        """, (tabelas,))
+        chaves = cursor.fetchall()
+        for tabela, nome, _ in chaves:
+            cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                sql.SQL(tabela), sql.Identifier(nome)
+            ))
+        return chaves
+
+    def restaurar_chaves_estrangeiras(self, cursor, chaves):
+        """Recria as chaves estrangeiras, validadas de uma vez sobre a tabela inteira"""
+        for tabela, nome, definicao in chaves:
+            cursor.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {}").format(
+                sql.SQL(tabela), sql.Identifier(nome), sql.SQL(definicao)
+            ))
+
+    def proximo_id(self, cursor, tabela, pk):
+        cursor.execute(sql.SQL("SELECT COALESCE(MAX({}), 0) + 1 FROM {}").format(
+            sql.Identifier(pk), sql.Identifier(tabela)
+        ))
+        return cursor.fetchone()[0]
+
+    def finalizar_tabela(self, cursor, tabela, pk):
+        """
+        Ajusta a sequence do SERIAL aos ids explícitos e atualiza as estatísticas,
+        para que o gatilho do resumo de vendas e a validação das chaves estrangeiras
+        não sejam planejados sobre uma tabela considerada vazia
+        """
+        cursor.execute(sql.SQL("""
+            SELECT setval(pg_get_serial_sequence(%s, %s), GREATEST(MAX({pk}), 1))
+            FROM {tabela}
+        """).format(pk=sql.Identifier(pk), tabela=sql.Identifier(tabela)), (tabela, pk))
+        cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(tabela)))
+
+    def nome_pessoa(self, rng):
+        return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+
+    def titulo(self, rng):
+        substantivo, genero = rng.choice(SUBSTANTIVOS)
+        partes = [substantivo]
+        if rng.random() < PROPORCAO_ADJETIVO:
+            masculino, feminino = rng.choice(ADJETIVOS)
+            partes.append(feminino if genero == 'f' else masculino)
+        partes.append(rng.choice(COMPLEMENTOS))
+        titulo = ' '.join(partes)
+        if rng.random() < PROPORCAO_SUBTITULO:
+            titulo += f": {rng.choice(SUBTITULOS)} {rng.choice(TEMAS)}"
+        return titulo
+
+    def gerar_catalogo(self, cursor, rng, volumes, resumo):
+        """Gera autores e livros. Retorna {id_livro: preço em centavos} para os itens"""
+        primeiro_autor = self.proximo_id(cursor, 'autores', 'id_autor')
+        nacionalidades, pesos_nacionalidade = separar(NACIONALIDADES)
+        autores = []
+        for id_autor in range(primeiro_autor, primeiro_autor + volumes['autores']):
+            nome = self.nome_pessoa(rng)
+            nascimento = date(1850, 1, 1) + timedelta(days=rng.randrange(55000))
+            nacionalidade = rng.choices(nacionalidades, cum_weights=pesos_nacionalidade)[0]
+            autores.append((id_autor, nome, nacionalidade, nascimento,
+                            f"{nome}, autor(a) de nacionalidade {nacionalidade.lower()}"))
+        self.copiar(cursor, 'autores',
+                    ['id_autor', 'nome_autor', 'nacionalidade', 'data_nascimento', 'biografia'], autores)
+        self.finalizar_tabela(cursor, 'autores', 'id_autor')
+        resumo['autores'] = len(autores)
+
+        # Poucos autores escrevem a maior parte dos livros
+        ids_autores = [autor[0] for autor in autores]
+        pesos_autores = pesos_zipf(len(ids_autores), rng, expoente=0.8)
+        generos, pesos_genero = separar(GENEROS)
+        precos = {}
+
+        primeiro_livro = self.proximo_id(cursor, 'livros', 'id_livro')
+
+        def livros():
+            for id_livro in range(primeiro_livro, primeiro_livro + volumes['livros']):
+                genero = rng.choices(generos, cum_weights=pesos_genero)[0]
+                minimo, maximo = PRECOS.get(genero, PRECO_PADRAO)
+                preco = rng.randrange(minimo, maximo + 1, 10)
+                precos[id_livro] = preco
+                yield (id_livro, self.titulo(rng),
+                       rng.choices(ids_autores, cum_weights=pesos_autores)[0], genero,
+                       rng.randint(1880, self.data_final.year), centavos(preco), rng.randint(0, 60))
+
+        if volumes['livros']:
+            self.copiar(cursor, 'livros', ['id_livro', 'titulo', 'id_autor', 'genero', 'ano_publicacao',
+                                           'preco', 'quantidade_estoque'], livros())
+            self.finalizar_tabela(cursor, 'livros', 'id_livro')
+        resumo['livros'] = len(precos)
+        return precos
+
+    def pesos_dias(self):
+        """
+        Dias do período e pesos acumulados: as vendas crescem ao longo dos anos
+        e têm pico em novembro e dezembro
+        """
+        inicio = self.data_final - timedelta(days=round(365.25 * self.anos) - 1)
+        total = (self.data_final - inicio).days + 1
+        dias = [inicio + timedelta(days=dia) for dia in range(total)]
+        sazonalidade = {11: 1.4, 12: 1.8}
+        pesos = accumulate(
+            (1 + dia / total) * sazonalidade.get(data.month, 1.0)
+            for dia, data in enumerate(dias)
+        )
+        return dias, list(pesos)
+
+    def gerar_pedidos(self, cursor, rng, quantidade, precos, resumo):
+        """
+        Gera pedidos e itens em lotes, com o valor_total já igual à soma dos itens.
+        Os ids dos pedidos seguem a ordem das datas.
+        """
+        resumo['pedidos'] = resumo['itens_pedido'] = 0
+        if not quantidade:
+            return
+        ids_livros = list(precos)
+        pesos_livros = pesos_zipf(len(ids_livros), rng)
+        dias, pesos_dias = self.pesos_dias()
+        datas = sorted(rng.choices(dias, cum_weights=pesos_dias, k=quantidade))
+
+        # Clientes recorrentes: cerca de um cliente para cada três pedidos
+        clientes = []
+        for numero in range(max(quantidade // 3, 1)):
+            nome = self.nome_pessoa(rng)
+            usuario = nome.lower().replace(' ', '.')
+            clientes.append((nome, f"{usuario}{numero}@{rng.choice(DOMINIOS)}"))
+        pesos_clientes = pesos_zipf(len(clientes), rng, expoente=0.6)
+
+        contagens, pesos_contagem = separar(ITENS_POR_PEDIDO)
+        quantidades, pesos_quantidade = separar(QUANTIDADES)
+        id_pedido = self.proximo_id(cursor, 'pedidos', 'id_pedido')
+        id_item = self.proximo_id(cursor, 'itens_pedido', 'id_item')
+
+        for inicio in range(0, quantidade, self.lote):
+            datas_lote = datas[inicio:inicio + self.lote]
+            # Sorteios do lote inteiro de uma vez: uma chamada a choices por coluna
+            tamanhos = rng.choices(contagens, cum_weights=pesos_contagem, k=len(datas_lote))
+            sorteados = iter(rng.choices(ids_livros, cum_weights=pesos_livros, k=sum(tamanhos)))
+            qtds = iter(rng.choices(quantidades, cum_weights=pesos_quantidade, k=sum(tamanhos)))
+            compradores = rng.choices(clientes, cum_weights=pesos_clientes, k=len(datas_lote))
+
+            pedidos, itens = [], []
+            for data, tamanho, (nome, email) in zip(datas_lote, tamanhos, compradores):
+                # Um livro sorteado duas vezes no mesmo pedido vira um único item
+                livros = sorted({next(sorteados) for _ in range(tamanho)})
+                total = 0
+                for id_livro in livros:
+                    qtd = next(qtds)
+                    preco = precos[id_livro]
+                    total += qtd * preco
+                    itens.append((id_item, id_pedido, id_livro, qtd, centavos(preco), centavos(qtd * preco)))
+                    id_item += 1
+                pedidos.append((id_pedido, data, nome, email, centavos(total)))
+                id_pedido += 1
+
+            self.copiar(cursor, 'pedidos',
+                        ['id_pedido', 'data_pedido', 'nome_cliente', 'email_cliente', 'valor_total'], pedidos)
+            self.copiar(cursor, 'itens_pedido',
+                        ['id_item', 'id_pedido', 'id_livro', 'quantidade', 'preco_unitario', 'subtotal'], itens)
+            resumo['pedidos'] += len(pedidos)
+            resumo['itens_pedido'] += len(itens)
+
+        self.finalizar_tabela(cursor, 'pedidos', 'id_pedido')
+        self.finalizar_tabela(cursor, 'itens_pedido', 'id_item')
+
+    def gerar_emprestimos(self, cursor, rng, volumes, resumo):
+        """
+        Gera os livros (books) e empréstimos (loans) da aplicação web. Os livros
+        populares esgotam primeiro; available_copies desconta os empréstimos.
+        """
+        primeiro_book = self.proximo_id(cursor, 'books', 'id')
+        ids = list(range(primeiro_book, primeiro_book + volumes['books']))
+        titulos = [self.titulo(rng) for _ in ids]
+        autores = [self.nome_pessoa(rng) for _ in ids]
+        copias = [rng.choices([1, 2, 3, 5, 10], cum_weights=[30, 55, 75, 92, 100])[0] for _ in ids]
+        disponiveis = list(copias)
+
+        emprestimos = []
+        if ids:
+            pesos = pesos_zipf(len(ids), rng)
+            indices = range(len(ids))
+            limite = min(volumes['loans'], sum(copias))
+            inicio = self.data_final - timedelta(days=89)
+            while len(emprestimos) < limite:
+                indice = rng.choices(indices, cum_weights=pesos)[0]
+                if not disponiveis[indice]:
+                    # Esgotado: o leitor escolhe outro livro qualquer
+                    indice = rng.choice([i for i in indices if disponiveis[i]])
+                disponiveis[indice] -= 1
+                emprestimos.append((ids[indice], self.nome_pessoa(rng),
+                                    inicio + timedelta(days=rng.randrange(90))))
+            emprestimos.sort(key=lambda emprestimo: emprestimo[2])
+
+        self.copiar(cursor, 'books', ['id', 'title', 'author', 'total_copies', 'available_copies'],
+                    zip(ids, titulos, autores, copias, disponiveis))
+        self.finalizar_tabela(cursor, 'books', 'id')
+
+        primeiro_loan = self.proximo_id(cursor, 'loans', 'id')
+        self.copiar(cursor, 'loans', ['id', 'book_id', 'borrower_name', 'checkout_date'],
+                    ((primeiro_loan + i,) + emprestimo for i, emprestimo in enumerate(emprestimos)))
+        self.finalizar_tabela(cursor, 'loans', 'id')
+        resumo['books'] = len(ids)
+        resumo['loans'] = len(emprestimos)
@@ -0,0 +1,431 @@
+"""
+Importação em massa via COPY FROM STDIN - CSV/JSONL para as tabelas da biblioteca
+"""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+import psycopg2
+from psycopg2 import sql
+
+from models.database_operations import DatabaseOperations
+
+# Ordem de importação que respeita as chaves estrangeiras
+ORDEM_TABELAS = ['autores', 'livros', 'pedidos', 'itens_pedido']
+
+# Colunas aceitas por tabela: (nome, tipo, obrigatória, tamanho máximo)
+# A chave primária é opcional: quando informada, o registro é atualizado se já existir
+TABELAS = {
+    'autores': {
+        'pk': 'id_autor',
+        'colunas': [
+            ('id_autor', 'int', False, None),
+            ('nome_autor', 'text', True, 100),
+            ('nacionalidade', 'text', False, 50),
+            ('data_nascimento', 'date', False, None),
+            ('biografia', 'text', False, None),
+        ],
+        'fks': [],
+        'padroes': {},
+    },
+    'livros': {
+        'pk': 'id_livro',
+        'colunas': [
+            ('id_livro', 'int', False, None),
+            ('titulo', 'text', True, 200),
+            ('id_autor', 'int', True, None),
+            ('genero', 'text', True, 50),
+            ('ano_publicacao', 'int', False, None),
+            ('preco', 'numeric', True, None),
+            ('quantidade_estoque', 'int', False, None),
+        ],
+        'fks': [('id_autor', 'autores', 'id_autor')],
+        'padroes': {'quantidade_estoque': '0'},
+    },
+    'pedidos': {
+        'pk': 'id_pedido',
+        'colunas': [
+            ('id_pedido', 'int', False, None),
+            ('data_pedido', 'date', False, None),
+            ('nome_cliente', 'text', True, 100),
+            ('email_cliente', 'text', False, 100),
+            ('valor_total', 'numeric', False, None),
+        ],
+        'fks': [],
+        'padroes': {'data_pedido': 'CURRENT_DATE', 'valor_total': '0.00'},
+    },
+    'itens_pedido': {
+        'pk': 'id_item',
+        'colunas': [
+            ('id_item', 'int', False, None),
+            ('id_pedido', 'int', True, None),
+            ('id_livro', 'int', True, None),
+            ('quantidade', 'int', True, None),
+            ('preco_unitario', 'numeric', True, None),
+            ('subtotal', 'numeric', False, None),
+        ],
+        'fks': [('id_pedido', 'pedidos', 'id_pedido'), ('id_livro', 'livros', 'id_livro')],
+        'padroes': {'subtotal': 'quantidade * preco_unitario'},
+    },
+}
+
+TIPOS_SQL = {'int': 'integer', 'numeric': 'numeric', 'date': 'date', 'text': 'text'}
+
+# Limites das colunas INTEGER e DECIMAL(10,2) do schema
+LIMITE_INT = 2 ** 31
+LIMITE_NUMERIC = Decimal('100000000')
+
+# Quantidade de rejeições guardadas em memória para exibição
+AMOSTRA_REJEICOES = 20
+
+
+class FluxoCopy:
+    """
+    Adapta um iterador de linhas (str) à interface read() usada pelo
+    copy_expert, para que o COPY consuma os dados sob demanda
+    """
+
+    def __init__(self, linhas):
+        self.linhas = iter(linhas)
+        self.buffer = bytearray()
+
+    def read(self, tamanho=-1):
+        while tamanho < 0 or len(self.buffer) < tamanho:
+            linha = next(self.linhas, None)
+            if linha is None:
+                break
+            self.buffer += linha.encode('utf-8')
+
+        if tamanho < 0:
+            tamanho = len(self.buffer)
+        dados = bytes(self.buffer[:tamanho])
+        del self.buffer[:tamanho]
+        return dados
+
+
+def valor_copy(valor):
+    """Serializa um valor no formato texto do COPY"""
+    if valor is None:
+        return '\\N'
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    texto = str(valor)
+    return (texto.replace('\\', '\\\\').replace('\t', '\\t')
+                 .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def linha_copy(valores):
+    """Monta uma linha completa no formato texto do COPY"""
+    return '\t'.join(valor_copy(valor) for valor in valores) + '\n'
+
+
+def converter_valor(valor, tipo, tamanho_maximo):
+    """Converte um valor lido do arquivo para o tipo da coluna (ValueError se inválido)"""
+    if valor is None or (isinstance(valor, str) and valor.strip() == ''):
+        return None
+
+    if tipo == 'int':
+        if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+            raise ValueError(f"inteiro inválido: {valor!r}")
+        try:
+            numero = int(str(valor).strip()) if not isinstance(valor, (int, float)) else int(valor)
+        except ValueError:
+            raise ValueError(f"inteiro inválido: {valor!r}")
+        if not -LIMITE_INT <= numero < LIMITE_INT:
+            raise ValueError(f"inteiro fora do limite: {numero}")
+        return numero
+
+    if tipo == 'numeric':
+        try:
+            numero = Decimal(str(valor).strip())
+        except InvalidOperation:
+            raise ValueError(f"número inválido: {valor!r}")
+        if not numero.is_finite() or abs(numero) >= LIMITE_NUMERIC:
+            raise ValueError(f"número fora do limite: {valor!r}")
+        return numero
+
+    if tipo == 'date':
+        try:
+            return datetime.strptime(str(valor).strip(), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError(f"data inválida: {valor!r} (use YYYY-MM-DD)")
+
+    texto = str(valor)
+    if tamanho_maximo and len(texto) > tamanho_maximo:
+        raise ValueError(f"texto com mais de {tamanho_maximo} caracteres")
+    return texto
+
+
+def ler_registros(caminho, formato=None):
+    """
+    Lê um arquivo CSV (com cabeçalho) ou JSONL gerando (número da linha, dicionário)
+    """
+    caminho = Path(caminho)
+    formato = formato or ('csv' if caminho.suffix.lower() == '.csv' else 'jsonl')
+
+    with open(caminho, 'r', encoding='utf-8', newline='') as arquivo:
+        if formato == 'csv':
+            leitor = csv.DictReader(arquivo)
+            for registro in leitor:
+                yield leitor.line_num, registro
+        else:
+            for numero, linha in enumerate(arquivo, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError as e:
+                    yield numero, ValueError(f"JSON inválido: {e.msg}")
+                    continue
+                if not isinstance(registro, dict):
+                    yield numero, ValueError("cada linha deve conter um objeto JSON")
+                    continue
+                yield numero, registro
+
+
+class ImportadorEmMassa:
+    """
+    Importa arquivos CSV/JSONL usando COPY FROM STDIN em tabelas de staging,
+    valida as chaves estrangeiras no banco e faz upsert nas tabelas reais
+    """
+
+    def __init__(self, db_ops=None, arquivo_rejeitados=None):
+        self.db_ops = db_ops or DatabaseOperations()
+        self.db_config = self.db_ops.db_config
+        self.arquivo_rejeitados = arquivo_rejeitados
+
+    def importar_varios(self, arquivos, formato=None):
+        """
+        Importa vários arquivos ({tabela: caminho}) na ordem das chaves estrangeiras
+        """
+        resultados = {}
+        for tabela in ORDEM_TABELAS:
+            if tabela in arquivos:
+                resultados[tabela] = self.importar(tabela, arquivos[tabela], formato)
+        return resultados
+
+    def importar(self, tabela, caminho, formato=None):
+        """
+        Importa um arquivo para a tabela, em uma única transação.
+        Retorna (sucesso, resumo) ou (False, mensagem de erro)
+        """
+        if tabela not in TABELAS:
+            return False, f"Tabela desconhecida: {tabela}"
+
+        conn = self.db_config.get_connection()
+        if not conn:
+            return False, "Erro de conexão"
+
+        definicao = TABELAS[tabela]
+        resumo = {'lidas': 0, 'inseridas': 0, 'atualizadas': 0, 'rejeitadas': 0, 'amostra_rejeicoes': []}
+        rejeitados = open(self.arquivo_rejeitados, 'a', encoding='utf-8') if self.arquivo_rejeitados else None
+
+        def rejeitar(linha, motivo, registro=None):
+            resumo['rejeitadas'] += 1
+            if len(resumo['amostra_rejeicoes']) < AMOSTRA_REJEICOES:
+                resumo['amostra_rejeicoes'].append((linha, motivo))
+            if rejeitados:
+                rejeitados.write(json.dumps(
+                    {'tabela': tabela, 'linha': linha, 'motivo': motivo, 'registro': registro},
+                    ensure_ascii=False, default=str
+                ) + '\n')
+
+        try:
+            cursor = conn.cursor()
+            staging = self.criar_staging(cursor, tabela)
+
+            linhas = self.linhas_validas(tabela, caminho, formato, resumo, rejeitar)
+            colunas_staging = ['linha'] + [coluna[0] for coluna in definicao['colunas']]
+            cursor.copy_expert(
+                sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT text, ENCODING 'UTF8')").format(
+                    sql.Identifier(staging),
+                    sql.SQL(', ').join(map(sql.Identifier, colunas_staging))
+                ),
+                FluxoCopy(linhas)
+            )
+            cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(staging)))
+
+            for linha, motivo in self.validar_staging(cursor, tabela, staging):
+                rejeitar(linha, motivo)
+
+            if tabela == 'itens_pedido':
+                # Pedidos atuais dos itens que serão atualizados: um item movido
+                # para outro pedido muda o total dos dois
+                pedidos_anteriores = self.pedidos_dos_itens(cursor, staging)
+
+            inseridas, atualizadas = self.aplicar_upsert(cursor, tabela, staging)
+            resumo['inseridas'] = inseridas
+            resumo['atualizadas'] = atualizadas
+
+            if tabela == 'itens_pedido':
+                self.recalcular_totais(cursor, staging, pedidos_anteriores)
+
+            conn.commit()
+            cursor.close()
+            self.db_config.release_connection(conn)
+            # Itens alteram o valor_total dos pedidos
+            self.db_ops.cache.invalidar('pedidos' if tabela == 'itens_pedido' else tabela)
+            return True, resumo
+        except (psycopg2.Error, OSError) as e:
+            conn.rollback()
+            self.db_config.release_connection(conn)
+            return False, f"Erro ao importar {tabela}: {e}"
+        finally:
+            if rejeitados:
+                rejeitados.close()
+
+    def criar_staging(self, cursor, tabela):
+        """Cria a tabela temporária de staging (descartada no commit)"""
+        staging = f"stg_{tabela}"
+        colunas = [sql.SQL("linha integer NOT NULL")] + [
+            sql.SQL("{} {}").format(sql.Identifier(nome), sql.SQL(TIPOS_SQL[tipo]))
+            for nome, tipo, _, _ in TABELAS[tabela]['colunas']
+        ]
+        cursor.execute(sql.SQL("CREATE TEMP TABLE {} ({}) ON COMMIT DROP").format(
+            sql.Identifier(staging), sql.SQL(', ').join(colunas)
+        ))
+        return staging
+
+    def linhas_validas(self, tabela, caminho, formato, resumo, rejeitar):
+        """
+        Valida tipos e obrigatoriedade no cliente, gerando linhas no formato do COPY.
+        Registros inválidos são rejeitados sem interromper a importação.
+        """
+        colunas = TABELAS[tabela]['colunas']
+        for numero, registro in ler_registros(caminho, formato):
+            resumo['lidas'] += 1
+            if isinstance(registro, Exception):
+                rejeitar(numero, str(registro))
+                continue
+
+            valores = [numero]
+            try:
+                for nome, tipo, obrigatoria, tamanho_maximo in colunas:
+                    try:
+                        valor = converter_valor(registro.get(nome), tipo, tamanho_maximo)
+                    except ValueError as e:
+                        raise ValueError(f"{nome}: {e}")
+                    if valor is None and obrigatoria:
+                        raise ValueError(f"{nome}: campo obrigatório")
+                    valores.append(valor)
+            except ValueError as e:
+                rejeitar(numero, str(e), registro)
+                continue
+
+            yield linha_copy(valores)
+
+    def validar_staging(self, cursor, tabela, staging):
+        """
+        Remove do staging chaves primárias repetidas no arquivo (vale a última)
+        e registros cujas chaves estrangeiras não existem. Gera (linha, motivo).
+        """
+        definicao = TABELAS[tabela]
+        pk = sql.Identifier(definicao['pk'])
+        stg = sql.Identifier(staging)
+
+        cursor.execute(sql.SQL("""
+            DELETE FROM {stg}
+            WHERE linha IN (
+                SELECT linha FROM (
+                    SELECT linha, row_number() OVER (PARTITION BY {pk} ORDER BY linha DESC) AS ordem
+                    FROM {stg}
+                    WHERE {pk} IS NOT NULL
+                ) repetidas
+                WHERE ordem > 1
+            )
+            RETURNING linha, {pk}
+        """).format(stg=stg, pk=pk))
+        for linha, valor in cursor.fetchall():
+            yield linha, f"{definicao['pk']} {valor} repetido no arquivo"
+
+        for coluna, tabela_ref, coluna_ref in definicao['fks']:
+            cursor.execute(sql.SQL("""
+                DELETE FROM {stg} s
+                WHERE NOT EXISTS (SELECT 1 FROM {ref} r WHERE r.{col_ref} = s.{col})
+                RETURNING s.linha, s.{col}
+            """).format(
+                stg=stg, ref=sql.Identifier(tabela_ref),
+                col=sql.Identifier(coluna), col_ref=sql.Identifier(coluna_ref)
+            ))
+            for linha, valor in cursor.fetchall():
+                yield linha, f"{coluna} {valor} não existe em {tabela_ref}"
+
+    def aplicar_upsert(self, cursor, tabela, staging):
+        """
+        Insere os registros do staging na tabela real. Registros com chave primária
+        informada atualizam o existente; os demais recebem um id novo.
+        Retorna (inseridas, atualizadas).
+        """
+        definicao = TABELAS[tabela]
+        pk = definicao['pk']
+        dados = [coluna[0] for coluna in definicao['colunas'] if coluna[0] != pk]
+        stg = sql.Identifier(staging)
+
+        def expressao(nome):
+            padrao = definicao['padroes'].get(nome)
+            if padrao is None:
+                return sql.Identifier(nome)
+            return sql.SQL("COALESCE({}, {})").format(sql.Identifier(nome), sql.SQL(padrao))
+
+        selecao = sql.SQL(', ').join(expressao(nome) for nome in dados)
+        alvo = sql.SQL(', ').join(map(sql.Identifier, dados))
+
+        cursor.execute(sql.SQL("""
+            WITH gravados AS (
+                INSERT INTO {tabela} ({pk}, {alvo})
+                SELECT {pk}, {selecao} FROM {stg} WHERE {pk} IS NOT NULL
+                ON CONFLICT ({pk}) DO UPDATE SET {atualizacao}
+                RETURNING (xmax = 0) AS inserido
+            )
+            SELECT COUNT(*) FILTER (WHERE inserido), COUNT(*) FILTER (WHERE NOT inserido)
+            FROM gravados
+        """).format(
+            tabela=sql.Identifier(tabela), pk=sql.Identifier(pk), alvo=alvo,
+            selecao=selecao, stg=stg,
+            atualizacao=sql.SQL(', ').join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(nome)) for nome in dados
+            )
+        ))
+        inseridas, atualizadas = cursor.fetchone()
+
+        cursor.execute(sql.SQL("""
+            INSERT INTO {tabela} ({alvo})
+            SELECT {selecao} FROM {stg} WHERE {pk} IS NULL
+        """).format(tabela=sql.Identifier(tabela), alvo=alvo, selecao=selecao,
+                    stg=stg, pk=sql.Identifier(pk)))
+        inseridas += cursor.rowcount
+
+        # Ids explícitos podem ter passado à frente da sequence do SERIAL. Em uma
+        # tabela vazia, is_called = false faz o próximo id ser 1
+        cursor.execute(sql.SQL("""
+            SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({pk}), 1), MAX({pk}) IS NOT NULL)
+            FROM {tabela}
+        """).format(pk=sql.Identifier(pk), tabela=sql.Identifier(tabela)), (tabela, pk))
+
+        return inseridas, atualizadas
+
+    def pedidos_dos_itens(self, cursor, staging):
+        """Ids dos pedidos aos quais pertencem hoje os itens do staging com id_item"""
+        cursor.execute(sql.SQL("""
+            SELECT DISTINCT ip.id_pedido
+            FROM itens_pedido ip
+            INNER JOIN {stg} s ON s.id_item = ip.id_item
+        """).format(stg=sql.Identifier(staging)))
+        return [linha[0] for linha in cursor.fetchall()]
+
+    def recalcular_totais(self, cursor, staging, pedidos_anteriores=()):
+        """
+        Mantém pedidos.valor_total igual à soma dos itens dos pedidos afetados:
+        os do staging e os que os itens atualizados deixaram (que podem ter
+        ficado sem itens, com total zero)
+        """
+        cursor.execute(sql.SQL("""
+            UPDATE pedidos p
+            SET valor_total = COALESCE(
+                (SELECT SUM(ip.subtotal) FROM itens_pedido ip WHERE ip.id_pedido = p.id_pedido), 0
+            )
+            WHERE p.id_pedido IN (SELECT id_pedido FROM {stg})
+               OR p.id_pedido = ANY(%s)
+        """).format(stg=sql.Identifier(staging)), (list(pedidos_anteriores),))
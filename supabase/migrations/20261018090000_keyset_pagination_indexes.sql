@@ -0,0 +1,12 @@
+-- Índices para a paginação por chave (keyset) das listagens
+-- Cada índice segue exatamente a ordenação usada em listar_*_pagina,
+-- permitindo buscar a próxima página sem ordenar ou percorrer a tabela inteira
+
+-- listar_livros_pagina: ORDER BY titulo, id_livro
+CREATE INDEX IF NOT EXISTS idx_livros_titulo_id ON livros (titulo, id_livro);
+
+-- listar_autores_pagina: ORDER BY nome_autor, id_autor
+CREATE INDEX IF NOT EXISTS idx_autores_nome_id ON autores (nome_autor, id_autor);
+
+-- listar_pedidos_pagina: ORDER BY data_pedido DESC, id_pedido DESC
+CREATE INDEX IF NOT EXISTS idx_pedidos_data_id ON pedidos (data_pedido DESC, id_pedido DESC);
@@ -0,0 +1,137 @@
+-- Resumo de vendas por gênero mantido incrementalmente
+-- relatorio_vendas_por_genero lê esta tabela (uma linha por gênero) em vez de
+-- agregar itens_pedido inteiro a cada chamada. Os gatilhos abaixo aplicam
+-- apenas a diferença causada por cada comando em itens_pedido e livros.
+
+CREATE TABLE IF NOT EXISTS vendas_por_genero_resumo (
+    genero VARCHAR(50) PRIMARY KEY,
+    total_vendas BIGINT NOT NULL DEFAULT 0,
+    quantidade_vendida BIGINT NOT NULL DEFAULT 0,
+    valor_total_vendas DECIMAL(14,2) NOT NULL DEFAULT 0.00
+);
+
+-- Gatilhos por comando (FOR EACH STATEMENT) com tabelas de transição:
+-- um INSERT de mil itens gera um único upsert por gênero, e não mil.
+-- Os gêneros são sempre gravados em ordem alfabética para evitar deadlocks.
+
+CREATE OR REPLACE FUNCTION resumo_vendas_itens() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO vendas_por_genero_resumo AS r (genero, total_vendas, quantidade_vendida, valor_total_vendas)
+        SELECT l.genero, COUNT(*), SUM(n.quantidade), SUM(n.subtotal)
+        FROM novos n
+        INNER JOIN livros l ON l.id_livro = n.id_livro
+        GROUP BY l.genero
+        ORDER BY l.genero
+        ON CONFLICT (genero) DO UPDATE SET
+            total_vendas = r.total_vendas + EXCLUDED.total_vendas,
+            quantidade_vendida = r.quantidade_vendida + EXCLUDED.quantidade_vendida,
+            valor_total_vendas = r.valor_total_vendas + EXCLUDED.valor_total_vendas;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO vendas_por_genero_resumo AS r (genero, total_vendas, quantidade_vendida, valor_total_vendas)
+        SELECT l.genero, -COUNT(*), -SUM(a.quantidade), -SUM(a.subtotal)
+        FROM antigos a
+        INNER JOIN livros l ON l.id_livro = a.id_livro
+        GROUP BY l.genero
+        ORDER BY l.genero
+        ON CONFLICT (genero) DO UPDATE SET
+            total_vendas = r.total_vendas + EXCLUDED.total_vendas,
+            quantidade_vendida = r.quantidade_vendida + EXCLUDED.quantidade_vendida,
+            valor_total_vendas = r.valor_total_vendas + EXCLUDED.valor_total_vendas;
+    ELSE
+        INSERT INTO vendas_por_genero_resumo AS r (genero, total_vendas, quantidade_vendida, valor_total_vendas)
+        SELECT l.genero, SUM(d.sinal), SUM(d.sinal * d.quantidade), SUM(d.sinal * d.subtotal)
+        FROM (
+            SELECT id_livro, 1 AS sinal, quantidade, subtotal FROM novos
+            UNION ALL
+            SELECT id_livro, -1 AS sinal, quantidade, subtotal FROM antigos
+        ) d
+        INNER JOIN livros l ON l.id_livro = d.id_livro
+        GROUP BY l.genero
+        ORDER BY l.genero
+        ON CONFLICT (genero) DO UPDATE SET
+            total_vendas = r.total_vendas + EXCLUDED.total_vendas,
+            quantidade_vendida = r.quantidade_vendida + EXCLUDED.quantidade_vendida,
+            valor_total_vendas = r.valor_total_vendas + EXCLUDED.valor_total_vendas;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Troca de gênero de um livro: move as vendas já registradas do gênero antigo para o novo
+CREATE OR REPLACE FUNCTION resumo_vendas_genero_livro() RETURNS trigger AS $$
+BEGIN
+    WITH mudancas AS (
+        SELECT n.id_livro, a.genero AS genero_antigo, n.genero AS genero_novo
+        FROM novos n
+        INNER JOIN antigos a ON a.id_livro = n.id_livro
+        WHERE n.genero IS DISTINCT FROM a.genero
+    )
+    INSERT INTO vendas_por_genero_resumo AS r (genero, total_vendas, quantidade_vendida, valor_total_vendas)
+    SELECT g.genero, SUM(g.sinal * v.vendas), SUM(g.sinal * v.quantidade), SUM(g.sinal * v.valor)
+    FROM (
+        SELECT id_livro, genero_novo AS genero, 1 AS sinal FROM mudancas
+        UNION ALL
+        SELECT id_livro, genero_antigo AS genero, -1 AS sinal FROM mudancas
+    ) g
+    -- Agrega só os itens dos livros que mudaram de gênero (busca pelo índice de id_livro)
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS vendas, SUM(ip.quantidade) AS quantidade, SUM(ip.subtotal) AS valor
+        FROM itens_pedido ip
+        WHERE ip.id_livro = g.id_livro
+    ) v
+    WHERE v.vendas > 0
+    GROUP BY g.genero
+    ORDER BY g.genero
+    ON CONFLICT (genero) DO UPDATE SET
+        total_vendas = r.total_vendas + EXCLUDED.total_vendas,
+        quantidade_vendida = r.quantidade_vendida + EXCLUDED.quantidade_vendida,
+        valor_total_vendas = r.valor_total_vendas + EXCLUDED.valor_total_vendas;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION resumo_vendas_limpar() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM vendas_por_genero_resumo;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_resumo_vendas_insert ON itens_pedido;
+CREATE TRIGGER trg_resumo_vendas_insert
+    AFTER INSERT ON itens_pedido
+    REFERENCING NEW TABLE AS novos
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_vendas_itens();
+
+DROP TRIGGER IF EXISTS trg_resumo_vendas_update ON itens_pedido;
+CREATE TRIGGER trg_resumo_vendas_update
+    AFTER UPDATE ON itens_pedido
+    REFERENCING OLD TABLE AS antigos NEW TABLE AS novos
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_vendas_itens();
+
+DROP TRIGGER IF EXISTS trg_resumo_vendas_delete ON itens_pedido;
+CREATE TRIGGER trg_resumo_vendas_delete
+    AFTER DELETE ON itens_pedido
+    REFERENCING OLD TABLE AS antigos
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_vendas_itens();
+
+DROP TRIGGER IF EXISTS trg_resumo_vendas_truncate ON itens_pedido;
+CREATE TRIGGER trg_resumo_vendas_truncate
+    AFTER TRUNCATE ON itens_pedido
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_vendas_limpar();
+
+DROP TRIGGER IF EXISTS trg_resumo_vendas_genero ON livros;
+CREATE TRIGGER trg_resumo_vendas_genero
+    AFTER UPDATE ON livros
+    REFERENCING OLD TABLE AS antigos NEW TABLE AS novos
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_vendas_genero_livro();
+
+-- Carga inicial a partir dos itens já existentes
+LOCK TABLE itens_pedido, livros IN SHARE MODE;
+DELETE FROM vendas_por_genero_resumo;
+INSERT INTO vendas_por_genero_resumo (genero, total_vendas, quantidade_vendida, valor_total_vendas)
+SELECT l.genero, COUNT(ip.id_item), SUM(ip.quantidade), SUM(ip.subtotal)
+FROM livros l
+INNER JOIN itens_pedido ip ON l.id_livro = ip.id_livro
+GROUP BY l.genero;
@@ -0,0 +1,24 @@
+-- Índices para chaves estrangeiras e para os JOINs dos relatórios
+-- Sem eles, as verificações de dependência de remover_autor/remover_livro,
+-- o ON DELETE CASCADE de pedidos e os JOINs dos relatórios percorrem as
+-- tabelas inteiras. As colunas de ORDER BY das listagens (livros.titulo,
+-- autores.nome_autor, pedidos.data_pedido) já são cobertas pelos índices
+-- compostos de 20261018090000_keyset_pagination_indexes.sql.
+
+-- FK itens_pedido.id_pedido: ON DELETE CASCADE de pedidos e JOIN do relatório
+-- detalhado. INCLUDE permite ler os itens só pelo índice (index-only scan).
+CREATE INDEX IF NOT EXISTS idx_itens_pedido_pedido
+    ON itens_pedido (id_pedido) INCLUDE (id_livro, quantidade, preco_unitario, subtotal);
+
+-- FK itens_pedido.id_livro: verificação de remover_livro, agregação por gênero
+-- e gatilho de troca de gênero do resumo de vendas
+CREATE INDEX IF NOT EXISTS idx_itens_pedido_livro
+    ON itens_pedido (id_livro) INCLUDE (quantidade, subtotal);
+
+-- FK livros.id_autor: verificação de remover_autor
+CREATE INDEX IF NOT EXISTS idx_livros_autor ON livros (id_autor);
+
+ANALYZE autores;
+ANALYZE livros;
+ANALYZE pedidos;
+ANALYZE itens_pedido;
@@ -0,0 +1,87 @@
+-- Busca textual de livros (DatabaseOperations.buscar_livros)
+-- livros.busca guarda o tsvector do título (peso A), do gênero (peso B) e da
+-- biografia do autor (peso C), indexado por GIN. Como a biografia está em
+-- outra tabela, a coluna é mantida por gatilhos, não por uma coluna gerada.
+-- O vetor da biografia é calculado uma vez por autor (autores.busca) e só
+-- concatenado ao dos livros: analisar o texto é a parte cara, e um autor
+-- costuma ter muitos livros.
+-- - trg_autores_busca calcula autores.busca ao inserir o autor ou mudar a biografia;
+-- - trg_livros_busca recalcula a linha ao inserir um livro ou mudar título,
+--   gênero ou autor (inclusive nas cargas via COPY);
+-- - trg_autores_busca_livros repassa uma biografia alterada aos livros do autor.
+
+ALTER TABLE autores ADD COLUMN IF NOT EXISTS busca tsvector;
+ALTER TABLE livros ADD COLUMN IF NOT EXISTS busca tsvector;
+
+CREATE OR REPLACE FUNCTION autores_documento_busca(biografia TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('portuguese', coalesce(biografia, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION livros_documento_busca(titulo TEXT, genero TEXT, busca_autor tsvector)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A')
+        || setweight(to_tsvector('portuguese', coalesce(genero, '')), 'B')
+        || coalesce(busca_autor, ''::tsvector)
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION autores_atualizar_busca() RETURNS trigger AS $$
+BEGIN
+    NEW.busca := autores_documento_busca(NEW.biografia);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION livros_atualizar_busca() RETURNS trigger AS $$
+DECLARE
+    busca_autor tsvector;
+BEGIN
+    -- Consulta separada: com a subconsulta dentro da expressão, o PL/pgSQL
+    -- deixa de avaliá-la pelo caminho rápido em cada linha das cargas via COPY
+    SELECT busca INTO busca_autor FROM autores WHERE id_autor = NEW.id_autor;
+    NEW.busca := livros_documento_busca(NEW.titulo, NEW.genero, busca_autor);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION autores_propagar_busca() RETURNS trigger AS $$
+BEGIN
+    -- Usa idx_livros_autor; atualizar só "busca" não dispara trg_livros_busca
+    UPDATE livros
+    SET busca = livros_documento_busca(titulo, genero, NEW.busca)
+    WHERE id_autor = NEW.id_autor;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_autores_busca ON autores;
+CREATE TRIGGER trg_autores_busca
+    BEFORE INSERT OR UPDATE OF biografia ON autores
+    FOR EACH ROW EXECUTE FUNCTION autores_atualizar_busca();
+
+DROP TRIGGER IF EXISTS trg_autores_busca_livros ON autores;
+CREATE TRIGGER trg_autores_busca_livros
+    AFTER UPDATE OF biografia ON autores
+    FOR EACH ROW WHEN (OLD.biografia IS DISTINCT FROM NEW.biografia)
+    EXECUTE FUNCTION autores_propagar_busca();
+
+DROP TRIGGER IF EXISTS trg_livros_busca ON livros;
+CREATE TRIGGER trg_livros_busca
+    BEFORE INSERT OR UPDATE OF titulo, genero, id_autor ON livros
+    FOR EACH ROW EXECUTE FUNCTION livros_atualizar_busca();
+
+-- Carga inicial. O gênero não muda aqui, então o gatilho do resumo de vendas
+-- (que compara as tabelas de transição de cada UPDATE em livros) é desligado
+UPDATE autores SET busca = autores_documento_busca(biografia);
+
+ALTER TABLE livros DISABLE TRIGGER trg_resumo_vendas_genero;
+UPDATE livros l
+SET busca = livros_documento_busca(l.titulo, l.genero, a.busca)
+FROM autores a
+WHERE a.id_autor = l.id_autor;
+ALTER TABLE livros ENABLE TRIGGER trg_resumo_vendas_genero;
+
+CREATE INDEX IF NOT EXISTS idx_livros_busca ON livros USING GIN (busca);
+
+ANALYZE autores;
+ANALYZE livros;
@@ -0,0 +1,24 @@
+-- Busca aproximada de autores por nome (DatabaseOperations.buscar_autores)
+-- Índice GIN de trigramas em autores.nome_autor: atende tanto os trechos do
+-- nome (ILIKE '%trecho%') quanto a similaridade por palavra (operador <%), que
+-- tolera erros de digitação ("saramgo" encontra "José Saramago").
+-- A extensão pg_trgm é opcional: sem ela no servidor, ou sem permissão para
+-- criá-la, o índice não é criado e a busca usa só ILIKE. O sistema aplica as
+-- migrações ao iniciar, então uma falha aqui o impediria de abrir.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        RAISE NOTICE 'pg_trgm indisponível: busca de autores só por trecho do nome';
+        RETURN;
+    END IF;
+
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS idx_autores_nome_trgm ON autores USING GIN (nome_autor gin_trgm_ops);
+EXCEPTION
+    WHEN insufficient_privilege THEN
+        RAISE NOTICE 'Sem permissão para criar pg_trgm: busca de autores só por trecho do nome';
+END
+$$;
+
+ANALYZE autores;
@@ -0,0 +1,10 @@
+-- Índice GIN só do título, para a busca textual (DatabaseOperations.buscar_livros)
+-- achar primeiro os livros em que os termos aparecem no título (peso A de
+-- livros.busca). Com um termo comum, os candidatos ranqueados são os que
+-- casam pelo título, e não os primeiros que o índice de livros.busca devolve.
+-- A expressão é a mesma de livros_documento_busca e das consultas.
+
+CREATE INDEX IF NOT EXISTS idx_livros_busca_titulo
+    ON livros USING GIN (to_tsvector('portuguese', coalesce(titulo, '')));
+
+ANALYZE livros;
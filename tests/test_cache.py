@@ -0,0 +1,146 @@
+"""
+Testes do cache de leitura (models/cache.py) - não precisam de banco
+"""
+import unittest
+from unittest import mock
+
+from models.cache import CacheLRU, conjunto_de_ids, em_cache, invalida
+
+
+class TestCacheLRU(unittest.TestCase):
+
+    def test_guarda_e_obtem(self):
+        cache = CacheLRU(tamanho=4, ttl=60)
+        self.assertEqual(cache.obter('a'), (False, None))
+        cache.guardar('a', [1], ['livros'])
+        self.assertEqual(cache.obter('a'), (True, [1]))
+        estatisticas = cache.estatisticas()
+        self.assertEqual((estatisticas['acertos'], estatisticas['falhas']), (1, 1))
+
+    def test_descarta_a_entrada_menos_usada(self):
+        cache = CacheLRU(tamanho=2, ttl=60)
+        cache.guardar('a', 1, ['autores'])
+        cache.guardar('b', 2, ['autores'])
+        cache.obter('a')  # 'b' passa a ser a menos usada
+        cache.guardar('c', 3, ['autores'])
+
+        self.assertEqual(cache.obter('b'), (False, None))
+        self.assertEqual(cache.obter('a'), (True, 1))
+        self.assertEqual(cache.obter('c'), (True, 3))
+        self.assertEqual(cache.estatisticas()['removidas'], 1)
+
+    def test_regravar_uma_chave_nao_descarta_outra(self):
+        cache = CacheLRU(tamanho=2, ttl=60)
+        cache.guardar('a', 1, [])
+        cache.guardar('b', 2, [])
+        cache.guardar('a', 10, [])
+        self.assertEqual(cache.obter('a'), (True, 10))
+        self.assertEqual(cache.obter('b'), (True, 2))
+
+    def test_entrada_expira_depois_do_ttl(self):
+        cache = CacheLRU(tamanho=4, ttl=10)
+        with mock.patch('models.cache.time.monotonic', return_value=100.0):
+            cache.guardar('a', 1, ['pedidos'])
+        with mock.patch('models.cache.time.monotonic', return_value=109.9):
+            self.assertEqual(cache.obter('a'), (True, 1))
+        with mock.patch('models.cache.time.monotonic', return_value=110.0):
+            self.assertEqual(cache.obter('a'), (False, None))
+        self.assertEqual(cache.estatisticas()['expiradas'], 1)
+        self.assertEqual(cache.estatisticas()['entradas'], 0)
+
+    def test_invalida_as_entradas_de_qualquer_namespace(self):
+        cache = CacheLRU(tamanho=8, ttl=60)
+        cache.guardar('livros', 1, ['livros', 'autores'])
+        cache.guardar('autores', 2, ['autores'])
+        cache.guardar('pedidos', 3, ['pedidos'])
+
+        cache.invalidar('autores')
+
+        self.assertFalse(cache.obter('livros')[0])
+        self.assertFalse(cache.obter('autores')[0])
+        self.assertEqual(cache.obter('pedidos'), (True, 3))
+        self.assertEqual(cache.estatisticas()['invalidadas'], 2)
+
+    def test_cache_desativado_nao_guarda(self):
+        for tamanho, ttl in ((0, 60), (4, 0)):
+            cache = CacheLRU(tamanho=tamanho, ttl=ttl)
+            self.assertFalse(cache.ativo)
+            cache.guardar('a', 1, [])
+            self.assertEqual(cache.obter('a'), (False, None))
+
+
+class Repositorio:
+    """Imita o DatabaseOperations: métodos decorados e um atributo cache"""
+
+    def __init__(self):
+        self.cache = CacheLRU(tamanho=16, ttl=60)
+        self.consultas = 0
+        self.livros = [('Dom Casmurro',)]
+
+    @em_cache('livros', 'autores')
+    def listar_livros(self, tamanho=20):
+        self.consultas += 1
+        return list(self.livros[:tamanho])
+
+    @em_cache('livros')
+    def obter_livro(self, id_livro):
+        self.consultas += 1
+        return None
+
+    @em_cache('livros', chave=conjunto_de_ids)
+    def obter_livros_por_ids(self, ids):
+        self.consultas += 1
+        return [(i,) for i in sorted(set(ids))]
+
+    @invalida('autores')
+    def atualizar_autor(self, sucesso):
+        return sucesso, "mensagem"
+
+
+class TestDecorators(unittest.TestCase):
+
+    def test_segunda_leitura_vem_do_cache(self):
+        repo = Repositorio()
+        self.assertEqual(repo.listar_livros(), [('Dom Casmurro',)])
+        self.assertEqual(repo.listar_livros(), [('Dom Casmurro',)])
+        self.assertEqual(repo.consultas, 1)
+
+    def test_argumentos_diferentes_sao_entradas_diferentes(self):
+        repo = Repositorio()
+        repo.listar_livros(tamanho=1)
+        repo.listar_livros(tamanho=2)
+        repo.listar_livros(tamanho=1)
+        self.assertEqual(repo.consultas, 2)
+
+    def test_lista_de_ids_normalizada_na_chave(self):
+        repo = Repositorio()
+        repo.obter_livros_por_ids([3, 1, 2])
+        repo.obter_livros_por_ids((1, 2, 3))
+        repo.obter_livros_por_ids([2, 3, 1, 1])
+        self.assertEqual(repo.consultas, 1)
+
+    def test_retorna_copia_da_entrada(self):
+        repo = Repositorio()
+        repo.listar_livros().append(('Alterado',))
+        self.assertEqual(repo.listar_livros(), [('Dom Casmurro',)])
+
+    def test_resultado_vazio_nao_e_guardado(self):
+        repo = Repositorio()
+        repo.obter_livro(1)
+        repo.obter_livro(1)
+        self.assertEqual(repo.consultas, 2)
+
+    def test_escrita_bem_sucedida_invalida_os_namespaces(self):
+        repo = Repositorio()
+        repo.listar_livros()
+        repo.atualizar_autor(False)
+        repo.listar_livros()
+        self.assertEqual(repo.consultas, 1)
+
+        repo.atualizar_autor(True)
+        repo.listar_livros()
+        self.assertEqual(repo.consultas, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Testes do nome de operação das consultas instrumentadas (config/metricas.py)
+- não precisam de banco
+"""
+import unittest
+
+from config.metricas import instrumentar, nome_operacao
+
+
+@instrumentar
+class Repositorio:
+    """Cada método anota a operação em que suas "consultas" seriam contadas"""
+
+    def __init__(self):
+        self.operacoes = []
+
+    def consultar(self):
+        self.operacoes.append(nome_operacao('SELECT 1'))
+
+    def rotular(self, nome, funcao=None):
+        self.operacoes.append(nome_operacao('SELECT 1'))
+        return nome, funcao
+
+    def iterar(self, linhas=3):
+        for linha in range(linhas):
+            self.operacoes.append(nome_operacao('FETCH 1'))
+            yield linha
+        self.operacoes.append(nome_operacao('CLOSE'))
+
+    def iterar_e_consultar(self):
+        for linha in self.iterar(1):
+            self.consultar()
+            yield linha
+
+
+class TestOperacao(unittest.TestCase):
+
+    def test_metodo_usa_o_proprio_nome(self):
+        repo = Repositorio()
+        repo.consultar()
+        self.assertEqual(repo.operacoes, ['consultar'])
+
+    def test_argumentos_nomeados_como_os_do_wrapper(self):
+        repo = Repositorio()
+        self.assertEqual(repo.rotular(nome='Pedido', funcao='x'), ('Pedido', 'x'))
+        self.assertEqual(repo.operacoes, ['rotular'])
+
+    def test_fora_de_uma_operacao_usa_o_comando(self):
+        self.assertEqual(nome_operacao('SELECT 1'), 'sql:select')
+
+    def test_gerador_pausado_nao_empresta_o_nome(self):
+        repo = Repositorio()
+        linhas = repo.iterar()
+        next(linhas)
+        repo.consultar()
+        self.assertEqual(nome_operacao('SELECT 1'), 'sql:select')
+        next(linhas)
+        self.assertEqual(repo.operacoes, ['iterar', 'consultar', 'iterar'])
+
+    def test_gerador_consumido_ate_o_fim(self):
+        repo = Repositorio()
+        self.assertEqual(list(repo.iterar(2)), [0, 1])
+        self.assertEqual(repo.operacoes, ['iterar', 'iterar', 'iterar'])
+
+    def test_gerador_fechado_antes_do_fim(self):
+        repo = Repositorio()
+        linhas = repo.iterar()
+        next(linhas)
+        linhas.close()
+        self.assertEqual(repo.operacoes, ['iterar'])
+        self.assertEqual(nome_operacao('SELECT 1'), 'sql:select')
+
+    def test_chamadas_aninhadas_mantem_a_operacao_externa(self):
+        repo = Repositorio()
+        list(repo.iterar_e_consultar())
+        self.assertEqual(repo.operacoes, ['iterar_e_consultar'] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Testes da conversão de marcadores para instruções preparadas
+(config/preparados.py) - não precisam de banco
+"""
+import unittest
+from unittest import mock
+
+from config.preparados import converter_parametros, executar
+
+
+class TestConverterParametros(unittest.TestCase):
+
+    def test_posicionais_viram_dolar_n(self):
+        sql, ordem = converter_parametros("SELECT * FROM livros WHERE id_livro > %s LIMIT %s")
+        self.assertEqual(sql, "SELECT * FROM livros WHERE id_livro > $1 LIMIT $2")
+        self.assertIsNone(ordem)
+
+    def test_nomeados_viram_dolar_n_na_ordem_de_aparicao(self):
+        sql, ordem = converter_parametros(
+            "SELECT %(fragmento)s, %(padrao)s WHERE nome ILIKE %(padrao)s LIMIT %(limite)s"
+        )
+        self.assertEqual(sql, "SELECT $1, $2 WHERE nome ILIKE $2 LIMIT $3")
+        self.assertEqual(ordem, ['fragmento', 'padrao', 'limite'])
+
+    def test_escape_de_porcentagem(self):
+        sql, ordem = converter_parametros("SELECT '100%%', %s <%% nome_autor")
+        self.assertEqual(sql, "SELECT '100%', $1 <% nome_autor")
+        self.assertIsNone(ordem)
+
+    def test_sem_marcadores(self):
+        self.assertEqual(converter_parametros("SELECT 1"), ("SELECT 1", None))
+
+    def test_mistura_de_posicionais_e_nomeados(self):
+        with self.assertRaises(ValueError):
+            converter_parametros("SELECT %s, %(nome)s")
+
+
+class TestExecutar(unittest.TestCase):
+
+    def test_execute_comum_sem_parametros_recebe_tupla_vazia(self):
+        cursor = mock.Mock()
+        executar(cursor, "SELECT '100%%'")
+        cursor.execute.assert_called_once_with("SELECT '100%%'", ())
+
+    def test_execute_comum_repassa_os_parametros(self):
+        cursor = mock.Mock()
+        executar(cursor, "SELECT %s", (1,))
+        cursor.execute.assert_called_once_with("SELECT %s", (1,))
+
+
+if __name__ == '__main__':
+    unittest.main()
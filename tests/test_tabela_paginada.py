@@ -0,0 +1,83 @@
+"""
+Testes da paginação da tabela de console (views/tabela_paginada.py) - não
+precisam de banco
+"""
+import unittest
+
+from views.tabela_paginada import TabelaPaginada
+
+
+class Listagem:
+    """Imita um listar_*_pagina sobre ids de 1 a `total`, registrando as consultas"""
+
+    def __init__(self, total):
+        self.linhas = [(i, f"Livro {i}") for i in range(1, total + 1)]
+        self.consultas = []
+
+    def __call__(self, ultimo_titulo=None, ultimo_id=None, tamanho=20):
+        self.consultas.append(ultimo_id)
+        inicio = ultimo_id or 0
+        return self.linhas[inicio:inicio + tamanho]
+
+
+def tabela_por_chave(listagem, tamanho_pagina=3):
+    return TabelaPaginada.por_chave(
+        ["ID", "Título"], listagem, lambda linha: (linha[1], linha[0]), tamanho_pagina=tamanho_pagina
+    )
+
+
+class TestPorChave(unittest.TestCase):
+
+    def test_pagina_e_proxima(self):
+        tabela = tabela_por_chave(Listagem(7))
+        self.assertEqual(tabela.pagina(1), ([(1, "Livro 1"), (2, "Livro 2"), (3, "Livro 3")], True))
+        self.assertEqual(tabela.pagina(3), ([(7, "Livro 7")], False))
+        self.assertEqual(tabela.total_paginas(), 3)
+
+    def test_guarda_so_a_pagina_atual_e_os_limites(self):
+        tabela = tabela_por_chave(Listagem(9))
+        tabela.pagina(1)
+        tabela.pagina(2)
+        self.assertEqual(tabela.atual[1], [(4, "Livro 4"), (5, "Livro 5"), (6, "Livro 6")])
+        self.assertEqual(tabela.limites, [(None, None), ("Livro 3", 3), ("Livro 6", 6)])
+        self.assertEqual(tabela.lidas, [])
+
+    def test_voltar_busca_a_partir_do_limite(self):
+        listagem = Listagem(9)
+        tabela = tabela_por_chave(listagem)
+        tabela.pagina(1)
+        tabela.pagina(2)
+        tabela.pagina(3)
+        listagem.consultas.clear()
+        self.assertEqual(tabela.pagina(2)[0][0], (4, "Livro 4"))
+        self.assertEqual(listagem.consultas, [3])
+
+    def test_saltar_avanca_pelos_limites(self):
+        listagem = Listagem(20)
+        tabela = tabela_por_chave(listagem)
+        self.assertEqual(tabela.pagina(4)[0][0], (10, "Livro 10"))
+        self.assertEqual(listagem.consultas, [None, 3, 6, 9])
+        self.assertIsNone(tabela.total_paginas())
+
+    def test_pagina_alem_do_fim(self):
+        tabela = tabela_por_chave(Listagem(4))
+        self.assertEqual(tabela.pagina(5), ([], False))
+        self.assertEqual(tabela.total_paginas(), 2)
+
+    def test_listagem_vazia(self):
+        tabela = tabela_por_chave(Listagem(0))
+        self.assertEqual(tabela.pagina(1), ([], False))
+
+
+class TestIterador(unittest.TestCase):
+
+    def test_le_so_ate_a_pagina_pedida(self):
+        tabela = TabelaPaginada(["N"], ((i,) for i in range(100)), tamanho_pagina=10)
+        registros, tem_proxima = tabela.pagina(2)
+        self.assertEqual(registros[0], (10,))
+        self.assertTrue(tem_proxima)
+        self.assertEqual(len(tabela.lidas), 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,19 +1,31 @@
 """
 Interface do usuário - Sistema de console amigável
 """
-import os
 import sys
 from datetime import datetime
-from tabulate import tabulate
 from colorama import init, Fore, Back, Style
 from models.database_operations import DatabaseOperations
+from views.tabela_paginada import TabelaPaginada
 
 # Inicializa colorama para cores no terminal
 init(autoreset=True)
 
+# Volta o cursor ao início, apaga a tela e o histórico de rolagem
+LIMPAR_TELA = "\033[H\033[2J\033[3J"
+
+
 class Interface:
-    def __init__(self):
-        self.db_ops = DatabaseOperations()
+    # Registros por página nas listagens (None = altura do terminal)
+    TAMANHO_PAGINA = None
+    # Linhas trazidas do servidor por lote nos relatórios em streaming
+    ITERSIZE_RELATORIO = 2000
+    # Livros exibidos por busca textual, dos mais relevantes
+    LIMITE_BUSCA = 50
+    # Autores sugeridos na escolha do autor de um livro
+    LIMITE_BUSCA_AUTORES = 10
+    
+    def __init__(self, db_ops=None):
+        self.db_ops = db_ops or DatabaseOperations()
         self.grupo_membros = [
             "João Ricardo Alves",
             "Keven Leite Silva", 
@@ -23,15 +35,151 @@ class Interface:
         ]
     
     def limpar_tela(self):
-        """Limpa a tela do terminal"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Limpa a tela do terminal com sequências ANSI (no Windows, traduzidas pelo colorama)"""
+        print(LIMPAR_TELA, end="", flush=True)
     
     def pausar(self):
         """Pausa a execução até o usuário pressionar Enter"""
         input(f"\n{Fore.YELLOW}Pressione Enter para continuar...{Style.RESET_ALL}")
     
-    def splash_screen(self):
-        """Tela de inicialização com informações do sistema"""
+    def navegar_paginas(self, cabecalho, buscar_pagina, chave, headers, formatar, pergunta):
+        """
+        Exibe registros página a página (paginação por chave) e retorna a primeira
+        entrada do usuário que não for um comando de navegação.
+        Retorna None se não houver nenhum registro.
+        """
+        def redesenhar():
+            self.limpar_tela()
+            cabecalho()
+        
+        tabela = TabelaPaginada.por_chave(
+            headers, buscar_pagina, chave,
+            formatar=formatar, tamanho_pagina=self.TAMANHO_PAGINA
+        )
+        return tabela.navegar(pergunta, redesenhar)
+    
+    def formatar_autor(self, autor):
+        """Linha de exibição de um autor"""
+        data_nasc = autor[3].strftime('%d/%m/%Y') if autor[3] else "N/A"
+        return [autor[0], autor[1], autor[2] or "N/A", data_nasc]
+    
+    def formatar_livro(self, livro):
+        """Linha de exibição de um livro"""
+        return [
+            livro[0],
+            livro[1][:30] + "..." if len(livro[1]) > 30 else livro[1],
+            livro[2],
+            livro[3],
+            f"R$ {float(livro[4]):.2f}",
+            livro[5]
+        ]
+    
+    def formatar_pedido(self, pedido):
+        """Linha de exibição de um pedido"""
+        return [
+            pedido[0],
+            pedido[1].strftime('%d/%m/%Y'),
+            pedido[2],
+            pedido[3] or "N/A",
+            f"R$ {float(pedido[4]):.2f}"
+        ]
+    
+    def ler_ids(self, entrada):
+        """Converte uma lista de ids separados por vírgula ou espaço (ValueError se inválida)"""
+        ids = [int(parte) for parte in entrada.replace(",", " ").split()]
+        if not ids:
+            raise ValueError("nenhum id informado")
+        return list(dict.fromkeys(ids))
+    
+    def selecionar_autor(self, atual=None):
+        """
+        Escolha do autor de um livro: o operador digita um trecho do nome e
+        escolhe o ID entre os autores mais parecidos (ou digita o ID direto).
+        Enter aceita o valor entre colchetes: o autor `atual` ou, depois de uma
+        busca, o mais parecido. Se a busca falhar, só o ID é aceito.
+        Retorna o id do autor, ou None se o operador cancelar (0, ou Enter sem
+        valor entre colchetes).
+        """
+        padrao = atual
+        somente_id = False
+        while True:
+            sugestao = f" [{padrao}]" if padrao is not None else ""
+            rotulo = "ID do autor" if somente_id else "Autor (trecho do nome ou ID)"
+            print(f"{Fore.YELLOW}{rotulo}, 0 para cancelar{sugestao}:{Style.RESET_ALL} ", end="")
+            entrada = input().strip()
+            
+            if entrada == "0" or (not entrada and padrao is None):
+                return None
+            if not entrada or entrada.isdigit():
+                id_autor = int(entrada) if entrada else padrao
+                autor = self.db_ops.obter_autor_por_id(id_autor)
+                if autor:
+                    print(f"{Fore.GREEN}✅ Autor: {autor[1]} (ID: {autor[0]}){Style.RESET_ALL}")
+                    return id_autor
+                print(f"{Fore.RED}❌ Autor não encontrado!{Style.RESET_ALL}")
+                continue
+            if somente_id:
+                print(f"{Fore.RED}❌ Digite o ID do autor.{Style.RESET_ALL}")
+                continue
+            
+            minimo = self.db_ops.TAMANHO_MINIMO_FRAGMENTO
+            if len(entrada) < minimo:
+                print(f"{Fore.RED}❌ Digite pelo menos {minimo} letras do nome.{Style.RESET_ALL}")
+                continue
+            
+            autores = self.db_ops.buscar_autores(entrada, self.LIMITE_BUSCA_AUTORES)
+            if autores is None:
+                print(f"{Fore.RED}❌ Busca de autores indisponível; informe o ID do autor.{Style.RESET_ALL}")
+                somente_id = True
+                continue
+            if not autores:
+                print(f"{Fore.YELLOW}⚠️  Nenhum autor parecido com \"{entrada}\".{Style.RESET_ALL}")
+                continue
+            
+            TabelaPaginada(
+                ["ID", "Nome", "Nacionalidade", "Similaridade"], autores,
+                formatar=lambda autor: [autor[0], autor[1], autor[2] or "N/A", f"{autor[4]:.2f}"]
+            ).imprimir()
+            padrao = autores[0][0]
+    
+    def remover_em_lote(self, ids, obter_por_ids, remover_em_lote, headers, formatar, entidade):
+        """
+        Confirma e remove vários registros: os dados de todos os ids são buscados
+        em uma única consulta antes da confirmação, e a remoção é uma única transação
+        """
+        registros = obter_por_ids(ids)
+        nao_encontrados = [str(i) for i in ids if i not in registros]
+        if nao_encontrados:
+            print(f"{Fore.YELLOW}⚠️  Não encontrado(s): {', '.join(nao_encontrados)}{Style.RESET_ALL}")
+        
+        encontrados = [i for i in ids if i in registros]
+        if not encontrados:
+            return
+        
+        TabelaPaginada(headers, (registros[i] for i in encontrados), formatar=formatar).imprimir()
+        print(f"{Fore.RED}⚠️  Tem certeza que deseja remover {len(encontrados)} {entidade}? (s/N):{Style.RESET_ALL} ", end="")
+        confirmacao = input().strip().lower()
+        
+        if confirmacao != 's':
+            print(f"{Fore.YELLOW}Operação cancelada.{Style.RESET_ALL}")
+            return
+        
+        sucesso, resultados = remover_em_lote(encontrados)
+        if not sucesso:
+            print(f"{Fore.RED}❌ {resultados}{Style.RESET_ALL}")
+            return
+        
+        for id_registro, (sucesso, mensagem) in resultados.items():
+            if sucesso:
+                print(f"{Fore.GREEN}✅ [{id_registro}] {mensagem}{Style.RESET_ALL}")
+            else:
+                print(f"{Fore.RED}❌ [{id_registro}] {mensagem}{Style.RESET_ALL}")
+    
+    def splash_screen(self, counts=None, pausar=True):
+        """
+        Tela de inicialização com informações do sistema. `counts` são as
+        contagens já obtidas na inicialização; sem elas, são consultadas aqui.
+        """
         self.limpar_tela()
         
         print(f"{Fore.CYAN}{Style.BRIGHT}")
@@ -51,19 +199,21 @@ class Interface:
         
         print(f"\n{Fore.MAGENTA}📊 Status das tabelas no banco de dados:{Style.RESET_ALL}")
         
-        counts = self.db_ops.get_table_counts()
+        if counts is None:
+            counts = self.db_ops.get_table_counts(estimado=True)
         if counts:
-            table_data = []
-            for table, count in counts.items():
-                status = f"{Fore.GREEN}✓" if count > 0 else f"{Fore.RED}✗"
-                table_data.append([table.upper(), count, f"{status} {'Populada' if count > 0 else 'Vazia'}{Style.RESET_ALL}"])
-            
-            print(tabulate(table_data, headers=["TABELA", "REGISTROS", "STATUS"], tablefmt="grid"))
+            table_data = [
+                [table.upper(), f"~{count}", "✓ Populada" if count > 0 else "✗ Vazia"]
+                for table, count in counts.items()
+            ]
+            TabelaPaginada(["TABELA", "REGISTROS", "STATUS"], table_data).imprimir()
+            print(f"{Fore.WHITE}~ valores estimados pelas estatísticas do PostgreSQL{Style.RESET_ALL}")
         else:
             print(f"{Fore.RED}❌ Erro ao conectar com o banco de dados{Style.RESET_ALL}")
         
         print(f"\n{Fore.YELLOW}Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}{Style.RESET_ALL}")
-        self.pausar()
+        if pausar:
+            self.pausar()
     
     def menu_principal(self):
         """Menu principal do sistema"""
@@ -80,13 +230,15 @@ class Interface:
                 "2. ➕ Inserir Registros", 
                 "3. ❌ Remover Registros",
                 "4. ✏️  Atualizar Registros",
-                "5. 🚪 Sair"
+                "5. 🔎 Buscar Livros",
+                "6. 🩺 Diagnóstico de Desempenho",
+                "7. 🚪 Sair"
             ]
             
             for opcao in opcoes:
                 print(f"   {opcao}")
             
-            print(f"\n{Fore.YELLOW}Escolha uma opção (1-5):{Style.RESET_ALL} ", end="")
+            print(f"\n{Fore.YELLOW}Escolha uma opção (1-7):{Style.RESET_ALL} ", end="")
             
             try:
                 escolha = input().strip()
@@ -100,10 +252,14 @@ class Interface:
                 elif escolha == "4":
                     self.menu_atualizar()
                 elif escolha == "5":
+                    self.buscar_livros()
+                elif escolha == "6":
+                    self.diagnostico()
+                elif escolha == "7":
                     self.sair_sistema()
                     break
                 else:
-                    print(f"{Fore.RED}❌ Opção inválida! Escolha entre 1 e 5.{Style.RESET_ALL}")
+                    print(f"{Fore.RED}❌ Opção inválida! Escolha entre 1 e 7.{Style.RESET_ALL}")
                     self.pausar()
             except KeyboardInterrupt:
                 self.sair_sistema()
@@ -125,13 +281,14 @@ class Interface:
             opcoes = [
                 "1. 📈 Vendas por Gênero (GROUP BY)",
                 "2. 📋 Pedidos Detalhados (JOIN)",
-                "3. 🔙 Voltar ao Menu Principal"
+                "3. 🔄 Reconstruir e Verificar Vendas por Gênero",
+                "4. 🔙 Voltar ao Menu Principal"
             ]
             
             for opcao in opcoes:
                 print(f"   {opcao}")
             
-            print(f"\n{Fore.YELLOW}Escolha uma opção (1-3):{Style.RESET_ALL} ", end="")
+            print(f"\n{Fore.YELLOW}Escolha uma opção (1-4):{Style.RESET_ALL} ", end="")
             
             try:
                 escolha = input().strip()
@@ -141,9 +298,11 @@ class Interface:
                 elif escolha == "2":
                     self.relatorio_pedidos_detalhado()
                 elif escolha == "3":
+                    self.reconstruir_resumo_vendas()
+                elif escolha == "4":
                     break
                 else:
-                    print(f"{Fore.RED}❌ Opção inválida! Escolha entre 1 e 3.{Style.RESET_ALL}")
+                    print(f"{Fore.RED}❌ Opção inválida! Escolha entre 1 e 4.{Style.RESET_ALL}")
                     self.pausar()
             except KeyboardInterrupt:
                 break
@@ -172,7 +331,7 @@ class Interface:
                     f"R$ {float(valor_total):.2f}"
                 ])
             
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+            TabelaPaginada(headers, table_data).imprimir()
             
             # Totais gerais
             total_geral_vendas = sum(row[1] for row in dados)
@@ -188,37 +347,68 @@ class Interface:
         
         self.pausar()
     
-    def relatorio_pedidos_detalhado(self):
-        """Exibe relatório detalhado de pedidos"""
+    def reconstruir_resumo_vendas(self):
+        """Recalcula o resumo de vendas por gênero e mostra as divergências encontradas"""
         self.limpar_tela()
-        print(f"{Fore.GREEN}{Style.BRIGHT}📋 RELATÓRIO: PEDIDOS DETALHADOS{Style.RESET_ALL}")
-        print("=" * 100)
+        print(f"{Fore.GREEN}{Style.BRIGHT}🔄 RECONSTRUIR RESUMO DE VENDAS POR GÊNERO{Style.RESET_ALL}")
+        print("=" * 80)
         
-        dados = self.db_ops.relatorio_pedidos_detalhado()
+        sucesso, resultado = self.db_ops.reconstruir_resumo_vendas()
         
-        if dados:
-            headers = ["ID Pedido", "Data", "Cliente", "Livro", "Autor", "Qtd", "Preço Unit.", "Subtotal"]
-            table_data = []
-            
-            for row in dados:
-                id_pedido, data_pedido, nome_cliente, titulo, nome_autor, quantidade, preco_unitario, subtotal = row
-                table_data.append([
-                    id_pedido,
-                    data_pedido.strftime('%d/%m/%Y'),
-                    nome_cliente,
-                    titulo[:30] + "..." if len(titulo) > 30 else titulo,
-                    nome_autor,
-                    quantidade,
-                    f"R$ {float(preco_unitario):.2f}",
-                    f"R$ {float(subtotal):.2f}"
-                ])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        if not sucesso:
+            print(f"{Fore.RED}❌ {resultado}{Style.RESET_ALL}")
+        elif not resultado:
+            print(f"{Fore.GREEN}✅ Resumo reconstruído. Nenhuma divergência encontrada.{Style.RESET_ALL}")
         else:
-            print(f"{Fore.YELLOW}⚠️  Nenhum pedido encontrado.{Style.RESET_ALL}")
+            print(f"{Fore.YELLOW}⚠️  Resumo reconstruído. {len(resultado)} gênero(s) estavam divergentes:{Style.RESET_ALL}")
+            headers = ["Gênero", "Resumo (vendas/qtd/valor)", "Recalculado (vendas/qtd/valor)"]
+            table_data = [
+                [genero, " / ".join(str(v) for v in anterior), " / ".join(str(v) for v in recalculado)]
+                for genero, anterior, recalculado in resultado
+            ]
+            TabelaPaginada(headers, table_data).imprimir()
         
         self.pausar()
     
+    def relatorio_pedidos_detalhado(self):
+        """
+        Exibe relatório detalhado de pedidos uma página por vez; as linhas são
+        lidas do cursor no servidor só até a página exibida
+        """
+        def cabecalho():
+            self.limpar_tela()
+            print(f"{Fore.GREEN}{Style.BRIGHT}📋 RELATÓRIO: PEDIDOS DETALHADOS{Style.RESET_ALL}")
+            print("=" * 100)
+        
+        headers = ["ID Pedido", "Data", "Cliente", "Livro", "Autor", "Qtd", "Preço Unit.", "Subtotal"]
+        linhas = self.db_ops.iterar_relatorio_pedidos_detalhado(itersize=self.ITERSIZE_RELATORIO)
+        tabela = TabelaPaginada(headers, linhas, formatar=self.formatar_item_relatorio,
+                                tamanho_pagina=self.TAMANHO_PAGINA, largura_maxima=30)
+        try:
+            entrada = tabela.navegar("Enter para voltar:", cabecalho)
+        except KeyboardInterrupt:
+            entrada = ""
+        finally:
+            linhas.close()
+        
+        if entrada is None:
+            print(f"{Fore.YELLOW}⚠️  Nenhum pedido encontrado.{Style.RESET_ALL}")
+            self.pausar()
+    
+    def formatar_item_relatorio(self, row):
+        """Linha de exibição de um item do relatório detalhado de pedidos"""
+        id_pedido, data_pedido, nome_cliente, titulo, nome_autor, quantidade, preco_unitario, subtotal = row
+        return [
+            id_pedido,
+            data_pedido.strftime('%d/%m/%Y'),
+            nome_cliente,
+            titulo,
+            nome_autor,
+            quantidade,
+            f"R$ {float(preco_unitario):.2f}",
+            f"R$ {float(subtotal):.2f}"
+        ]
+    
     def menu_inserir(self):
         """Menu para inserir registros"""
         while True:
@@ -320,17 +510,12 @@ class Interface:
             print(f"{Fore.GREEN}{Style.BRIGHT}📚 INSERIR NOVO LIVRO{Style.RESET_ALL}")
             print("=" * 50)
             
-            # Primeiro, mostrar autores disponíveis
-            autores = self.db_ops.listar_autores()
-            if not autores:
+            # O autor é escolhido por busca no nome; aqui só se verifica se existe algum
+            if not self.db_ops.listar_autores_pagina(tamanho=1):
                 print(f"{Fore.RED}❌ Nenhum autor cadastrado! Cadastre um autor primeiro.{Style.RESET_ALL}")
                 self.pausar()
                 break
             
-            print(f"{Fore.BLUE}Autores disponíveis:{Style.RESET_ALL}")
-            for autor in autores:
-                print(f"   ID: {autor[0]} - {autor[1]} ({autor[2]})")
-            
             try:
                 print(f"\n{Fore.YELLOW}Título do Livro:{Style.RESET_ALL} ", end="")
                 titulo = input().strip()
@@ -339,8 +524,11 @@ class Interface:
                     self.pausar()
                     continue
                 
-                print(f"{Fore.YELLOW}ID do Autor:{Style.RESET_ALL} ", end="")
-                id_autor = int(input().strip())
+                id_autor = self.selecionar_autor()
+                if id_autor is None:
+                    print(f"{Fore.YELLOW}Operação cancelada.{Style.RESET_ALL}")
+                    self.pausar()
+                    break
                 
                 print(f"{Fore.YELLOW}Gênero:{Style.RESET_ALL} ", end="")
                 genero = input().strip()
@@ -382,7 +570,7 @@ class Interface:
                 self.pausar()
     
     def inserir_pedido(self):
-        """Inserir novo pedido"""
+        """Inserir novo pedido (checkout com itens, baixa de estoque e total)"""
         while True:
             self.limpar_tela()
             print(f"{Fore.GREEN}{Style.BRIGHT}🛒 INSERIR NOVO PEDIDO{Style.RESET_ALL}")
@@ -399,12 +587,18 @@ class Interface:
                 print(f"{Fore.YELLOW}Email do Cliente:{Style.RESET_ALL} ", end="")
                 email_cliente = input().strip()
                 
-                sucesso, mensagem = self.db_ops.inserir_pedido(nome_cliente, email_cliente)
-                
-                if sucesso:
-                    print(f"{Fore.GREEN}✅ {mensagem}{Style.RESET_ALL}")
+                carrinho = self.montar_carrinho(nome_cliente)
+                if carrinho is None:
+                    print(f"{Fore.YELLOW}Pedido cancelado.{Style.RESET_ALL}")
                 else:
-                    print(f"{Fore.RED}❌ {mensagem}{Style.RESET_ALL}")
+                    sucesso, mensagem = self.db_ops.registrar_pedido_com_itens(
+                        nome_cliente, email_cliente, list(carrinho.items())
+                    )
+                    
+                    if sucesso:
+                        print(f"{Fore.GREEN}✅ {mensagem}{Style.RESET_ALL}")
+                    else:
+                        print(f"{Fore.RED}❌ {mensagem}{Style.RESET_ALL}")
                 
                 print(f"\n{Fore.YELLOW}Deseja inserir outro pedido? (s/N):{Style.RESET_ALL} ", end="")
                 continuar = input().strip().lower()
@@ -418,6 +612,82 @@ class Interface:
                 print(f"{Fore.RED}❌ Erro inesperado: {e}{Style.RESET_ALL}")
                 self.pausar()
     
+    def exibir_carrinho(self, carrinho):
+        """Mostra os itens do carrinho ({id_livro: quantidade}) com preços atuais"""
+        livros = self.db_ops.obter_livros_por_ids(tuple(carrinho))
+        linhas = []
+        total = 0.0
+        for id_livro, quantidade in carrinho.items():
+            livro = livros.get(id_livro)
+            if not livro:
+                continue
+            subtotal = float(livro[6]) * quantidade
+            total += subtotal
+            linhas.append([id_livro, livro[1][:30], quantidade, f"R$ {float(livro[6]):.2f}", f"R$ {subtotal:.2f}"])
+        TabelaPaginada(["ID", "Título", "Qtd", "Preço", "Subtotal"], linhas).imprimir()
+        print(f"{Fore.GREEN}Total: R$ {total:.2f}{Style.RESET_ALL}")
+    
+    def montar_carrinho(self, nome_cliente):
+        """
+        Seleciona os livros do pedido no catálogo paginado.
+        Retorna {id_livro: quantidade} ou None se o pedido for cancelado.
+        """
+        carrinho = {}
+        
+        def cabecalho():
+            print(f"{Fore.GREEN}{Style.BRIGHT}🛒 PEDIDO DE {nome_cliente.upper()}{Style.RESET_ALL}")
+            print("=" * 50)
+            if carrinho:
+                print(f"{Fore.CYAN}Carrinho:{Style.RESET_ALL}")
+                self.exibir_carrinho(carrinho)
+                print()
+            print(f"{Fore.CYAN}Catálogo:{Style.RESET_ALL}")
+        
+        while True:
+            entrada = self.navegar_paginas(
+                cabecalho,
+                self.db_ops.listar_livros_pagina,
+                lambda livro: (livro[1], livro[0]),
+                ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque"],
+                self.formatar_livro,
+                "ID do livro a adicionar (F = finalizar, 0 = cancelar):"
+            )
+            if entrada is None:
+                print(f"{Fore.YELLOW}⚠️  Nenhum livro cadastrado.{Style.RESET_ALL}")
+                return None
+            
+            comando = entrada.lower()
+            if comando == '0':
+                return None
+            if comando == 'f':
+                if not carrinho:
+                    print(f"{Fore.RED}❌ Adicione pelo menos um livro!{Style.RESET_ALL}")
+                    self.pausar()
+                    continue
+                self.limpar_tela()
+                print(f"{Fore.GREEN}{Style.BRIGHT}🛒 CONFIRMAR PEDIDO DE {nome_cliente.upper()}{Style.RESET_ALL}")
+                print("=" * 50)
+                self.exibir_carrinho(carrinho)
+                print(f"\n{Fore.YELLOW}Confirmar pedido? (s/N):{Style.RESET_ALL} ", end="")
+                return carrinho if input().strip().lower() == 's' else None
+            
+            try:
+                id_livro = int(entrada)
+                print(f"{Fore.YELLOW}Quantidade:{Style.RESET_ALL} ", end="")
+                quantidade = int(input().strip())
+                if quantidade <= 0:
+                    raise ValueError("quantidade deve ser positiva")
+            except ValueError:
+                print(f"{Fore.RED}❌ ID ou quantidade inválidos!{Style.RESET_ALL}")
+                self.pausar()
+                continue
+            
+            if id_livro not in self.db_ops.obter_livros_por_ids((id_livro,)):
+                print(f"{Fore.RED}❌ Livro não encontrado!{Style.RESET_ALL}")
+                self.pausar()
+                continue
+            carrinho[id_livro] = carrinho.get(id_livro, 0) + quantidade
+    
     def menu_remover(self):
         """Menu para remover registros"""
         while True:
@@ -462,46 +732,39 @@ class Interface:
     
     def remover_autor(self):
         """Remover autor"""
-        while True:
-            self.limpar_tela()
+        def cabecalho():
             print(f"{Fore.RED}{Style.BRIGHT}👤 REMOVER AUTOR{Style.RESET_ALL}")
             print("=" * 50)
-            
-            autores = self.db_ops.listar_autores()
-            if not autores:
-                print(f"{Fore.YELLOW}⚠️  Nenhum autor cadastrado.{Style.RESET_ALL}")
-                self.pausar()
-                break
-            
-            # Exibir autores
-            headers = ["ID", "Nome", "Nacionalidade", "Data Nascimento"]
-            table_data = []
-            for autor in autores:
-                data_nasc = autor[3].strftime('%d/%m/%Y') if autor[3] else "N/A"
-                table_data.append([autor[0], autor[1], autor[2] or "N/A", data_nasc])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-            
+        
+        while True:
             try:
-                print(f"\n{Fore.YELLOW}Digite o ID do autor a ser removido (0 para cancelar):{Style.RESET_ALL} ", end="")
-                id_autor = int(input().strip())
-                
-                if id_autor == 0:
+                entrada = self.navegar_paginas(
+                    cabecalho,
+                    self.db_ops.listar_autores_pagina,
+                    lambda autor: (autor[1], autor[0]),
+                    ["ID", "Nome", "Nacionalidade", "Data Nascimento"],
+                    self.formatar_autor,
+                    "Digite o(s) ID(s) do(s) autores a remover, separados por vírgula (0 para cancelar):"
+                )
+                if entrada is None:
+                    print(f"{Fore.YELLOW}⚠️  Nenhum autor cadastrado.{Style.RESET_ALL}")
+                    self.pausar()
                     break
                 
-                # Confirmar remoção
-                print(f"{Fore.RED}⚠️  Tem certeza que deseja remover este autor? (s/N):{Style.RESET_ALL} ", end="")
-                confirmacao = input().strip().lower()
+                ids = self.ler_ids(entrada)
                 
-                if confirmacao == 's':
-                    sucesso, mensagem = self.db_ops.remover_autor(id_autor)
-                    
-                    if sucesso:
-                        print(f"{Fore.GREEN}✅ {mensagem}{Style.RESET_ALL}")
-                    else:
-                        print(f"{Fore.RED}❌ {mensagem}{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.YELLOW}Operação cancelada.{Style.RESET_ALL}")
+                if ids == [0]:
+                    break
+                
+                # Confirmar remoção (uma única consulta para todos os ids)
+                self.remover_em_lote(
+                    ids,
+                    self.db_ops.obter_autores_por_ids,
+                    self.db_ops.remover_autores_em_lote,
+                    ["ID", "Nome", "Nacionalidade", "Data Nascimento"],
+                    self.formatar_autor,
+                    "autor(es)"
+                )
                 
                 print(f"\n{Fore.YELLOW}Deseja remover outro autor? (s/N):{Style.RESET_ALL} ", end="")
                 continuar = input().strip().lower()
@@ -520,52 +783,39 @@ class Interface:
     
     def remover_livro(self):
         """Remover livro"""
-        while True:
-            self.limpar_tela()
+        def cabecalho():
             print(f"{Fore.RED}{Style.BRIGHT}📚 REMOVER LIVRO{Style.RESET_ALL}")
             print("=" * 50)
-            
-            livros = self.db_ops.listar_livros()
-            if not livros:
-                print(f"{Fore.YELLOW}⚠️  Nenhum livro cadastrado.{Style.RESET_ALL}")
-                self.pausar()
-                break
-            
-            # Exibir livros
-            headers = ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque"]
-            table_data = []
-            for livro in livros:
-                table_data.append([
-                    livro[0],
-                    livro[1][:30] + "..." if len(livro[1]) > 30 else livro[1],
-                    livro[2],
-                    livro[3],
-                    f"R$ {float(livro[4]):.2f}",
-                    livro[5]
-                ])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-            
+        
+        while True:
             try:
-                print(f"\n{Fore.YELLOW}Digite o ID do livro a ser removido (0 para cancelar):{Style.RESET_ALL} ", end="")
-                id_livro = int(input().strip())
-                
-                if id_livro == 0:
+                entrada = self.navegar_paginas(
+                    cabecalho,
+                    self.db_ops.listar_livros_pagina,
+                    lambda livro: (livro[1], livro[0]),
+                    ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque"],
+                    self.formatar_livro,
+                    "Digite o(s) ID(s) do(s) livros a remover, separados por vírgula (0 para cancelar):"
+                )
+                if entrada is None:
+                    print(f"{Fore.YELLOW}⚠️  Nenhum livro cadastrado.{Style.RESET_ALL}")
+                    self.pausar()
                     break
                 
-                # Confirmar remoção
-                print(f"{Fore.RED}⚠️  Tem certeza que deseja remover este livro? (s/N):{Style.RESET_ALL} ", end="")
-                confirmacao = input().strip().lower()
+                ids = self.ler_ids(entrada)
                 
-                if confirmacao == 's':
-                    sucesso, mensagem = self.db_ops.remover_livro(id_livro)
-                    
-                    if sucesso:
-                        print(f"{Fore.GREEN}✅ {mensagem}{Style.RESET_ALL}")
-                    else:
-                        print(f"{Fore.RED}❌ {mensagem}{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.YELLOW}Operação cancelada.{Style.RESET_ALL}")
+                if ids == [0]:
+                    break
+                
+                # Confirmar remoção (uma única consulta para todos os ids)
+                self.remover_em_lote(
+                    ids,
+                    self.db_ops.obter_livros_por_ids,
+                    self.db_ops.remover_livros_em_lote,
+                    ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque"],
+                    lambda livro: self.formatar_livro((livro[0], livro[1], livro[3], livro[4], livro[6], livro[7])),
+                    "livro(s)"
+                )
                 
                 print(f"\n{Fore.YELLOW}Deseja remover outro livro? (s/N):{Style.RESET_ALL} ", end="")
                 continuar = input().strip().lower()
@@ -584,51 +834,39 @@ class Interface:
     
     def remover_pedido(self):
         """Remover pedido"""
-        while True:
-            self.limpar_tela()
+        def cabecalho():
             print(f"{Fore.RED}{Style.BRIGHT}🛒 REMOVER PEDIDO{Style.RESET_ALL}")
             print("=" * 50)
-            
-            pedidos = self.db_ops.listar_pedidos()
-            if not pedidos:
-                print(f"{Fore.YELLOW}⚠️  Nenhum pedido cadastrado.{Style.RESET_ALL}")
-                self.pausar()
-                break
-            
-            # Exibir pedidos
-            headers = ["ID", "Data", "Cliente", "Email", "Valor Total"]
-            table_data = []
-            for pedido in pedidos:
-                table_data.append([
-                    pedido[0],
-                    pedido[1].strftime('%d/%m/%Y'),
-                    pedido[2],
-                    pedido[3] or "N/A",
-                    f"R$ {float(pedido[4]):.2f}"
-                ])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-            
+        
+        while True:
             try:
-                print(f"\n{Fore.YELLOW}Digite o ID do pedido a ser removido (0 para cancelar):{Style.RESET_ALL} ", end="")
-                id_pedido = int(input().strip())
-                
-                if id_pedido == 0:
+                entrada = self.navegar_paginas(
+                    cabecalho,
+                    self.db_ops.listar_pedidos_pagina,
+                    lambda pedido: (pedido[1], pedido[0]),
+                    ["ID", "Data", "Cliente", "Email", "Valor Total"],
+                    self.formatar_pedido,
+                    "Digite o(s) ID(s) do(s) pedidos a remover, separados por vírgula (0 para cancelar):"
+                )
+                if entrada is None:
+                    print(f"{Fore.YELLOW}⚠️  Nenhum pedido cadastrado.{Style.RESET_ALL}")
+                    self.pausar()
                     break
                 
-                # Confirmar remoção
-                print(f"{Fore.RED}⚠️  Tem certeza que deseja remover este pedido? (s/N):{Style.RESET_ALL} ", end="")
-                confirmacao = input().strip().lower()
+                ids = self.ler_ids(entrada)
                 
-                if confirmacao == 's':
-                    sucesso, mensagem = self.db_ops.remover_pedido(id_pedido)
-                    
-                    if sucesso:
-                        print(f"{Fore.GREEN}✅ {mensagem}{Style.RESET_ALL}")
-                    else:
-                        print(f"{Fore.RED}❌ {mensagem}{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.YELLOW}Operação cancelada.{Style.RESET_ALL}")
+                if ids == [0]:
+                    break
+                
+                # Confirmar remoção (uma única consulta para todos os ids)
+                self.remover_em_lote(
+                    ids,
+                    self.db_ops.obter_pedidos_por_ids,
+                    self.db_ops.remover_pedidos_em_lote,
+                    ["ID", "Data", "Cliente", "Email", "Valor Total"],
+                    self.formatar_pedido,
+                    "pedido(s)"
+                )
                 
                 print(f"\n{Fore.YELLOW}Deseja remover outro pedido? (s/N):{Style.RESET_ALL} ", end="")
                 continuar = input().strip().lower()
@@ -689,29 +927,26 @@ class Interface:
     
     def atualizar_autor(self):
         """Atualizar autor"""
-        while True:
-            self.limpar_tela()
+        def cabecalho():
             print(f"{Fore.BLUE}{Style.BRIGHT}👤 ATUALIZAR AUTOR{Style.RESET_ALL}")
             print("=" * 50)
-            
-            autores = self.db_ops.listar_autores()
-            if not autores:
-                print(f"{Fore.YELLOW}⚠️  Nenhum autor cadastrado.{Style.RESET_ALL}")
-                self.pausar()
-                break
-            
-            # Exibir autores
-            headers = ["ID", "Nome", "Nacionalidade", "Data Nascimento"]
-            table_data = []
-            for autor in autores:
-                data_nasc = autor[3].strftime('%d/%m/%Y') if autor[3] else "N/A"
-                table_data.append([autor[0], autor[1], autor[2] or "N/A", data_nasc])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-            
+        
+        while True:
             try:
-                print(f"\n{Fore.YELLOW}Digite o ID do autor a ser atualizado (0 para cancelar):{Style.RESET_ALL} ", end="")
-                id_autor = int(input().strip())
+                entrada = self.navegar_paginas(
+                    cabecalho,
+                    self.db_ops.listar_autores_pagina,
+                    lambda autor: (autor[1], autor[0]),
+                    ["ID", "Nome", "Nacionalidade", "Data Nascimento"],
+                    self.formatar_autor,
+                    "Digite o ID do autor a ser atualizado (0 para cancelar):"
+                )
+                if entrada is None:
+                    print(f"{Fore.YELLOW}⚠️  Nenhum autor cadastrado.{Style.RESET_ALL}")
+                    self.pausar()
+                    break
+                
+                id_autor = int(entrada)
                 
                 if id_autor == 0:
                     break
@@ -787,35 +1022,26 @@ class Interface:
     
     def atualizar_livro(self):
         """Atualizar livro"""
-        while True:
-            self.limpar_tela()
+        def cabecalho():
             print(f"{Fore.BLUE}{Style.BRIGHT}📚 ATUALIZAR LIVRO{Style.RESET_ALL}")
             print("=" * 50)
-            
-            livros = self.db_ops.listar_livros()
-            if not livros:
-                print(f"{Fore.YELLOW}⚠️  Nenhum livro cadastrado.{Style.RESET_ALL}")
-                self.pausar()
-                break
-            
-            # Exibir livros
-            headers = ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque"]
-            table_data = []
-            for livro in livros:
-                table_data.append([
-                    livro[0],
-                    livro[1][:30] + "..." if len(livro[1]) > 30 else livro[1],
-                    livro[2],
-                    livro[3],
-                    f"R$ {float(livro[4]):.2f}",
-                    livro[5]
-                ])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-            
+        
+        while True:
             try:
-                print(f"\n{Fore.YELLOW}Digite o ID do livro a ser atualizado (0 para cancelar):{Style.RESET_ALL} ", end="")
-                id_livro = int(input().strip())
+                entrada = self.navegar_paginas(
+                    cabecalho,
+                    self.db_ops.listar_livros_pagina,
+                    lambda livro: (livro[1], livro[0]),
+                    ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque"],
+                    self.formatar_livro,
+                    "Digite o ID do livro a ser atualizado (0 para cancelar):"
+                )
+                if entrada is None:
+                    print(f"{Fore.YELLOW}⚠️  Nenhum livro cadastrado.{Style.RESET_ALL}")
+                    self.pausar()
+                    break
+                
+                id_livro = int(entrada)
                 
                 if id_livro == 0:
                     break
@@ -835,20 +1061,16 @@ class Interface:
                 print(f"Preço: R$ {float(livro_atual[6]):.2f}")
                 print(f"Estoque: {livro_atual[7]}")
                 
-                # Mostrar autores disponíveis
-                autores = self.db_ops.listar_autores()
-                print(f"\n{Fore.BLUE}Autores disponíveis:{Style.RESET_ALL}")
-                for autor in autores:
-                    print(f"   ID: {autor[0]} - {autor[1]}")
-                
                 print(f"\n{Fore.YELLOW}Digite os novos dados (Enter para manter o atual):{Style.RESET_ALL}")
                 
                 print(f"Título [{livro_atual[1]}]: ", end="")
                 titulo = input().strip() or livro_atual[1]
                 
-                print(f"ID do Autor [{livro_atual[2]}]: ", end="")
-                id_autor_input = input().strip()
-                id_autor = int(id_autor_input) if id_autor_input else livro_atual[2]
+                id_autor = self.selecionar_autor(livro_atual[2])
+                if id_autor is None:
+                    print(f"{Fore.YELLOW}Operação cancelada.{Style.RESET_ALL}")
+                    self.pausar()
+                    break
                 
                 print(f"Gênero [{livro_atual[4]}]: ", end="")
                 genero = input().strip() or livro_atual[4]
@@ -900,34 +1122,26 @@ class Interface:
     
     def atualizar_pedido(self):
         """Atualizar pedido"""
-        while True:
-            self.limpar_tela()
+        def cabecalho():
             print(f"{Fore.BLUE}{Style.BRIGHT}🛒 ATUALIZAR PEDIDO{Style.RESET_ALL}")
             print("=" * 50)
-            
-            pedidos = self.db_ops.listar_pedidos()
-            if not pedidos:
-                print(f"{Fore.YELLOW}⚠️  Nenhum pedido cadastrado.{Style.RESET_ALL}")
-                self.pausar()
-                break
-            
-            # Exibir pedidos
-            headers = ["ID", "Data", "Cliente", "Email", "Valor Total"]
-            table_data = []
-            for pedido in pedidos:
-                table_data.append([
-                    pedido[0],
-                    pedido[1].strftime('%d/%m/%Y'),
-                    pedido[2],
-                    pedido[3] or "N/A",
-                    f"R$ {float(pedido[4]):.2f}"
-                ])
-            
-            print(tabulate(table_data, headers=headers, tablefmt="grid"))
-            
+        
+        while True:
             try:
-                print(f"\n{Fore.YELLOW}Digite o ID do pedido a ser atualizado (0 para cancelar):{Style.RESET_ALL} ", end="")
-                id_pedido = int(input().strip())
+                entrada = self.navegar_paginas(
+                    cabecalho,
+                    self.db_ops.listar_pedidos_pagina,
+                    lambda pedido: (pedido[1], pedido[0]),
+                    ["ID", "Data", "Cliente", "Email", "Valor Total"],
+                    self.formatar_pedido,
+                    "Digite o ID do pedido a ser atualizado (0 para cancelar):"
+                )
+                if entrada is None:
+                    print(f"{Fore.YELLOW}⚠️  Nenhum pedido cadastrado.{Style.RESET_ALL}")
+                    self.pausar()
+                    break
+                
+                id_pedido = int(entrada)
                 
                 if id_pedido == 0:
                     break
@@ -984,6 +1198,110 @@ class Interface:
                 print(f"{Fore.RED}❌ Erro inesperado: {e}{Style.RESET_ALL}")
                 self.pausar()
     
+    def buscar_livros(self):
+        """Busca textual de livros por título, gênero e biografia do autor"""
+        def cabecalho():
+            self.limpar_tela()
+            print(f"{Fore.GREEN}{Style.BRIGHT}🔎 BUSCAR LIVROS{Style.RESET_ALL}")
+            print("=" * 50)
+        
+        cabecalho()
+        print(f"{Fore.BLUE}Use \"aspas\" para frases exatas e -termo para excluir termos.{Style.RESET_ALL}")
+        pergunta = "Buscar (Enter para voltar):"
+        
+        while True:
+            try:
+                print(f"\n{Fore.YELLOW}{pergunta}{Style.RESET_ALL} ", end="")
+                texto = input().strip()
+                
+                while texto:
+                    resultados = self.db_ops.buscar_livros(texto, self.LIMITE_BUSCA)
+                    if not resultados:
+                        print(f"{Fore.YELLOW}⚠️  Nenhum livro encontrado para \"{texto}\".{Style.RESET_ALL}")
+                        break
+                    
+                    def titulo_resultados(texto=texto, total=len(resultados), truncado=resultados[0][7]):
+                        cabecalho()
+                        print(f"{total} livro(s) mais relevante(s) para \"{texto}\":")
+                        if truncado:
+                            print(f"{Fore.BLUE}Muitos livros contêm esses termos: foram ranqueados os "
+                                  f"{self.db_ops.LIMITE_CANDIDATOS} primeiros, começando pelos que os têm no título. "
+                                  f"Refine a busca para ver outros.{Style.RESET_ALL}")
+                        print()
+                    
+                    texto = TabelaPaginada(
+                        ["ID", "Título", "Autor", "Gênero", "Preço", "Estoque", "Relevância"],
+                        resultados,
+                        formatar=lambda livro: self.formatar_livro(livro) + [f"{livro[6]:.3f}"],
+                        tamanho_pagina=self.TAMANHO_PAGINA
+                    ).navegar("Nova busca (Enter para voltar):", titulo_resultados).strip()
+                else:
+                    break
+                
+                pergunta = "Nova busca (Enter para voltar):"
+            except KeyboardInterrupt:
+                break
+    
+    def diagnostico(self):
+        """Exibe as métricas do processo: consultas por operação, pool, cache e instruções preparadas"""
+        self.limpar_tela()
+        print(f"{Fore.GREEN}{Style.BRIGHT}🩺 DIAGNÓSTICO DE DESEMPENHO{Style.RESET_ALL}")
+        print("=" * 80)
+        
+        db_config = self.db_ops.db_config
+        metricas = db_config.query_stats()
+        
+        print(f"\n{Fore.BLUE}{Style.BRIGHT}⏱️  Consultas por operação (tempos em ms):{Style.RESET_ALL}")
+        if not metricas['ativo']:
+            print(f"{Fore.YELLOW}⚠️  Métricas desativadas (DB_METRICAS=0){Style.RESET_ALL}")
+        elif metricas['operacoes']:
+            TabelaPaginada(
+                ["Operação", "Consultas", "Linhas", "Média", "P95", "Máx", "Total", "Erros"],
+                [[operacao, m['contagem'], m['linhas'], f"{m['media_ms']:.2f}", f"{m['p95_ms']:.2f}",
+                  f"{m['max_ms']:.2f}", f"{m['total_ms']:.1f}", m['erros']]
+                 for operacao, m in metricas['operacoes'].items()]
+            ).imprimir()
+        else:
+            print(f"{Fore.YELLOW}⚠️  Nenhuma consulta registrada ainda.{Style.RESET_ALL}")
+        
+        espera = metricas['espera_conexao']
+        pool = db_config.pool_stats()
+        print(f"\n{Fore.BLUE}{Style.BRIGHT}🔌 Pool de conexões:{Style.RESET_ALL}")
+        print(f"Em uso: {pool['em_uso']} | Livres: {pool['livres']} | Máximo: {pool['maximo']} | "
+              f"Criadas: {pool['criadas']} | Descartadas: {pool['descartadas']} | Esperas: {pool['esperas']}")
+        print(f"Espera por conexão: {espera['contagem']} empréstimo(s) | média {espera['media_ms']:.2f} ms | "
+              f"p95 {espera['p95_ms']:.2f} ms | máx {espera['max_ms']:.2f} ms")
+        
+        cache = self.db_ops.cache.estatisticas()
+        print(f"\n{Fore.BLUE}{Style.BRIGHT}🗃️  Cache de leitura:{Style.RESET_ALL}")
+        if self.db_ops.cache.ativo:
+            print(f"Entradas: {cache['entradas']}/{cache['tamanho']} | Acertos: {cache['acertos']} | "
+                  f"Falhas: {cache['falhas']} | Taxa de acerto: {cache['taxa_acerto']:.0%} | "
+                  f"Invalidadas: {cache['invalidadas']}")
+        else:
+            print("Desativado")
+        
+        preparados = db_config.prepared_stats()
+        print(f"\n{Fore.BLUE}{Style.BRIGHT}📝 Instruções preparadas:{Style.RESET_ALL}")
+        if preparados['ativo']:
+            print(f"Consultas distintas: {preparados['consultas_distintas']} | "
+                  f"PREPARE: {preparados['preparacoes']} | EXECUTE: {preparados['execucoes']}")
+        else:
+            print("Desativadas (DB_PREPARED=0)")
+        
+        lentas = metricas['lentas'][:10]
+        print(f"\n{Fore.BLUE}{Style.BRIGHT}🐢 Consultas lentas (acima de {metricas['limite_lento_ms']:.0f} ms):{Style.RESET_ALL}")
+        if lentas:
+            TabelaPaginada(
+                ["Quando", "Operação", "ms", "Consulta"],
+                [[lenta['quando'], lenta['operacao'], f"{lenta['ms']:.1f}", lenta['consulta']] for lenta in lentas],
+                largura_maxima=60
+            ).imprimir()
+        else:
+            print(f"{Fore.GREEN}✅ Nenhuma consulta lenta registrada.{Style.RESET_ALL}")
+        
+        self.pausar()
+    
     def sair_sistema(self):
         """Finaliza o sistema"""
         self.limpar_tela()
@@ -0,0 +1,242 @@
+"""
+Tabela de console paginada - exibe uma página do terminal por vez, lendo as
+linhas de um iterador só até a página pedida, ou buscando cada página no banco
+a partir da chave em que a anterior terminou
+"""
+import numbers
+import re
+from colorama import Fore, Style
+
+# Textos exibidos como números (alinhados à direita): 12, -3.5, R$ 10.00, 1.234,56
+NUMERICO = re.compile(r'^-?(R\$ )?[\d.,]+$')
+
+
+def linhas_por_chave(buscar_pagina, chave, tamanho=100):
+    """
+    Gera as linhas de uma listagem paginada por chave (listar_*_pagina),
+    buscando o próximo lote só quando o anterior tiver sido consumido
+    """
+    inicio = (None, None)
+    while True:
+        lote = buscar_pagina(*inicio, tamanho=tamanho)
+        yield from lote
+        if len(lote) < tamanho:
+            return
+        inicio = chave(lote[-1])
+
+
+class TabelaPaginada:
+    """
+    Tabela que lê as linhas de um iterador sob demanda. As larguras das
+    colunas vêm de uma amostra (a primeira página) e ficam fixas; textos mais
+    longos são truncados. Só as linhas até a última página visitada ficam em
+    memória, e só as da página exibida são formatadas.
+
+    Criada com `por_chave`, a tabela guarda apenas a página exibida e a chave
+    final de cada página já vista; voltar ou saltar para uma página a busca de
+    novo a partir da chave da página anterior.
+
+    `formatar` converte cada linha do iterador na lista de valores exibidos.
+    Sem `tamanho_pagina`, a página ocupa a altura do terminal menos
+    `linhas_reservadas` (cabeçalho da tela, navegação e pergunta).
+    """
+
+    def __init__(self, cabecalhos, linhas, formatar=None, tamanho_pagina=None,
+                 linhas_reservadas=12, largura_maxima=40):
+        self.cabecalhos = [str(cabecalho) for cabecalho in cabecalhos]
+        self.linhas = iter(linhas)
+        self.formatar = formatar or list
+        self.tamanho_pagina = tamanho_pagina or self.altura_terminal(linhas_reservadas)
+        self.largura_maxima = largura_maxima
+        self.lidas = []       # linhas do iterador lidas até agora
+        self.esgotado = False
+        self.colunas = None   # [(largura, alinhamento)] calculadas na primeira página
+        # Modo por chave (ver por_chave)
+        self.buscar_pagina = None
+        self.chave = None
+        self.limites = [(None, None)]  # limites[n - 1]: chave após a qual começa a página n
+        self.ultima = None             # número da última página, quando conhecido
+        self.atual = None              # (número, registros, tem_próxima) da página exibida
+
+    @classmethod
+    def por_chave(cls, cabecalhos, buscar_pagina, chave, **opcoes):
+        """
+        Tabela sobre uma listagem paginada por chave: `buscar_pagina(ultimo_x,
+        ultimo_id, tamanho=n)` (listar_*_pagina) e `chave(linha)`, que retorna o
+        (ultimo_x, ultimo_id) da linha para buscar a partir dela
+        """
+        tabela = cls(cabecalhos, (), **opcoes)
+        tabela.buscar_pagina = buscar_pagina
+        tabela.chave = chave
+        tabela.linhas = linhas_por_chave(buscar_pagina, chave, tabela.tamanho_pagina)
+        return tabela
+
+    @staticmethod
+    def altura_terminal(reservadas):
+        import shutil
+        return max(5, shutil.get_terminal_size((80, 24)).lines - reservadas)
+
+    # ==================== LEITURA ====================
+
+    def ler_ate(self, quantidade):
+        """Lê do iterador até ter `quantidade` linhas (ou até ele acabar)"""
+        while not self.esgotado and len(self.lidas) < quantidade:
+            try:
+                self.lidas.append(next(self.linhas))
+            except StopIteration:
+                self.esgotado = True
+
+    def buscar(self, numero):
+        """Busca a página `numero` a partir do seu limite e registra o da próxima"""
+        lote = self.buscar_pagina(*self.limites[numero - 1], tamanho=self.tamanho_pagina + 1)
+        registros, tem_proxima = lote[:self.tamanho_pagina], len(lote) > self.tamanho_pagina
+        if tem_proxima:
+            limite = self.chave(registros[-1])
+            if len(self.limites) > numero:
+                self.limites[numero] = limite
+            else:
+                self.limites.append(limite)
+            if self.ultima is not None and self.ultima <= numero:
+                self.ultima = None
+        else:
+            self.ultima = numero
+        self.atual = (numero, registros, tem_proxima)
+        return registros, tem_proxima
+
+    def pagina_por_chave(self, numero):
+        if self.atual and self.atual[0] == numero:
+            return self.atual[1], self.atual[2]
+        # Páginas ainda não vistas: avança a partir do último limite conhecido
+        while len(self.limites) < numero and self.ultima is None:
+            self.buscar(len(self.limites))
+        if numero > len(self.limites) or (self.ultima is not None and numero > self.ultima):
+            return [], False
+        return self.buscar(numero)
+
+    def pagina(self, numero):
+        """Linhas da página `numero` (a partir de 1) e se existe uma próxima"""
+        if self.buscar_pagina:
+            return self.pagina_por_chave(numero)
+        inicio = (numero - 1) * self.tamanho_pagina
+        fim = inicio + self.tamanho_pagina
+        # Uma linha a mais indica se existe uma próxima página
+        self.ler_ate(fim + 1)
+        return self.lidas[inicio:fim], len(self.lidas) > fim
+
+    def total_paginas(self):
+        """Quantidade de páginas, se o iterador já acabou; senão None"""
+        if self.buscar_pagina:
+            return self.ultima
+        if not self.esgotado:
+            return None
+        return max(1, -(-len(self.lidas) // self.tamanho_pagina))
+
+    # ==================== RENDERIZAÇÃO ====================
+
+    def calcular_colunas(self, amostra):
+        colunas = []
+        for indice, cabecalho in enumerate(self.cabecalhos):
+            valores = [linha[indice] for linha in amostra if indice < len(linha)]
+            largura = max([len(cabecalho)] + [len(str(valor)) for valor in valores])
+            numerica = bool(valores) and all(
+                (isinstance(valor, numbers.Number) and not isinstance(valor, bool))
+                or NUMERICO.match(str(valor)) for valor in valores
+            )
+            colunas.append((min(largura, max(self.largura_maxima, len(cabecalho))), ">" if numerica else "<"))
+        return colunas
+
+    def formatar_linha(self, valores):
+        celulas = []
+        for (largura, alinhamento), valor in zip(self.colunas, valores):
+            texto = str(valor)
+            if len(texto) > largura:
+                texto = texto[:largura - 3] + "..."
+            celulas.append(f"{texto:{alinhamento}{largura}}")
+        return "| " + " | ".join(celulas) + " |"
+
+    def separador(self, caractere="-"):
+        return "+" + "+".join(caractere * (largura + 2) for largura, _ in self.colunas) + "+"
+
+    def renderizar(self, registros, fechar=True):
+        """Texto da tabela com os registros (linhas do iterador) informados"""
+        valores = [self.formatar(registro) for registro in registros]
+        if self.colunas is None:
+            self.colunas = self.calcular_colunas(valores)
+        saida = [self.separador(), self.formatar_linha(self.cabecalhos), self.separador("=")]
+        saida.extend(self.formatar_linha(linha) for linha in valores)
+        if fechar:
+            saida.append(self.separador())
+        return "\n".join(saida)
+
+    def imprimir(self):
+        """
+        Imprime todas as linhas, sem navegação, conforme são lidas do iterador
+        (nada além da amostra fica em memória). Para resultados pequenos:
+        carrinho, totais, diagnóstico. Retorna a quantidade de linhas impressas.
+        """
+        self.ler_ate(self.tamanho_pagina)
+        amostra, self.lidas = self.lidas, []
+        if not amostra:
+            return 0
+        print(self.renderizar(amostra, fechar=False))
+        total = len(amostra)
+        for registro in self.linhas:
+            print(self.formatar_linha(self.formatar(registro)))
+            total += 1
+        print(self.separador())
+        self.esgotado = True
+        return total
+
+    # ==================== NAVEGAÇÃO ====================
+
+    def navegar(self, pergunta, cabecalho=None):
+        """
+        Exibe a tabela página a página e retorna a primeira entrada do usuário
+        que não for um comando de navegação (P, A, J <n>). `cabecalho` é chamado
+        antes de cada página (ex.: limpar a tela e imprimir o título).
+        Retorna None se o iterador não tiver nenhuma linha.
+        """
+        numero = 1
+        aviso = None
+        while True:
+            registros, tem_proxima = self.pagina(numero)
+            if not registros and numero > 1:
+                # Página além do fim (ex.: J 99): volta para a última
+                numero = self.total_paginas()
+                continue
+            if cabecalho:
+                cabecalho()
+            if not registros:
+                return None
+
+            print(self.renderizar(registros))
+            total = self.total_paginas()
+            navegacao = [f"Página {numero}" + (f" de {total}" if total else "")]
+            if numero > 1:
+                navegacao.append("A = anterior")
+            if tem_proxima:
+                navegacao.append("P = próxima")
+            if numero > 1 or tem_proxima:
+                navegacao.append("J <n> = ir para a página n")
+            print(f"{Fore.BLUE}{'  |  '.join(navegacao)}{Style.RESET_ALL}")
+            if aviso:
+                print(f"{Fore.RED}❌ {aviso}{Style.RESET_ALL}")
+                aviso = None
+
+            print(f"\n{Fore.YELLOW}{pergunta}{Style.RESET_ALL} ", end="")
+            entrada = input().strip()
+            comando = entrada.lower()
+
+            if comando == 'p':
+                if tem_proxima:
+                    numero += 1
+            elif comando == 'a':
+                numero = max(1, numero - 1)
+            elif comando.startswith('j') and comando[1:].strip().isdigit():
+                destino = int(comando[1:])
+                if destino < 1:
+                    aviso = "Número de página inválido!"
+                else:
+                    numero = destino
+            else:
+                return entrada